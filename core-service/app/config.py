@@ -12,14 +12,51 @@ class Settings(BaseSettings):
     
     # Security
     SECRET_KEY: str = "change-this-to-a-random-secret-key-in-production"
+    # Authenticated-user cache: user rows resolved from a JWT are reused for this many
+    # seconds per (user id, token issue time) instead of a query per request (0 = disabled).
+    # Updates and deactivation invalidate the entry in the worker that handled them;
+    # other workers pick up the change once the TTL expires.
+    AUTH_USER_CACHE_TTL_SECONDS: float = 30
+    AUTH_USER_CACHE_MAX_SIZE: int = 10_000
+    # Stateless claims mode: current_active_user trusts the signed token claims (id, email,
+    # is_active, is_verified, is_superuser) without a DB lookup. Inactive and recently
+    # updated users are kept in a revocation bitmap refreshed from the DB and looked up instead.
+    AUTH_STATELESS_CLAIMS: bool = False
+    AUTH_REVOCATION_REFRESH_SECONDS: float = 10
     
     # Database
     DATABASE_URL: str = "sqlite:///./learnora.db"
     DB_ECHO: bool = False
+    # Per-request SQL stats: X-DB-* response headers (default: outside production)
+    # and a warning when one statement shape runs more than the threshold
+    SQL_DEBUG_HEADERS: Optional[bool] = None
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
     # Connection pool tuning (None = auto / development: disable pooling to avoid
     # hitting service limits when using managed Postgres in session mode)
     DB_POOL_SIZE: Optional[int] = None
     DB_MAX_OVERFLOW: Optional[int] = None
+    # Named pool profile: dev-nullpool | small-session | pgbouncer-transaction,
+    # or sqlite-wal for SQLite (WAL + pragmas, one writer connection plus overflow, pooled readers)
+    # (None keeps the behavior above; explicit DB_POOL_* values override the profile)
+    DB_POOL_PROFILE: Optional[str] = None
+    DB_POOL_RECYCLE: Optional[int] = None
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MB
+    SQLITE_CACHE_SIZE: int = -65536  # negative = KiB, i.e. 64 MB
+    SQLITE_READ_POOL_SIZE: int = 4
+    # Extra writer-pool connections under sqlite-wal; writes still serialize on SQLite's lock
+    SQLITE_WRITE_MAX_OVERFLOW: int = 4
+    # Admission control: global client budget across all workers (None disables).
+    # Each process admits DB_CONNECTION_BUDGET // DB_WORKER_COUNT concurrent sessions
+    # and answers 503 with Retry-After when a slot does not free up in time.
+    DB_CONNECTION_BUDGET: Optional[int] = None
+    DB_WORKER_COUNT: int = 1
+    DB_ADMISSION_TIMEOUT_SECONDS: float = 5.0
+    DB_ADMISSION_MAX_QUEUE: Optional[int] = 100
+    DB_ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    # Read replicas for read-only dependencies (get_read_db), used round-robin;
+    # empty = primary. DATABASE_READ_URL is a single-replica shorthand.
+    DATABASE_REPLICA_URLS: list[str] = []
+    DATABASE_READ_URL: Optional[str] = None
     
     # LangSmith
     LANGSMITH_TRACING: bool = False
@@ -30,13 +67,68 @@ class Settings(BaseSettings):
     # Google AI
     GOOGLE_API_KEY: str = ""
     
+    # Chat models: provider for all roles ("fake" = offline, deterministic replies)
+    # and model name per feature role (JSON object in env)
+    LLM_PROVIDER: str = "google_genai"
+    LLM_DEFAULT_MODEL: str = "gemini-2.5-flash-lite"
+    LLM_MODELS: dict[str, str] = {
+        "chat": "gemini-2.5-flash",
+        "learning_path": "gemini-2.5-flash-lite",
+        "mcq": "gemini-2.5-flash-lite",
+        "personalization": "gemini-2.0-flash-exp",
+        "memory": "gemini-2.5-flash-lite",
+    }
+    
+    # Agent conversation checkpoints: "database" (shared by all workers, survives
+    # restarts) or "memory" (per process, for local experiments)
+    AGENT_CHECKPOINTER: Literal["database", "memory"] = "database"
+    AGENT_CHECKPOINT_KEEP_LAST: int = 10  # Checkpoints kept per thread (0 = keep all)
+    AGENT_CHECKPOINT_COMPRESS_MIN_BYTES: int = 1024  # zlib-compress checkpoints at least this large
+    
+    # Agent conversation memory: once the prompt history (system prompt reserve, running
+    # summary and messages) exceeds the token budget, older turns are folded into the
+    # summary, keeping at most N recent turns within TARGET_RATIO of the budget
+    # (0 turns or 0 tokens = keep all)
+    AGENT_MEMORY_KEEP_TURNS: int = 6
+    AGENT_MEMORY_MAX_TOKENS: int = 4000  # Approximate token budget of the whole prompt history
+    AGENT_MEMORY_PROMPT_RESERVE_TOKENS: int = 500  # Counted for the node's system prompt
+    AGENT_MEMORY_TARGET_RATIO: float = 0.5  # Fraction of the budget left after compacting
+    AGENT_MEMORY_SUMMARY_MAX_WORDS: int = 200
+    
+    # Cache of deterministic learning path LLM steps (goal definition, concept graph),
+    # keyed by node, prompt version, model and normalized inputs
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int = 10000  # Oldest entries are evicted beyond this
+    
     # API Settings
     API_V1_PREFIX: str = "/api/v1"
     CORS_ORIGINS: list[str] = ["*"]
+    # Largest learning path bulk import accepted in one request (larger ones get 422)
+    LEARNING_PATH_BULK_MAX_ITEMS: int = 500
+    # Largest number of ids in one learning path batch get
+    LEARNING_PATH_BATCH_GET_MAX_IDS: int = 100
     
     # Knowledge Graph Settings
     KG_STORAGE_PATH: str = "./data/graph"
+    # Optional list of storage roots for user graphs (JSON list in env), placed by
+    # consistent hashing. Empty = all user graphs live under KG_STORAGE_PATH.
+    KG_STORAGE_ROOTS: list[str] = []
     KG_FORMAT: str = "turtle"  # RDF serialization format (turtle, xml, n3, etc.)
+    KG_SLOW_OPERATION_MS: float = 500  # Log KG parse/serialize operations slower than this
+    # Parsed graphs kept in memory per process (0 = disabled). Opt-in: every hit
+    # still copies the cached graph, so it pays off only for large, hot graphs
+    KG_CACHE_MAX_GRAPHS: int = 0
+    # Startup warmup of the KG cache
+    KG_WARMUP_ENABLED: bool = False
+    KG_WARMUP_USER_COUNT: int = 100  # Most recently active user graphs to preload
+    KG_WARMUP_CONCURRENCY: int = 4
+    # Cold storage tiering for inactive user graphs
+    KG_COLD_STORAGE_PATH: Optional[str] = None  # None = <KG_STORAGE_PATH>-cold (outside the hot tree)
+    KG_COLD_COMPRESSION: Literal["gzip", "zstd"] = "gzip"  # zstd requires the zstandard package
+    KG_TIERING_ENABLED: bool = False  # Run the background tiering job on startup
+    KG_TIERING_IDLE_DAYS: int = 30  # Archive user graphs not read or written for this many days
+    KG_TIERING_INTERVAL_SECONDS: int = 86400  # How often the tiering job scans the hot directory
     
     model_config = SettingsConfigDict(
         env_file=".env",
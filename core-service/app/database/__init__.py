@@ -2,16 +2,18 @@
 Database package initialization (async-only).
 Exports commonly used async database components.
 """
-from app.database.connection import engine, SessionLocal, init_db, drop_db
+from app.database.connection import engine, SessionLocal, ReadSessionLocal, init_db, drop_db
 from app.database.base import Base, BaseModel
-from app.database.session import get_db
+from app.database.session import get_db, get_read_db
 
 __all__ = [
     "engine",
     "SessionLocal",
+    "ReadSessionLocal",
     "Base",
     "BaseModel",
     "get_db",
+    "get_read_db",
     "init_db",
     "drop_db",
 ]
@@ -0,0 +1,133 @@
+"""
+Process-wide admission control for database sessions.
+
+Caps how many sessions a worker process holds at once so that
+workers x sessions stays within the database's client budget (see
+docs/issues/DB_CONNECTION_LIMITS.md). Requests beyond the cap queue for a
+bounded time and are then rejected, instead of failing inside asyncpg with
+"max clients reached".
+
+Every opener of the primary database takes a slot: each request session
+dependency, and the short-lived sessions and connections of the claims
+lookup, the revocation refresh, the agent checkpointer and the LLM response
+cache. The latter admit reentrantly: while serving a request that already
+holds a slot they run under it, so a request never waits on itself.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+from app.config import settings
+from app.util.metrics import registry
+
+DB_ADMISSION_WAIT_SECONDS = registry.histogram(
+    "db_admission_wait_seconds", "Time requests waited for a database session slot")
+DB_ADMISSION_IN_USE = registry.gauge("db_admission_in_use", "Database session slots in use")
+DB_ADMISSION_WAITING = registry.gauge("db_admission_waiting", "Requests queued for a database session slot")
+DB_ADMISSION_LIMIT = registry.gauge("db_admission_limit", "Database session slots for this process")
+DB_ADMISSION_REJECTED = registry.counter(
+    "db_admission_rejected_total", "Requests rejected because no database session slot was free",
+    labelnames=("reason",))
+
+
+# Whether the current context (e.g. the request being served) holds a slot
+_holding_slot: ContextVar[bool] = ContextVar("db_admission_holding_slot", default=False)
+
+
+class DBOverloadedError(Exception):
+    """Raised when a database session slot cannot be obtained in time."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Database overloaded ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Semaphore-based limit on concurrent database sessions in this process."""
+
+    def __init__(
+        self,
+        limit: Optional[int],
+        timeout: float = 5.0,
+        max_queue: Optional[int] = None,
+        retry_after: int = 1,
+    ):
+        """
+        Args:
+            limit: Concurrent sessions allowed (None disables admission control)
+            timeout: Seconds a request may wait for a slot
+            max_queue: Waiting requests beyond which new ones are rejected immediately
+            retry_after: Retry-After hint in seconds for rejected requests
+        """
+        self.limit = limit
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.in_use = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(limit) if limit else None
+        DB_ADMISSION_LIMIT.set(limit or 0)
+
+    @asynccontextmanager
+    async def admit(self, reentrant: bool = False) -> AsyncIterator[None]:
+        """
+        Hold a session slot for the duration of the block.
+
+        Args:
+            reentrant: Run under a slot the current context already holds instead
+                of taking another (for connections opened while serving a request)
+
+        Raises:
+            DBOverloadedError: If the queue is full or no slot frees up within the timeout
+        """
+        if self._semaphore is None or (reentrant and _holding_slot.get()):
+            yield
+            return
+
+        if self.max_queue is not None and self._semaphore.locked() and self.waiting >= self.max_queue:
+            DB_ADMISSION_REJECTED.inc(reason="queue_full")
+            raise DBOverloadedError("queue_full", self.retry_after)
+
+        start = time.perf_counter()
+        self.waiting += 1
+        DB_ADMISSION_WAITING.set(self.waiting)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            DB_ADMISSION_REJECTED.inc(reason="timeout")
+            raise DBOverloadedError("timeout", self.retry_after)
+        finally:
+            self.waiting -= 1
+            DB_ADMISSION_WAITING.set(self.waiting)
+        DB_ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+        self.in_use += 1
+        DB_ADMISSION_IN_USE.set(self.in_use)
+        # Restored by value: dependency teardown may run in another context than setup
+        previous = _holding_slot.get()
+        _holding_slot.set(True)
+        try:
+            yield
+        finally:
+            _holding_slot.set(previous)
+            self.in_use -= 1
+            DB_ADMISSION_IN_USE.set(self.in_use)
+            self._semaphore.release()
+
+
+def per_process_limit(budget: Optional[int], workers: int) -> Optional[int]:
+    """Split a global connection budget evenly across worker processes."""
+    if not budget:
+        return None
+    return max(1, budget // max(1, workers))
+
+
+admission_controller = AdmissionController(
+    per_process_limit(settings.DB_CONNECTION_BUDGET, settings.DB_WORKER_COUNT),
+    timeout=settings.DB_ADMISSION_TIMEOUT_SECONDS,
+    max_queue=settings.DB_ADMISSION_MAX_QUEUE,
+    retry_after=settings.DB_ADMISSION_RETRY_AFTER_SECONDS,
+)
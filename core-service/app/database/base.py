@@ -1,14 +1,24 @@
 from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.sql import func
 from sqlalchemy.orm import declarative_base
 
 # Create Base class for models
 Base = declarative_base()
 
+# SQLite stores CURRENT_TIMESTAMP without fractional seconds; bind Python
+# datetimes in the same format so keyset comparisons on timestamps line up.
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
 class BaseModel(Base):
     """Base model with common fields"""
     __abstract__ = True
     
     id = Column(Integer, primary_key=True, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
\ No newline at end of file
@@ -2,9 +2,15 @@
 Async database engine and session configuration.
 Handles async connection to the database.
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import NullPool
+from typing import Dict, List
+from uuid import uuid4
+import itertools
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from app.config import settings
+from app.database.instrumentation import install_query_instrumentation
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,50 +32,284 @@ def get_async_database_url(url: str) -> str:
 
 ASYNC_DATABASE_URL = get_async_database_url(settings.DATABASE_URL)
 
-# Create ASYNC engine
-# Build engine kwargs dynamically so we can control pooling behavior via settings.
-engine_kwargs: dict = {
-    "echo": settings.DEBUG,
-    "future": True,
+# ===== Connection pool profiles =====
+
+POOL_PROFILES: Dict[str, dict] = {
+    # No client-side pooling: every checkout opens a new connection
+    "dev-nullpool": {"poolclass": NullPool},
+    # A few long-lived connections per process, for session-mode poolers or direct Postgres
+    "small-session": {
+        "pool_size": 3,
+        "max_overflow": 0,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    },
+    # PgBouncer/Supavisor in transaction mode: server connections are shared between
+    # clients, so prepared statements must not be cached across transactions
+    "pgbouncer-transaction": {
+        "pool_size": 10,
+        "max_overflow": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 300,
+        "disable_statement_cache": True,
+    },
 }
 
-# For SQLite (file-based) disable pooling
-if ASYNC_DATABASE_URL.startswith("sqlite"):
-    engine_kwargs["poolclass"] = NullPool
-else:
-    # If DB_POOL_SIZE is not set, default to disabling pooling in non-production to
-    # avoid hitting managed DB client limits (e.g., session mode limits).
-    if settings.DB_POOL_SIZE is None:
-        engine_kwargs["poolclass"] = NullPool
+
+# Opt-in SQLite profile: WAL journal, relaxed fsync, memory-mapped I/O and a larger page cache.
+# SQLite allows one writer per database: write transactions serialize on the database
+# lock (waiting up to busy_timeout), not on the pool. A request session keeps its
+# connection from the user lookup until the response ends, so the writer pool has
+# SQLITE_WRITE_MAX_OVERFLOW overflow connections; sessions that only read never take
+# the write lock and do not block each other. Keep write transactions short.
+SQLITE_WAL_PROFILE = "sqlite-wal"
+
+
+def build_engine_kwargs(async_url: str) -> dict:
+    """Build engine kwargs dynamically so we can control pooling behavior via settings."""
+    kwargs: dict = {
+        "echo": settings.DB_ECHO,
+        "future": True,
+    }
+
+    profile_name = settings.DB_POOL_PROFILE
+    if async_url.startswith("sqlite"):
+        if profile_name == SQLITE_WAL_PROFILE:
+            # One long-lived connection plus overflow for concurrently open request sessions
+            kwargs.update(
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=1,
+                max_overflow=settings.SQLITE_WRITE_MAX_OVERFLOW,
+            )
+        else:
+            # For SQLite (file-based) disable pooling
+            kwargs["poolclass"] = NullPool
+        return kwargs
+    if profile_name == SQLITE_WAL_PROFILE:
+        raise ValueError(f"DB_POOL_PROFILE {SQLITE_WAL_PROFILE!r} only applies to SQLite databases")
+
+    if profile_name is None:
+        # If DB_POOL_SIZE is not set, default to disabling pooling in non-production to
+        # avoid hitting managed DB client limits (e.g., session mode limits).
+        profile = {"poolclass": NullPool} if settings.DB_POOL_SIZE is None else {}
+    elif profile_name in POOL_PROFILES:
+        profile = dict(POOL_PROFILES[profile_name])
     else:
-        # Pass explicit pool sizing if provided
-        engine_kwargs["pool_size"] = settings.DB_POOL_SIZE
+        raise ValueError(
+            f"Unknown DB_POOL_PROFILE {profile_name!r}; expected one of {', '.join(POOL_PROFILES)}")
+
+    disable_statement_cache = profile.pop("disable_statement_cache", False)
+    kwargs.update(profile)
+
+    # Explicit settings override the profile
+    if kwargs.get("poolclass") is not NullPool:
+        if settings.DB_POOL_SIZE is not None:
+            kwargs["pool_size"] = settings.DB_POOL_SIZE
         if settings.DB_MAX_OVERFLOW is not None:
-            engine_kwargs["max_overflow"] = settings.DB_MAX_OVERFLOW
+            kwargs["max_overflow"] = settings.DB_MAX_OVERFLOW
+        if settings.DB_POOL_RECYCLE is not None:
+            kwargs["pool_recycle"] = settings.DB_POOL_RECYCLE
+
+    if disable_statement_cache and async_url.startswith("postgresql+asyncpg"):
+        kwargs["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            # Unique names so statements never collide on a shared server connection
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return kwargs
+
+
+def describe_engine_config(kwargs: dict) -> str:
+    """One-line summary of the effective pool configuration, for the startup log."""
+    if kwargs.get("poolclass") is NullPool:
+        return f"profile={settings.DB_POOL_PROFILE or 'default'} pool=NullPool"
+    statement_cache = "off" if kwargs.get("connect_args", {}).get("statement_cache_size") == 0 else "on"
+    description = (
+        f"profile={settings.DB_POOL_PROFILE or 'default'} pool=QueuePool "
+        f"size={kwargs.get('pool_size', 5)} overflow={kwargs.get('max_overflow', 10)} "
+        f"pre_ping={kwargs.get('pool_pre_ping', False)} recycle={kwargs.get('pool_recycle', -1)} "
+        f"statement_cache={statement_cache}"
+    )
+    if settings.DB_POOL_PROFILE == SQLITE_WAL_PROFILE:
+        description += f" pragmas=[{'; '.join(sqlite_pragmas())}]"
+    return description
+
+
+def sqlite_pragmas() -> List[str]:
+    """PRAGMA statements applied to every connection under the sqlite-wal profile."""
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}",
+        "PRAGMA busy_timeout=5000",
+    ]
+
+
+def apply_sqlite_pragmas(async_engine: AsyncEngine) -> None:
+    """Run the sqlite-wal PRAGMAs on each new connection of ``async_engine``."""
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def create_app_engine(async_url: str, **overrides) -> AsyncEngine:
+    """
+    Create an engine configured like the application engine.
+
+    Applies the pool profile (including its connect_args), the sqlite-wal
+    PRAGMAs and the query instrumentation.
+
+    Args:
+        async_url: Async database URL
+        **overrides: Engine kwargs replacing the profile's (e.g. poolclass=NullPool)
+
+    Returns:
+        The new engine
+    """
+    kwargs = {**build_engine_kwargs(async_url), **overrides}
+    if kwargs.get("poolclass") is NullPool:
+        kwargs.pop("pool_size", None)
+        kwargs.pop("max_overflow", None)
+    app_engine = create_async_engine(async_url, **kwargs)
+    if async_url.startswith("sqlite") and settings.DB_POOL_PROFILE == SQLITE_WAL_PROFILE:
+        apply_sqlite_pragmas(app_engine)
+    install_query_instrumentation(app_engine)
+    return app_engine
+
+
+# Create ASYNC engine
+engine_kwargs = build_engine_kwargs(ASYNC_DATABASE_URL)
+engine = create_app_engine(ASYNC_DATABASE_URL)
+SQLITE_WAL_ENABLED = ASYNC_DATABASE_URL.startswith("sqlite") and settings.DB_POOL_PROFILE == SQLITE_WAL_PROFILE
+
+
+class PrimarySession(Session):
+    """Session for read-write dependencies; records writes in the request's routing state."""
+
+
+def _mark_primary_write(session: Session) -> None:
+    state = session.info.get("db_state")
+    if isinstance(state, dict):
+        state["primary_write"] = True
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _after_flush(session, flush_context):
+    _mark_primary_write(session)
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _on_orm_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_primary_write(orm_execute_state.session)
 
-engine = create_async_engine(ASYNC_DATABASE_URL, **engine_kwargs)
 
 # Create ASYNC session factory
 SessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
 )
 
 
+# ===== Read replicas =====
+
+class ReplicaSet:
+    """Read replica engines handed out round-robin."""
+
+    def __init__(self, engines: List[AsyncEngine]):
+        self.engines = engines
+        self._cycle = itertools.cycle(engines) if engines else None
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def next(self) -> AsyncEngine:
+        return next(self._cycle)
+
+
+def _create_replica_engine(url: str) -> AsyncEngine:
+    replica_engine = create_app_engine(get_async_database_url(url))
+    return replica_engine.execution_options(isolation_level="AUTOCOMMIT")
+
+
+replica_urls = list(settings.DATABASE_REPLICA_URLS)
+if settings.DATABASE_READ_URL and settings.DATABASE_READ_URL not in replica_urls:
+    replica_urls.append(settings.DATABASE_READ_URL)
+replicas = ReplicaSet([_create_replica_engine(url) for url in replica_urls])
+if replicas:
+    logger.info(f"Routing read-only sessions to {len(replica_urls)} read replica(s)")
+
+
+class ReadOnlySession(Session):
+    """
+    Session for read-only dependencies; refuses to flush pending changes.
+
+    With replicas configured, each session is pinned to one replica picked
+    round-robin. Once the same request has written through the primary, reads
+    go to the primary so they see that write.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        state = self.info.get("db_state")
+        wrote = isinstance(state, dict) and state.get("primary_write")
+        if replicas and not wrote:
+            replica = self.info.get("replica")
+            if replica is None:
+                replica = self.info["replica"] = replicas.next()
+            return replica.sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+    def flush(self, objects=None):
+        if self.new or self.dirty or self.deleted:
+            raise RuntimeError("Attempted to write through a read-only database session")
+        super().flush(objects)
+
+
+# Read-only engine on the primary pool, used without replicas or after a write.
+# AUTOCOMMIT skips BEGIN/COMMIT round trips for pure reads.
+if SQLITE_WAL_ENABLED:
+    # WAL readers do not block the writer, so reads get their own connections
+    read_engine = create_app_engine(
+        ASYNC_DATABASE_URL, pool_size=settings.SQLITE_READ_POOL_SIZE, max_overflow=0
+    )
+else:
+    read_engine = engine
+read_engine = read_engine.execution_options(isolation_level="AUTOCOMMIT")
+
+# Create read-only ASYNC session factory
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
 async def init_db():
     """
     Initialize database tables asynchronously.
     Call this on application startup.
+    
+    Skips create_all when the stored schema fingerprint matches the models
+    (see app.database.schema).
     """
     from app.database.base import Base
+    from app.database.schema import ensure_schema
     
-    logger.info("Creating database tables...")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("Database tables created successfully")
+    logger.info("Checking database schema...")
+    await ensure_schema(engine, Base.metadata)
 
 
 async def drop_db():
@@ -82,7 +322,10 @@ async def drop_db():
     if settings.APP_ENV == "production":
         raise RuntimeError("Cannot drop database in production!")
     
+    from app.database.schema import drop_schema_version
+    
     logger.warning("Dropping all database tables...")
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    await drop_schema_version(engine)
     logger.warning("All database tables dropped")
\ No newline at end of file
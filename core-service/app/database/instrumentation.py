@@ -0,0 +1,143 @@
+"""
+Per-request SQL instrumentation.
+
+Engine events count the statements each request runs, their total time and
+the slowest one. ``SQLInstrumentationMiddleware`` opens a stats scope per
+request, records the numbers as histograms, exposes them as response headers
+in development, and flags requests that run the same statement shape more
+than ``SQL_N_PLUS_ONE_THRESHOLD`` times (a typical N+1 pattern).
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.util.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+DB_REQUEST_QUERIES = registry.histogram(
+    "db_request_queries", "SQL statements per request", labelnames=("route",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250),
+)
+DB_REQUEST_SECONDS = registry.histogram(
+    "db_request_seconds", "Total SQL execution time per request", labelnames=("route",))
+DB_N_PLUS_ONE = registry.counter(
+    "db_n_plus_one_total", "Requests that repeated one statement shape above the threshold",
+    labelnames=("route",))
+
+# Collapse expanded IN lists and literals so repeated lookups share one shape
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|\$\d+|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|\$\d+|%\(\w+\)s|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a SQL statement so executions differing only in parameters compare equal."""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+@dataclass
+class QueryStats:
+    """SQL statements executed while handling one request."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: Optional[str] = None
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed more than ``threshold`` times."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("sql_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Stats of the request being handled, or None outside a request."""
+    return _current_stats.get()
+
+
+def install_query_instrumentation(async_engine: AsyncEngine) -> None:
+    """Time every statement on ``async_engine`` into the current request's stats."""
+    sync_engine = async_engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start"].pop()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, time.perf_counter() - start)
+
+
+class SQLInstrumentationMiddleware:
+    """ASGI middleware that scopes query stats to each HTTP request."""
+
+    def __init__(self, app, expose_headers: bool = False, n_plus_one_threshold: int = 10):
+        self.app = app
+        self.expose_headers = expose_headers
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and self.expose_headers:
+                headers = list(message.get("headers", []))
+                headers.extend([
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.total_seconds * 1000:.1f}".encode()),
+                    (b"x-db-slowest-ms", f"{stats.slowest_seconds * 1000:.1f}".encode()),
+                ])
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
+            self._record(scope, stats)
+
+    def _record(self, scope, stats: QueryStats) -> None:
+        route = getattr(scope.get("route"), "path", None) or "unmatched"
+        DB_REQUEST_QUERIES.observe(stats.count, route=route)
+        DB_REQUEST_SECONDS.observe(stats.total_seconds, route=route)
+        repeated = stats.repeated_shapes(self.n_plus_one_threshold)
+        if repeated:
+            DB_N_PLUS_ONE.inc(route=route)
+            shape, times = repeated[0]
+            logger.warning(
+                f"Possible N+1 on {scope.get('method')} {route}: statement ran {times} times "
+                f"({stats.count} queries, {stats.total_seconds * 1000:.1f} ms): {shape[:200]}"
+            )
+        if stats.slowest_statement is not None:
+            logger.debug(
+                f"{scope.get('method')} {route}: {stats.count} queries in "
+                f"{stats.total_seconds * 1000:.1f} ms, slowest {stats.slowest_seconds * 1000:.1f} ms: "
+                f"{stats.slowest_statement[:200]}"
+            )
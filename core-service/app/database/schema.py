@@ -0,0 +1,93 @@
+"""
+Schema fingerprinting for fast startup.
+
+The DDL that ``Base.metadata`` would emit is hashed into a fingerprint and
+stored in a one-row ``schema_version`` table after ``create_all`` runs. On the
+next start, a single SELECT that finds the same fingerprint skips
+``create_all`` and its catalog reflection entirely. When DDL is needed,
+workers on PostgreSQL serialize on an advisory lock so only one of them runs
+it; the others find the new fingerprint once they get the lock.
+"""
+import hashlib
+import logging
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, delete, func, insert, select, text
+from sqlalchemy.engine import Dialect
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+logger = logging.getLogger(__name__)
+
+# Kept out of Base.metadata so it never changes the fingerprint itself
+version_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    version_metadata,
+    Column("fingerprint", String(64), primary_key=True),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+# Arbitrary application-wide key for pg_advisory_xact_lock
+SCHEMA_LOCK_KEY = 0x4C6561726E6F7261  # "Learnora"
+
+
+def schema_fingerprint(metadata: MetaData, dialect: Dialect) -> str:
+    """SHA-256 of the CREATE TABLE / CREATE INDEX statements for ``metadata`` on ``dialect``."""
+    ddl = []
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)).strip())
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            ddl.append(str(CreateIndex(index).compile(dialect=dialect)).strip())
+    return hashlib.sha256("\n".join(ddl).encode()).hexdigest()
+
+
+async def _stored_fingerprint(conn: AsyncConnection) -> Optional[str]:
+    try:
+        result = await conn.execute(select(schema_version.c.fingerprint))
+    except DBAPIError:
+        # Version table does not exist yet
+        return None
+    return result.scalar_one_or_none()
+
+
+async def ensure_schema(engine: AsyncEngine, metadata: MetaData) -> bool:
+    """
+    Create missing tables unless the stored fingerprint already matches.
+
+    Args:
+        engine: Engine of the primary database
+        metadata: Metadata of all models
+
+    Returns:
+        True if DDL ran, False if the schema was already current
+    """
+    fingerprint = schema_fingerprint(metadata, engine.dialect)
+
+    async with engine.connect() as conn:
+        if await _stored_fingerprint(conn) == fingerprint:
+            logger.info(f"Database schema up to date ({fingerprint[:12]}), skipping create_all")
+            return False
+
+    async with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            # Only one worker runs DDL; the rest wait here and then see the new fingerprint
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        await conn.run_sync(version_metadata.create_all)
+        if await _stored_fingerprint(conn) == fingerprint:
+            logger.info("Database schema created by another worker, skipping create_all")
+            return False
+
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(delete(schema_version))
+        await conn.execute(insert(schema_version).values(fingerprint=fingerprint))
+
+    logger.info(f"Database schema created/updated ({fingerprint[:12]})")
+    return True
+
+
+async def drop_schema_version(engine: AsyncEngine) -> None:
+    """Forget the stored fingerprint so the next start runs create_all."""
+    async with engine.begin() as conn:
+        await conn.run_sync(version_metadata.drop_all)
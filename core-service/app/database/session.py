@@ -3,14 +3,56 @@ Async database session management and dependencies.
 Provides async session lifecycle management for FastAPI routes.
 """
 from typing import AsyncGenerator
+from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database.connection import SessionLocal
+from app.database.admission import DBOverloadedError, admission_controller
+from app.database.connection import SessionLocal, ReadSessionLocal
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+def get_request_db_state() -> dict:
+    """
+    Per-request routing state shared by ``get_db`` and ``get_read_db``.
+    
+    FastAPI caches dependencies per request, so both sessions of a request see
+    the same dict; a write through the primary pins later reads to the primary.
+    """
+    return {"primary_write": False}
+
+
+def overloaded_error(e: DBOverloadedError) -> HTTPException:
+    """503 response with Retry-After for a request rejected by admission control."""
+    logger.warning(f"Rejecting request: {str(e)}")
+    return HTTPException(
+        status_code=503,
+        detail="Database is overloaded, please retry",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+async def get_db_admission() -> AsyncGenerator[None, None]:
+    """
+    Hold one database admission slot for a session dependency.
+    
+    Used uncached by ``get_db`` and ``get_read_db``: each session holds its own
+    connection, so a request using both takes two slots.
+    
+    Raises:
+        HTTPException: 503 with Retry-After when the database is overloaded
+    """
+    try:
+        async with admission_controller.admit():
+            yield
+    except DBOverloadedError as e:
+        raise overloaded_error(e)
+
+
+async def get_db(
+    db_state: dict = Depends(get_request_db_state),
+    _admission: None = Depends(get_db_admission, use_cache=False),
+) -> AsyncGenerator[AsyncSession, None]:
     """
     Async database session dependency for FastAPI routes.
     
@@ -22,18 +64,20 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     
     Usage in FastAPI routes:
     ```python
-    @router.get("/items")
-    async def get_items(db: AsyncSession = Depends(get_db)):
-        result = await db.execute(select(Item))
-        return result.scalars().all()
+    @router.post("/items")
+    async def create_item(item: ItemCreate, db: AsyncSession = Depends(get_db)):
+        db.add(Item(**item.model_dump()))
     ```
     
+    Use ``get_read_db`` for routes that only read.
+    
     The session is automatically:
     - Created before the route handler runs
     - Passed to the route handler
     - Closed after the route handler completes (even if error occurs)
     """
     async with SessionLocal() as session:
+        session.info["db_state"] = db_state
         try:
             yield session
             await session.commit()
@@ -42,4 +86,33 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+async def get_read_db(
+    db_state: dict = Depends(get_request_db_state),
+    _admission: None = Depends(get_db_admission, use_cache=False),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only async database session dependency for FastAPI routes.
+    
+    Unlike ``get_db`` the session runs in autocommit mode and is never
+    committed, so pure reads skip the BEGIN/COMMIT round trips. Flushing
+    changes raises. With replicas configured the session reads from one of
+    them, unless this request already wrote through ``get_db``.
+    
+    Usage in FastAPI routes:
+    ```python
+    @router.get("/items")
+    async def get_items(db: AsyncSession = Depends(get_read_db)):
+        result = await db.execute(select(Item))
+        return result.scalars().all()
+    ```
+    """
+    async with ReadSessionLocal() as session:
+        session.info["db_state"] = db_state
+        try:
+            yield session
+        except Exception as e:
+            logger.error(f"Database error occurred: {str(e)}")
+            raise
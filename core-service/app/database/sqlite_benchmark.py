@@ -0,0 +1,110 @@
+"""Benchmark the default SQLite setup against the sqlite-wal profile.
+
+Runs the operations of the learning path CRUD suite (create, get by ID, list,
+update, delete) against a fresh database file, one session per operation as
+a request would, and reports operations per second for each configuration.
+
+Usage:
+    python -m app.database.sqlite_benchmark --iterations 500
+"""
+
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.database.base import Base
+from app.database.connection import SQLITE_WAL_PROFILE, apply_sqlite_pragmas, build_engine_kwargs
+
+
+async def _run_operations(maker: async_sessionmaker, iterations: int) -> int:
+    """Run the CRUD operations ``iterations`` times and return the number of operations."""
+    from app.features.learning_path import crud
+    from app.features.learning_path.schemas import LearningPathCreate, LearningPathUpdate
+    from app.features.users.models import User
+
+    async with maker() as session:
+        user = User(email="benchmark@example.com", hashed_password="x")
+        session.add(user)
+        await session.commit()
+
+    operations = 0
+    for i in range(iterations):
+        async with maker() as session:
+            lp = await crud.create_learning_path(session, LearningPathCreate(topic=f"Topic {i}", user_id=user.id))
+        async with maker() as session:
+            await crud.get_learning_path_by_id(session, lp.id)
+        async with maker() as session:
+            await crud.get_all_learning_paths(session, user, 0, 20)
+        async with maker() as session:
+            await crud.update_user_learning_path(session, lp.id, user.id, LearningPathUpdate(topic=f"Updated {i}"))
+        if i % 2:
+            async with maker() as session:
+                await crud.delete_user_learning_path(session, lp.id, user.id)
+            operations += 1
+        operations += 4
+    return operations
+
+
+async def benchmark(profile: str, iterations: int, directory: Path) -> dict:
+    """
+    Benchmark one configuration on a new database file.
+
+    Args:
+        profile: "default" or "sqlite-wal"
+        iterations: Number of CRUD rounds
+        directory: Where to create the database file
+
+    Returns:
+        Dict with operation count, elapsed seconds and operations per second
+    """
+    import app.features.users.models  # noqa: F401  (register tables)
+    import app.features.learning_path.models  # noqa: F401  (register tables)
+    import app.features.preference.preferences  # noqa: F401  (register tables)
+
+    url = f"sqlite+aiosqlite:///{directory / f'{profile}.db'}"
+    previous_profile = settings.DB_POOL_PROFILE
+    settings.DB_POOL_PROFILE = SQLITE_WAL_PROFILE if profile == SQLITE_WAL_PROFILE else None
+    try:
+        engine = create_async_engine(url, **{**build_engine_kwargs(url), "echo": False})
+    finally:
+        settings.DB_POOL_PROFILE = previous_profile
+    if profile == SQLITE_WAL_PROFILE:
+        apply_sqlite_pragmas(engine)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    start = time.perf_counter()
+    operations = await _run_operations(maker, iterations)
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return {
+        "profile": profile,
+        "operations": operations,
+        "seconds": round(elapsed, 3),
+        "ops_per_second": round(operations / elapsed, 1),
+    }
+
+
+async def main(iterations: int) -> list[dict]:
+    with tempfile.TemporaryDirectory() as directory:
+        return [
+            await benchmark(profile, iterations, Path(directory))
+            for profile in ("default", SQLITE_WAL_PROFILE)
+        ]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark SQLite default vs sqlite-wal profile")
+    parser.add_argument("--iterations", type=int, default=500, help="CRUD rounds per configuration")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(main(args.iterations)), indent=2))
@@ -0,0 +1,411 @@
+"""
+LangGraph checkpointer backed by the application database.
+
+Conversations are stored in the ``agent_checkpoint`` and
+``agent_checkpoint_write`` tables through the app's SQLAlchemy engine
+(SQLite or PostgreSQL), so any worker can resume any thread and chats
+survive restarts. Checkpoints are serialized with the graph serializer
+(msgpack) and zlib-compressed above a size threshold. All writes of one
+``put_writes`` call go out as a single batched INSERT, and every ``put``
+prunes the thread namespace down to its newest ``keep_last`` checkpoints in
+the same transaction. The async API runs under database admission control;
+the sync API, on its own loop thread, is not admitted.
+"""
+import asyncio
+import logging
+import threading
+import zlib
+from typing import Any, AsyncIterator, Coroutine, Iterator, Optional, Sequence, TypeVar
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from sqlalchemy import and_, delete, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.database.admission import admission_controller
+from app.features.agent.models import AgentCheckpoint, AgentCheckpointWrite
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+COMPRESSED_SUFFIX = "+zlib"
+
+_checkpoints = AgentCheckpoint.__table__
+_writes = AgentCheckpointWrite.__table__
+
+
+class _LoopThread:
+    """
+    Event loop in a daemon thread that runs the sync checkpointer API.
+
+    Sync graph calls (``graph.invoke``/``get_state``) may come from a thread
+    whose event loop is already running, where the async engine cannot be
+    awaited. Those calls run on this loop with an engine of their own, since
+    pooled async connections are bound to the loop that opened them.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="checkpointer-sync", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+
+class DatabaseCheckpointSaver(BaseCheckpointSaver[str]):
+    """Checkpointer storing LangGraph threads in the application database."""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        keep_last: int = 10,
+        compress_min_bytes: int = 1024,
+        serde: Optional[SerializerProtocol] = None,
+    ):
+        """
+        Args:
+            engine: Async engine of the primary database
+            keep_last: Checkpoints kept per thread and namespace (0 = keep all)
+            compress_min_bytes: Serialized values at least this large are zlib-compressed
+            serde: Serializer (default: the LangGraph JSON+msgpack serializer)
+        """
+        from app.database.connection import create_app_engine
+
+        super().__init__(serde=serde)
+        self.engine = engine
+        self.keep_last = keep_last
+        self.compress_min_bytes = compress_min_bytes
+        # Separate engine for the sync API, used only from the loop thread; configured
+        # like the app engine (connect_args, sqlite-wal PRAGMAs) but without a pool
+        self._sync_engine = create_app_engine(engine.url.render_as_string(hide_password=False), poolclass=NullPool)
+        self._loop_thread = _LoopThread()
+
+    # ===== Serialization =====
+
+    def _dumps(self, value: Any) -> tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(value)
+        if len(data) >= self.compress_min_bytes:
+            return type_ + COMPRESSED_SUFFIX, zlib.compress(data)
+        return type_, data
+
+    def _loads(self, type_: str, data: bytes) -> Any:
+        if type_.endswith(COMPRESSED_SUFFIX):
+            type_, data = type_[: -len(COMPRESSED_SUFFIX)], zlib.decompress(data)
+        return self.serde.loads_typed((type_, data))
+
+    def _to_tuple(self, row, writes: list) -> CheckpointTuple:
+        thread_id, checkpoint_ns = row.thread_id, row.checkpoint_ns
+        writes = sorted(writes, key=lambda w: writes_sort_key(w.task_path, w.task_id, w.idx))
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": row.checkpoint_id,
+                }
+            },
+            checkpoint=self._loads(row.checkpoint_type, row.checkpoint),
+            metadata=self._loads(row.metadata_type, row.metadata),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": row.parent_checkpoint_id,
+                    }
+                }
+                if row.parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[(w.task_id, w.channel, self._loads(w.value_type, w.value)) for w in writes],
+        )
+
+    # ===== Async implementation (parametrized by engine) =====
+
+    async def _get_tuple(self, engine: AsyncEngine, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = select(_checkpoints).where(
+            _checkpoints.c.thread_id == thread_id,
+            _checkpoints.c.checkpoint_ns == checkpoint_ns,
+        )
+        if checkpoint_id := get_checkpoint_id(config):
+            query = query.where(_checkpoints.c.checkpoint_id == checkpoint_id)
+        else:
+            query = query.order_by(_checkpoints.c.checkpoint_id.desc()).limit(1)
+
+        async with engine.connect() as conn:
+            row = (await conn.execute(query)).first()
+            if row is None:
+                return None
+            writes = (await conn.execute(select(_writes).where(
+                _writes.c.thread_id == thread_id,
+                _writes.c.checkpoint_ns == checkpoint_ns,
+                _writes.c.checkpoint_id == row.checkpoint_id,
+            ))).all()
+        return self._to_tuple(row, writes)
+
+    async def _list(
+        self,
+        engine: AsyncEngine,
+        config: Optional[RunnableConfig],
+        filter: Optional[dict[str, Any]],
+        before: Optional[RunnableConfig],
+        limit: Optional[int],
+    ) -> list[CheckpointTuple]:
+        query = select(_checkpoints).order_by(
+            _checkpoints.c.thread_id, _checkpoints.c.checkpoint_ns, _checkpoints.c.checkpoint_id.desc()
+        )
+        if config:
+            query = query.where(_checkpoints.c.thread_id == config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                query = query.where(_checkpoints.c.checkpoint_ns == checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                query = query.where(_checkpoints.c.checkpoint_id == checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            query = query.where(_checkpoints.c.checkpoint_id < before_id)
+        # Metadata is filtered after decoding, so the limit can only go into SQL without a filter
+        if limit is not None and not filter:
+            query = query.limit(limit)
+
+        async with engine.connect() as conn:
+            rows = []
+            for row in (await conn.execute(query)).all():
+                if filter:
+                    metadata = self._loads(row.metadata_type, row.metadata)
+                    if not all(metadata.get(k) == v for k, v in filter.items()):
+                        continue
+                rows.append(row)
+                if limit is not None and len(rows) >= limit:
+                    break
+            if not rows:
+                return []
+            # Pending writes of all listed checkpoints in one query
+            keys = [(r.thread_id, r.checkpoint_ns, r.checkpoint_id) for r in rows]
+            writes = (await conn.execute(select(_writes).where(
+                tuple_(_writes.c.thread_id, _writes.c.checkpoint_ns, _writes.c.checkpoint_id).in_(keys)
+            ))).all()
+
+        writes_by_key: dict[tuple, list] = {}
+        for w in writes:
+            writes_by_key.setdefault((w.thread_id, w.checkpoint_ns, w.checkpoint_id), []).append(w)
+        return [self._to_tuple(row, writes_by_key.get(key, [])) for row, key in zip(rows, keys)]
+
+    async def _put(
+        self,
+        engine: AsyncEngine,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_type, checkpoint_data = self._dumps(checkpoint)
+        metadata_type, metadata_data = self._dumps(get_checkpoint_metadata(config, metadata))
+
+        async with engine.begin() as conn:
+            await conn.execute(insert(_checkpoints).values(
+                thread_id=thread_id,
+                checkpoint_ns=checkpoint_ns,
+                checkpoint_id=checkpoint["id"],
+                parent_checkpoint_id=config["configurable"].get("checkpoint_id"),
+                checkpoint_type=checkpoint_type,
+                checkpoint=checkpoint_data,
+                metadata_type=metadata_type,
+                metadata=metadata_data,
+            ))
+            if self.keep_last > 0:
+                await self._prune(conn, thread_id, checkpoint_ns)
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def _prune(self, conn, thread_id: str, checkpoint_ns: str) -> None:
+        """Delete checkpoints (and their writes) older than the newest ``keep_last``."""
+        cutoff = (await conn.execute(
+            select(_checkpoints.c.checkpoint_id)
+            .where(_checkpoints.c.thread_id == thread_id, _checkpoints.c.checkpoint_ns == checkpoint_ns)
+            .order_by(_checkpoints.c.checkpoint_id.desc())
+            .offset(self.keep_last - 1)
+            .limit(1)
+        )).scalar_one_or_none()
+        if cutoff is None:
+            return
+        for table in (_checkpoints, _writes):
+            await conn.execute(delete(table).where(
+                table.c.thread_id == thread_id,
+                table.c.checkpoint_ns == checkpoint_ns,
+                table.c.checkpoint_id < cutoff,
+            ))
+
+    async def _put_writes(
+        self,
+        engine: AsyncEngine,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str,
+    ) -> None:
+        if not writes:
+            return
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        key = and_(
+            _writes.c.thread_id == thread_id,
+            _writes.c.checkpoint_ns == checkpoint_ns,
+            _writes.c.checkpoint_id == checkpoint_id,
+            _writes.c.task_id == task_id,
+        )
+        rows = {}
+        for idx, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, idx)
+            value_type, value_data = self._dumps(value)
+            rows[idx] = {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+                "task_id": task_id,
+                "idx": idx,
+                "channel": channel,
+                "value_type": value_type,
+                "value": value_data,
+                "task_path": task_path,
+            }
+
+        async with engine.begin() as conn:
+            # Special writes (negative idx: errors, interrupts) replace earlier ones;
+            # regular writes are kept if already stored, like the in-memory saver
+            special = [idx for idx in rows if idx < 0]
+            if special:
+                await conn.execute(delete(_writes).where(key, _writes.c.idx.in_(special)))
+            existing = set((await conn.execute(select(_writes.c.idx).where(key))).scalars())
+            new_rows = [row for idx, row in rows.items() if idx not in existing]
+            if new_rows:
+                await conn.execute(insert(_writes), new_rows)
+
+    async def _delete_thread(self, engine: AsyncEngine, thread_id: str) -> None:
+        async with engine.begin() as conn:
+            for table in (_checkpoints, _writes):
+                await conn.execute(delete(table).where(table.c.thread_id == thread_id))
+
+    # ===== Async API =====
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        async with admission_controller.admit(reentrant=True):
+            return await self._get_tuple(self.engine, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        async with admission_controller.admit(reentrant=True):
+            items = await self._list(self.engine, config, filter, before, limit)
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        async with admission_controller.admit(reentrant=True):
+            return await self._put(self.engine, config, checkpoint, metadata)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        async with admission_controller.admit(reentrant=True):
+            await self._put_writes(self.engine, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        async with admission_controller.admit(reentrant=True):
+            await self._delete_thread(self.engine, thread_id)
+
+    # ===== Sync API =====
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self._loop_thread.run(self._get_tuple(self._sync_engine, config))
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        yield from self._loop_thread.run(self._list(self._sync_engine, config, filter, before, limit))
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self._loop_thread.run(self._put(self._sync_engine, config, checkpoint, metadata))
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self._loop_thread.run(self._put_writes(self._sync_engine, config, writes, task_id, task_path))
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._loop_thread.run(self._delete_thread(self._sync_engine, thread_id))
+
+
+def build_checkpointer() -> BaseCheckpointSaver:
+    """Create the checkpointer selected by ``settings.AGENT_CHECKPOINTER``."""
+    if settings.AGENT_CHECKPOINTER == "memory":
+        return MemorySaver()
+    from app.database.connection import engine
+
+    return DatabaseCheckpointSaver(
+        engine,
+        keep_last=settings.AGENT_CHECKPOINT_KEEP_LAST,
+        compress_min_bytes=settings.AGENT_CHECKPOINT_COMPRESS_MIN_BYTES,
+    )
+
+
+# Shared by all compiled agent graphs of the process
+checkpointer = build_checkpointer()
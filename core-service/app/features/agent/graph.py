@@ -1,6 +1,5 @@
-from langchain.chat_models import init_chat_model
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langgraph.checkpoint.memory import MemorySaver
+from app.features.agent.checkpointer import checkpointer
 from langgraph.graph import START, END, MessagesState, StateGraph
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from typing import Sequence
@@ -11,16 +10,15 @@ from langgraph.types import Command, interrupt
 from langchain_core.runnables import RunnableConfig
 
 from app.features.agent.type import AgentMode
+from app.features.agent.memory import COMPACT_MEMORY_NODE, compact_memory, prompt_messages
 from app.features.agent.learning_path_graph.learning_path_graph import learning_path_graph
 from app.features.agent.learning_path_graph.type import IntentionState
+from app.util.chat_models import chat_models
 from langchain_core.messages import HumanMessage
 
 class CombAgentState(IntentionState):
     pass
 
-# Initialize the model
-model = init_chat_model("gemini-2.5-flash", model_provider="google_genai")
-
 prompt_template = ChatPromptTemplate.from_messages(
     [
         (
@@ -34,9 +32,9 @@ prompt_template = ChatPromptTemplate.from_messages(
     
 workflow = StateGraph(state_schema=CombAgentState)
 
-def call_model(state: CombAgentState):
-    prompt = prompt_template.invoke(state)
-    response = model.invoke(prompt)
+async def call_model(state: CombAgentState):
+    prompt = prompt_template.invoke({"messages": prompt_messages(state)})
+    response = await chat_models.get("chat").ainvoke(prompt)
     return {"messages": [response]}
 
 def route_mode(state: CombAgentState):
@@ -55,14 +53,18 @@ def reset_mode(state: CombAgentState) -> dict:
     print("🔄 Resetting mode to BASIC after learning path completion")
     return {"mode": None}
 
+workflow.add_node(COMPACT_MEMORY_NODE, compact_memory)
 workflow.add_node("basic_chat", call_model)
 workflow.add_node("lpp_graph", learning_path_graph)
 workflow.add_node("reset_mode", reset_mode)
 
 # workflow.add_edge(START, "basic_chat")
 
+# Bound the conversation memory before every run
+workflow.add_edge(START, COMPACT_MEMORY_NODE)
+
 workflow.add_conditional_edges(
-    START,
+    COMPACT_MEMORY_NODE,
     route_mode,
     {
         AgentMode.BASIC: "basic_chat",
@@ -77,8 +79,7 @@ workflow.add_edge("basic_chat", END)
 workflow.add_edge("lpp_graph", "reset_mode")
 workflow.add_edge("reset_mode", END)
 
-memory = MemorySaver()
-graph = workflow.compile(checkpointer=memory)
+graph = workflow.compile(checkpointer=checkpointer)
 
 # --- Exports ---
 __all__ = ["graph", "CombAgentState"]
\ No newline at end of file
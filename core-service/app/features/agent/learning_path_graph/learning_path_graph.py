@@ -1,6 +1,8 @@
-from langchain.chat_models import init_chat_model
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langgraph.checkpoint.memory import MemorySaver
+from app.features.agent.checkpointer import checkpointer
+from app.features.agent.response_cache import llm_response_cache
+from app.features.agent.memory import COMPACT_MEMORY_NODE, compact_memory, prompt_messages
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import START, END, MessagesState, StateGraph
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from typing import Sequence
@@ -12,12 +14,14 @@ from langgraph.types import Command, interrupt
 from typing import Literal
 import json
 
-from app.features.agent.learning_path_graph.prompt import evaluator_prompt, followup_prompt, formatter_prompt, goal_definition_prompt, concept_graph_prompt
+from app.features.agent.learning_path_graph.prompt import evaluator_prompt, followup_prompt, formatter_prompt, goal_definition_prompt, concept_graph_prompt, GOAL_DEFINITION_PROMPT_VERSION, CONCEPT_GRAPH_PROMPT_VERSION
 from app.features.agent.learning_path_graph.type import ConceptGraphState, GoalDefinitionState, IntentionAnalysis, IntentionOutput, IntentionState, LearningGoalDefinition, LearningGoalDefinition
 from app.features.agent.type import AgentMode, AgentState
+from app.util.chat_models import chat_models
 
-# Initialize the model
-model = init_chat_model("gemini-2.5-flash-lite", model_provider="google_genai")
+def get_model():
+    """Chat model of the learning path graph (created on first use)."""
+    return chat_models.get("learning_path")
 
 basic_prompt_template = ChatPromptTemplate.from_messages(
     [
@@ -32,9 +36,9 @@ basic_prompt_template = ChatPromptTemplate.from_messages(
 
 MAX_FOLLOW_UPS = 1
 
-def basic_call_model(state: IntentionState):
-    prompt = basic_prompt_template.invoke(state)
-    response = model.invoke(prompt)
+async def basic_call_model(state: IntentionState):
+    prompt = basic_prompt_template.invoke({"messages": prompt_messages(state)})
+    response = await get_model().ainvoke(prompt)
     return {"messages": [response]}
 
 def route_mode(state: IntentionState):
@@ -87,10 +91,7 @@ def initial_asker(state: IntentionState) -> dict:
 # Node 2: Intention Evaluator
 ###############################
 
-# Create structured output LLM
-evaluator_llm = model.with_structured_output(IntentionAnalysis)
-
-def intention_evaluator(state: IntentionState) -> dict:
+async def intention_evaluator(state: IntentionState) -> dict:
     """
     Node 2: Evaluate if u   ser's intention is clear.
     
@@ -106,12 +107,12 @@ def intention_evaluator(state: IntentionState) -> dict:
     context_dict = {
         "desired_outcome": state.get("desired_outcome") or "Not yet identified",
         "context": str(state.get("context") or "None provided"),
-        "messages": state.get("messages", [])
+        "messages": prompt_messages(state)
     }
     
     # Invoke evaluator with structured output
     prompt = evaluator_prompt.invoke(context_dict)
-    analysis: IntentionAnalysis = evaluator_llm.invoke(prompt)
+    analysis: IntentionAnalysis = await get_model().with_structured_output(IntentionAnalysis).ainvoke(prompt)
     
     # Prepare updates
     updates = {}
@@ -171,7 +172,7 @@ def route_after_evaluation(state: IntentionState) -> Literal["format_output", "a
 # Node 3: Follow-up Question Generator
 ###############################
 
-def followup_generator(state: IntentionState) -> dict:
+async def followup_generator(state: IntentionState) -> dict:
     """
     Node 3: Generate a follow-up clarifying question.
     
@@ -186,12 +187,12 @@ def followup_generator(state: IntentionState) -> dict:
         "desired_outcome": state.get("desired_outcome") or "Not yet identified",
         "context": str(state.get("context") or "None provided"),
         "follow_up_count": state.get("follow_up_count", 0) + 1,  # Increment for prompt
-        "messages": state.get("messages", [])
+        "messages": prompt_messages(state)
     }
     
     # Generate follow-up question
     prompt = followup_prompt.invoke(context_dict)
-    response = model.invoke(prompt)
+    response = await get_model().ainvoke(prompt)
     
     # Increment follow-up counter
     new_count = state.get("follow_up_count", 0) + 1
@@ -207,10 +208,7 @@ def followup_generator(state: IntentionState) -> dict:
 # Node 4: Output Formatter
 ###############################
 
-# Create formatter LLM with structured output
-formatter_llm = model.with_structured_output(IntentionOutput)
-
-def output_formatter(state: IntentionState) -> dict:
+async def output_formatter(state: IntentionState) -> dict:
     """
     Node 4: Format the final intention output.
     
@@ -227,12 +225,12 @@ def output_formatter(state: IntentionState) -> dict:
     context_dict = {
         "desired_outcome": state.get("desired_outcome") or "Not specified",
         "context": str(state.get("context") or "None provided"),
-        "messages": state.get("messages", [])
+        "messages": prompt_messages(state)
     }
     
     # Generate formatted output
     prompt = formatter_prompt.invoke(context_dict)
-    output: IntentionOutput = formatter_llm.invoke(prompt)
+    output: IntentionOutput = await get_model().with_structured_output(IntentionOutput).ainvoke(prompt)
     
     # Create completion message
     completion_msg = (
@@ -262,10 +260,7 @@ def output_formatter(state: IntentionState) -> dict:
 # Node 5: Goal Definition
 ###############################    
     
-# Create LLM with structured output
-goal_definition_llm = model.with_structured_output(LearningGoalDefinition)
-
-def define_learning_goal(state: GoalDefinitionState) -> dict:
+async def define_learning_goal(state: GoalDefinitionState, config: RunnableConfig) -> dict:
     """
     Define formal learning goal from user's intention.
     
@@ -286,8 +281,19 @@ def define_learning_goal(state: GoalDefinitionState) -> dict:
     
     # Format and invoke the LLM with structured output
     # Use the chain: prompt | llm
-    chain = goal_definition_prompt | goal_definition_llm
-    goal_def: LearningGoalDefinition = chain.invoke(context_dict)
+    async def request_goal_definition() -> dict:
+        chain = goal_definition_prompt | get_model().with_structured_output(LearningGoalDefinition)
+        return (await chain.ainvoke(context_dict)).model_dump()
+    
+    # Recurring intentions are answered from the response cache
+    goal_def = LearningGoalDefinition.model_validate(await llm_response_cache.cached(
+        node="define_learning_goal",
+        prompt_version=GOAL_DEFINITION_PROMPT_VERSION,
+        role="learning_path",
+        inputs=context_dict,
+        compute=request_goal_definition,
+        config=config,
+    ))
     
     # Create user-facing message
     message_content = (
@@ -320,32 +326,10 @@ def define_learning_goal(state: GoalDefinitionState) -> dict:
 # Node 6: Concept Graph Generation
 ################################
     
-def generate_concept_graph(state: ConceptGraphState) -> dict:
-    """
-    Generate prerequisite graph of learning concepts.
-    
-    Takes competencies and breaks them down into:
-    - 8-15 learnable concepts
-    - Prerequisite relationships between concepts
-    - Logical learning sequence
-    
-    Returns:
-        dict: Updated state with concept_graph (JSON array)
-    """
-    # Format competencies as numbered list
-    competencies = state.get("competencies") or []
-    competencies_text = "\n".join([f"{i}. {comp}" for i, comp in enumerate(competencies, 1)])
-    
-    # Prepare context for the prompt
-    context_dict = {
-        "topic": state.get("topic") or "Not specified",
-        "learning_goal": state.get("learning_goal") or "Not specified",
-        "competencies_text": competencies_text
-    }
-    
-    # Generate concept graph
-    chain = concept_graph_prompt | model
-    response = chain.invoke(context_dict)
+async def _request_concept_graph(context_dict: dict) -> list:
+    """Ask the model for the concept graph and parse/validate its JSON array."""
+    chain = concept_graph_prompt | get_model()
+    response = await chain.ainvoke(context_dict)
     
     # Parse JSON from response
     try:
@@ -367,41 +351,7 @@ def generate_concept_graph(state: ConceptGraphState) -> dict:
             if not isinstance(item, dict) or "concept" not in item or "prerequisites" not in item:
                 raise ValueError("Each concept must have 'concept' and 'prerequisites' fields")
         
-        print(f"📊 Concept graph generated!")
-        print(f"   Total concepts: {len(concept_graph)}")
-        print(f"   Foundational (no prereqs): {sum(1 for c in concept_graph if not c['prerequisites'])}")
-        
-        # Create user-facing message
-        message_content = (
-            f"📊 **Learning Path Concepts Mapped!**\n\n"
-            f"I've broken down your learning journey into **{len(concept_graph)} key concepts**:\n\n"
-        )
-        
-        # Group by prerequisite count for display
-        foundational = [c for c in concept_graph if not c["prerequisites"]]
-        intermediate = [c for c in concept_graph if len(c["prerequisites"]) in [1, 2]]
-        advanced = [c for c in concept_graph if len(c["prerequisites"]) > 2]
-        
-        if foundational:
-            message_content += "**🌱 Foundational Concepts:**\n"
-            for c in foundational[:5]:  # Show first 5
-                message_content += f"• {c['concept']}\n"
-            if len(foundational) > 5:
-                message_content += f"  ...and {len(foundational) - 5} more\n"
-            message_content += "\n"
-        
-        if intermediate:
-            message_content += f"**🔨 Intermediate Concepts:** {len(intermediate)} concepts\n\n"
-        
-        if advanced:
-            message_content += f"**🚀 Advanced Concepts:** {len(advanced)} concepts\n\n"
-        
-        message_content += "The concepts are organized with clear prerequisites to guide your learning sequence!"
-        
-        return {
-            "concept_graph": concept_graph,
-            "messages": [AIMessage(content=message_content)]
-        }
+        return concept_graph
         
     except json.JSONDecodeError as e:
         print(f"❌ Failed to parse JSON: {e}")
@@ -412,6 +362,76 @@ def generate_concept_graph(state: ConceptGraphState) -> dict:
         raise
 
 
+async def generate_concept_graph(state: ConceptGraphState, config: RunnableConfig) -> dict:
+    """
+    Generate prerequisite graph of learning concepts.
+    
+    Takes competencies and breaks them down into:
+    - 8-15 learnable concepts
+    - Prerequisite relationships between concepts
+    - Logical learning sequence
+    
+    Returns:
+        dict: Updated state with concept_graph (JSON array)
+    """
+    # Format competencies as numbered list
+    competencies = state.get("competencies") or []
+    competencies_text = "\n".join([f"{i}. {comp}" for i, comp in enumerate(competencies, 1)])
+    
+    # Prepare context for the prompt
+    context_dict = {
+        "topic": state.get("topic") or "Not specified",
+        "learning_goal": state.get("learning_goal") or "Not specified",
+        "competencies_text": competencies_text
+    }
+    
+    # Generate concept graph (recurring goals are answered from the response cache)
+    concept_graph = await llm_response_cache.cached(
+        node="generate_concept_graph",
+        prompt_version=CONCEPT_GRAPH_PROMPT_VERSION,
+        role="learning_path",
+        inputs=context_dict,
+        compute=lambda: _request_concept_graph(context_dict),
+        config=config,
+    )
+    
+    print(f"📊 Concept graph generated!")
+    print(f"   Total concepts: {len(concept_graph)}")
+    print(f"   Foundational (no prereqs): {sum(1 for c in concept_graph if not c['prerequisites'])}")
+    
+    # Create user-facing message
+    message_content = (
+        f"📊 **Learning Path Concepts Mapped!**\n\n"
+        f"I've broken down your learning journey into **{len(concept_graph)} key concepts**:\n\n"
+    )
+    
+    # Group by prerequisite count for display
+    foundational = [c for c in concept_graph if not c["prerequisites"]]
+    intermediate = [c for c in concept_graph if len(c["prerequisites"]) in [1, 2]]
+    advanced = [c for c in concept_graph if len(c["prerequisites"]) > 2]
+    
+    if foundational:
+        message_content += "**🌱 Foundational Concepts:**\n"
+        for c in foundational[:5]:  # Show first 5
+            message_content += f"• {c['concept']}\n"
+        if len(foundational) > 5:
+            message_content += f"  ...and {len(foundational) - 5} more\n"
+        message_content += "\n"
+    
+    if intermediate:
+        message_content += f"**🔨 Intermediate Concepts:** {len(intermediate)} concepts\n\n"
+    
+    if advanced:
+        message_content += f"**🚀 Advanced Concepts:** {len(advanced)} concepts\n\n"
+    
+    message_content += "The concepts are organized with clear prerequisites to guide your learning sequence!"
+    
+    return {
+        "concept_graph": concept_graph,
+        "messages": [AIMessage(content=message_content)]
+    }
+
+
 ###############################
 # Build the Learning Path Graph
 ###############################
@@ -419,6 +439,7 @@ def generate_concept_graph(state: ConceptGraphState) -> dict:
 # Build the complete learning path generation graph
 learning_path_builder = StateGraph(ConceptGraphState)
 
+learning_path_builder.add_node(COMPACT_MEMORY_NODE, compact_memory)
 learning_path_builder.add_node("basic_chat", basic_call_model)
 learning_path_builder.add_node("reset_mode", reset_mode)
 
@@ -436,9 +457,12 @@ learning_path_builder.add_node("define_goal", define_learning_goal)
 learning_path_builder.add_node("generate_concepts", generate_concept_graph)
 
 # Define the complete flow
+# Bound the conversation memory before every run
+learning_path_builder.add_edge(START, COMPACT_MEMORY_NODE)
+
 # Step 1 flow
 learning_path_builder.add_conditional_edges(
-    START,
+    COMPACT_MEMORY_NODE,
     route_mode,
     {
         AgentMode.BASIC: "basic_chat",
@@ -477,9 +501,8 @@ learning_path_builder.add_edge("generate_concepts", "reset_mode")
 learning_path_builder.add_edge("reset_mode", END)
 
 # Compile the complete pipeline
-learning_path_memory = MemorySaver()
 learning_path_graph = learning_path_builder.compile(
-    checkpointer=learning_path_memory,
+    checkpointer=checkpointer,
     interrupt_before=["evaluate_intention"]  # Wait for user input in Step 1
 )
 
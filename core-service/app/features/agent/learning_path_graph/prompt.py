@@ -133,6 +133,8 @@ Format the output now:"""
 ])
 
 # Prompt for goal definition
+# Bump the version whenever the prompt changes so cached responses are not reused
+GOAL_DEFINITION_PROMPT_VERSION = "1"
 goal_definition_prompt = ChatPromptTemplate.from_messages([
     (
         "human",
@@ -226,6 +228,7 @@ EXAMPLE:
 """
 
 # Prompt for concept graph generation
+CONCEPT_GRAPH_PROMPT_VERSION = "1"
 concept_graph_prompt = ChatPromptTemplate.from_messages([
     (
         "human",
@@ -2,7 +2,6 @@
 
 from typing import Optional, List, Dict
 from xml.etree.ElementInclude import include
-from langchain.chat_models import init_chat_model
 from langchain.agents import create_agent
 from langchain.agents.structured_output import ToolStrategy
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -15,6 +14,7 @@ from app.features.agent.mcq_generator.schemas import (
 from app.features.agent.mcq_generator.utils import build_learning_path_context
 from app.features.learning_path.service import LearningPathService
 from app.features.users.models import User
+from app.util.chat_models import chat_models
 
 
 class MCQGeneratorAgent:
@@ -26,24 +26,23 @@ class MCQGeneratorAgent:
     
     def __init__(
         self, 
-        model_name: str = "gemini-2.5-flash-lite",
-        model_provider: str = "google_genai",
+        model_name: Optional[str] = None,
+        model_provider: Optional[str] = None,
         temperature: float = 0.7
     ):
         """
         Initialize the MCQ generator agent.
         
         Args:
-            model_name: Model to use (default: gemini-2.5-flash-lite)
-            model_provider: Model provider (default: google_genai)
+            model_name: Model to use (default: the "mcq" model in settings.LLM_MODELS)
+            model_provider: Model provider (default: settings.LLM_PROVIDER)
             temperature: Temperature for generation (0.0-1.0, default: 0.7)
         """
-        # Initialize the LLM using init_chat_model (same as learning_path_graph)
-        self.llm = init_chat_model(
-            model_name,
-            model_provider=model_provider,
-            temperature=temperature
-        )
+        # Shared client from the model registry
+        if model_name:
+            self.llm = chat_models.get_named(model_name, model_provider, temperature=temperature)
+        else:
+            self.llm = chat_models.get("mcq", temperature=temperature)
         
         # System prompt for the MCQ generation agent
         self.system_prompt = """You are an expert educational AI tutor specializing in creating high-quality multiple-choice questions for learning assessment.
@@ -68,7 +67,7 @@ Always consider the learning path context to ensure questions build appropriatel
         # In some LangChain versions, passing model parameters directly to create_agent
         # can trigger auto-detection logic that may select an incorrect model type or
         # configuration, especially when multiple providers or custom models are available.
-        # By explicitly initializing the LLM with init_chat_model and passing the model object,
+        # By explicitly passing the registry's model object,
         # we ensure consistent behavior and avoid subtle bugs related to model selection.
         self.agent = create_agent(
             model=self.llm,  # Pass the already initialized model object
@@ -0,0 +1,163 @@
+"""Bounded conversation memory for the agent graphs.
+
+``add_messages`` only ever appends, so without a policy every prompt carries
+the whole thread and every checkpoint stores it. ``compact_memory`` runs at
+the start of each graph run. Once the prompt history (the running summary,
+the messages and ``AGENT_MEMORY_PROMPT_RESERVE_TOKENS`` for the node's system
+prompt) exceeds ``AGENT_MEMORY_MAX_TOKENS``, it folds the older messages into
+the running ``summary`` with one model call and removes them from the
+checkpointed state. It keeps at most ``AGENT_MEMORY_KEEP_TURNS`` recent turns,
+within ``AGENT_MEMORY_TARGET_RATIO`` of the budget, so the next compaction is
+several turns away rather than on every turn. Nodes build their prompts with
+``prompt_messages`` so the summary precedes the remaining messages.
+
+Token counts are approximate (characters per token), which is enough to keep
+prompts within a budget without a provider round trip.
+"""
+
+import logging
+from typing import Optional, Sequence
+
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately, get_buffer_string
+from langchain_core.prompts import ChatPromptTemplate
+
+from app.config import settings
+from app.util.chat_models import chat_models
+from app.util.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Graph node name of compact_memory (hidden from streamed chat events)
+COMPACT_MEMORY_NODE = "compact_memory"
+
+AGENT_MEMORY_COMPACTIONS = registry.counter(
+    "agent_memory_compactions_total", "Graph runs that folded old messages into the running summary"
+)
+AGENT_MEMORY_MESSAGES_FOLDED = registry.counter(
+    "agent_memory_messages_folded_total", "Messages removed from threads after summarization"
+)
+
+summary_prompt = ChatPromptTemplate.from_messages([
+    (
+        "human",
+        """You maintain the running summary of a conversation between a learner and Learnora, an AI learning assistant.
+
+Current summary:
+{summary}
+
+Earlier messages to fold into the summary:
+{transcript}
+
+Write the updated summary in at most {max_words} words. Keep the learner's goals, background, constraints, decisions and any open questions; drop greetings and repetition. Reply with the summary only."""
+    ),
+])
+
+
+def count_tokens(messages: Sequence[BaseMessage]) -> int:
+    """Approximate number of prompt tokens of ``messages``."""
+    return count_tokens_approximately(messages)
+
+
+def _turn_starts(messages: Sequence[BaseMessage]) -> list[int]:
+    """Indexes where a turn (a human message and the replies to it) starts."""
+    starts = [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    return starts
+
+
+def split_for_summary(
+    messages: Sequence[BaseMessage],
+    keep_turns: int,
+    max_tokens: int,
+) -> tuple[list[BaseMessage], list[BaseMessage]]:
+    """
+    Split a thread into the messages to summarize and the ones to keep verbatim.
+
+    Args:
+        messages: Messages of the thread, oldest first
+        keep_turns: Number of most recent turns to keep
+        max_tokens: Token budget of the kept messages (0 = no budget); the last turn is always kept
+
+    Returns:
+        Tuple of (older messages, recent messages)
+    """
+    starts = _turn_starts(messages)
+    first = max(len(starts) - keep_turns, 0)
+    while max_tokens > 0 and first < len(starts) - 1 and count_tokens(messages[starts[first]:]) > max_tokens:
+        first += 1
+    cut = starts[first]
+    return list(messages[:cut]), list(messages[cut:])
+
+
+def prompt_messages(state: dict) -> list[BaseMessage]:
+    """Messages for a node prompt: the running summary (if any) followed by the kept messages."""
+    messages = list(state.get("messages") or [])
+    summary = state.get("summary")
+    if summary:
+        return [SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"), *messages]
+    return messages
+
+
+def history_tokens(state: dict) -> int:
+    """Approximate prompt tokens of a node run: system prompt reserve, summary and messages."""
+    return count_tokens(prompt_messages(state)) + settings.AGENT_MEMORY_PROMPT_RESERVE_TOKENS
+
+
+def _summary_token_budget() -> int:
+    # About 4 tokens per 3 words
+    return settings.AGENT_MEMORY_SUMMARY_MAX_WORDS * 4 // 3
+
+
+async def summarize(summary: Optional[str], messages: Sequence[BaseMessage]) -> str:
+    """Fold ``messages`` into ``summary`` with the memory model."""
+    prompt = summary_prompt.invoke({
+        "summary": summary or "(none yet)",
+        "transcript": get_buffer_string(messages, human_prefix="Learner", ai_prefix="Learnora"),
+        "max_words": settings.AGENT_MEMORY_SUMMARY_MAX_WORDS,
+    })
+    response = await chat_models.get("memory").ainvoke(prompt)
+    return str(response.content).strip()
+
+
+async def compact_memory(state: dict) -> dict:
+    """
+    Graph node: fold older turns into the running summary once the history is over budget.
+
+    Returns:
+        dict: The new summary and removals of the folded messages, or no update
+    """
+    if settings.AGENT_MEMORY_KEEP_TURNS <= 0 or settings.AGENT_MEMORY_MAX_TOKENS <= 0:
+        return {}
+    if history_tokens(state) <= settings.AGENT_MEMORY_MAX_TOKENS:
+        return {}
+
+    # Shrink well below the budget (the new summary included) so the next turns fit
+    target = (
+        int(settings.AGENT_MEMORY_MAX_TOKENS * settings.AGENT_MEMORY_TARGET_RATIO)
+        - settings.AGENT_MEMORY_PROMPT_RESERVE_TOKENS
+        - _summary_token_budget()
+    )
+    older, _ = split_for_summary(
+        state.get("messages") or [],
+        settings.AGENT_MEMORY_KEEP_TURNS,
+        max(target, 1),
+    )
+    if not older:
+        return {}
+
+    try:
+        summary = await summarize(state.get("summary"), older)
+    except Exception as e:
+        # Keep the messages; the next run tries again
+        logger.warning(f"Conversation summarization failed: {str(e)}")
+        return {}
+
+    AGENT_MEMORY_COMPACTIONS.inc()
+    AGENT_MEMORY_MESSAGES_FOLDED.inc(len(older))
+    logger.info(f"Folded {len(older)} messages into the conversation summary")
+    return {
+        "summary": summary,
+        "messages": [RemoveMessage(id=message.id) for message in older if message.id],
+    }
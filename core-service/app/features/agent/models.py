@@ -0,0 +1,54 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, Text
+from sqlalchemy.sql import func
+from app.database.base import Base, Timestamp
+
+
+class AgentCheckpoint(Base):
+    """SQLAlchemy model for LangGraph checkpoints (one row per checkpoint, channel values inline)"""
+    __tablename__ = "agent_checkpoint"
+
+    thread_id = Column(String(255), primary_key=True)
+    checkpoint_ns = Column(String(255), primary_key=True, default="")
+    checkpoint_id = Column(String(64), primary_key=True)
+    parent_checkpoint_id = Column(String(64), nullable=True)
+    checkpoint_type = Column(String(32), nullable=False)
+    checkpoint = Column(LargeBinary, nullable=False)
+    metadata_type = Column(String(32), nullable=False)
+    checkpoint_metadata = Column("metadata", LargeBinary, nullable=False)
+    created_at = Column(Timestamp, server_default=func.now())
+
+    def __repr__(self):
+        return f"<AgentCheckpoint(thread_id={self.thread_id}, checkpoint_id={self.checkpoint_id})>"
+
+
+class AgentCheckpointWrite(Base):
+    """SQLAlchemy model for pending writes of a LangGraph checkpoint"""
+    __tablename__ = "agent_checkpoint_write"
+
+    thread_id = Column(String(255), primary_key=True)
+    checkpoint_ns = Column(String(255), primary_key=True, default="")
+    checkpoint_id = Column(String(64), primary_key=True)
+    task_id = Column(String(64), primary_key=True)
+    idx = Column(Integer, primary_key=True)
+    channel = Column(String(255), nullable=False)
+    value_type = Column(String(32), nullable=False)
+    value = Column(LargeBinary, nullable=False)
+    task_path = Column(String(255), nullable=False, default="")
+
+    def __repr__(self):
+        return f"<AgentCheckpointWrite(thread_id={self.thread_id}, checkpoint_id={self.checkpoint_id}, task_id={self.task_id})>"
+
+
+class LLMResponseCacheEntry(Base):
+    """SQLAlchemy model for a cached LLM node result, keyed by a hash of its inputs"""
+    __tablename__ = "llm_response_cache"
+
+    key = Column(String(64), primary_key=True)
+    node = Column(String(64), nullable=False)
+    model = Column(String(255), nullable=False)
+    response = Column(Text, nullable=False)  # JSON of the node's parsed result
+    created_at = Column(Timestamp, server_default=func.now())
+    expires_at = Column(Timestamp, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<LLMResponseCacheEntry(node={self.node}, key={self.key})>"
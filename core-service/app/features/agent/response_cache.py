@@ -0,0 +1,196 @@
+"""Persistent cache of deterministic LLM graph-node results.
+
+Learning path nodes such as goal definition and concept graph generation are
+called with small structured inputs, and popular topics recur constantly. Their
+parsed results are stored in the ``llm_response_cache`` table, keyed by a
+sha256 over the node name, prompt version, model and normalized inputs, so a
+repeated request is answered without a model call by any worker.
+
+Entries expire after ``LLM_CACHE_TTL_SECONDS``; beyond ``LLM_CACHE_MAX_ENTRIES``
+the entries closest to expiry are evicted. A run can skip the lookup by setting
+``llm_cache_bypass`` in its graph config; the fresh result still replaces the
+cached one. Cache failures (including admission rejections) are logged and
+never fail the node.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from langchain_core.runnables import RunnableConfig
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.database.admission import admission_controller
+from app.features.agent.models import LLMResponseCacheEntry
+from app.util.chat_models import chat_models
+from app.util.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_HITS = registry.counter(
+    "llm_cache_hits_total", "LLM node results served from the response cache", labelnames=("node",)
+)
+LLM_CACHE_MISSES = registry.counter(
+    "llm_cache_misses_total", "LLM node results that required a model call", labelnames=("node",)
+)
+LLM_CACHE_BYPASSES = registry.counter(
+    "llm_cache_bypass_total", "LLM node calls that skipped the response cache on request", labelnames=("node",)
+)
+
+BYPASS_CONFIG_KEY = "llm_cache_bypass"
+
+_table = LLMResponseCacheEntry.__table__
+
+
+def _normalize(value: Any) -> Any:
+    """Collapse whitespace and case of strings, recursively (list order is kept)."""
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def response_cache_key(node: str, prompt_version: str, model: str, inputs: dict) -> str:
+    """
+    Canonical cache key of one node call.
+
+    Args:
+        node: Graph node name
+        prompt_version: Version of the node's prompt
+        model: "provider:model" serving the node
+        inputs: Prompt variables
+
+    Returns:
+        Hex sha256 of the canonical JSON of all parts
+    """
+    payload = json.dumps(
+        {"node": node, "prompt_version": prompt_version, "model": model, "inputs": _normalize(inputs)},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_bypassed(config: Optional[RunnableConfig]) -> bool:
+    """Whether the graph run asked to skip cached responses."""
+    return bool(((config or {}).get("configurable") or {}).get(BYPASS_CONFIG_KEY))
+
+
+class LLMResponseCache:
+    """Database-backed store of JSON node results with TTL and size-based eviction."""
+
+    def __init__(
+        self,
+        engine: Optional[AsyncEngine] = None,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        """
+        Args:
+            engine: Async engine holding the cache table (default: the app engine)
+            ttl_seconds: Lifetime of an entry (default: settings.LLM_CACHE_TTL_SECONDS)
+            max_entries: Maximum number of entries kept, 0 = unbounded (default: settings.LLM_CACHE_MAX_ENTRIES)
+        """
+        self._engine = engine
+        self.ttl_seconds = settings.LLM_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_entries = settings.LLM_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            from app.database.connection import engine
+
+            self._engine = engine
+        return self._engine
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached result for ``key`` unless missing or expired."""
+        now = datetime.now(timezone.utc)
+        async with admission_controller.admit(reentrant=True), self.engine.connect() as conn:
+            raw = await conn.scalar(
+                select(_table.c.response).where(_table.c.key == key, _table.c.expires_at > now)
+            )
+        return None if raw is None else json.loads(raw)
+
+    async def put(self, key: str, node: str, model: str, value: Any) -> None:
+        """Store ``value`` under ``key`` and evict expired and excess entries."""
+        now = datetime.now(timezone.utc)
+        async with admission_controller.admit(reentrant=True), self.engine.begin() as conn:
+            await conn.execute(delete(_table).where(_table.c.key == key))
+            await conn.execute(insert(_table).values(
+                key=key,
+                node=node,
+                model=model,
+                response=json.dumps(value, ensure_ascii=False),
+                created_at=now,
+                expires_at=now + timedelta(seconds=self.ttl_seconds),
+            ))
+            await conn.execute(delete(_table).where(_table.c.expires_at <= now))
+            if self.max_entries > 0:
+                excess = await conn.scalar(select(func.count()).select_from(_table)) - self.max_entries
+                if excess > 0:
+                    oldest = select(_table.c.key).order_by(_table.c.expires_at).limit(excess)
+                    await conn.execute(delete(_table).where(_table.c.key.in_(oldest.scalar_subquery())))
+
+    async def cached(
+        self,
+        node: str,
+        prompt_version: str,
+        role: str,
+        inputs: dict,
+        compute: Callable[[], Awaitable[Any]],
+        config: Optional[RunnableConfig] = None,
+    ) -> Any:
+        """
+        Return the node result for ``inputs``, calling ``compute`` on a miss.
+
+        Args:
+            node: Graph node name
+            prompt_version: Version of the node's prompt
+            role: Chat model role of the node (its model is part of the key)
+            inputs: Prompt variables
+            compute: Coroutine factory producing the JSON-serializable result
+            config: Graph run config (``llm_cache_bypass`` skips the lookup)
+
+        Returns:
+            The cached or freshly computed result
+        """
+        if not settings.LLM_CACHE_ENABLED:
+            return await compute()
+
+        model = chat_models.model_id(role)
+        key = response_cache_key(node, prompt_version, model, inputs)
+
+        if is_bypassed(config):
+            LLM_CACHE_BYPASSES.inc(node=node)
+        else:
+            try:
+                value = await self.get(key)
+            except Exception as e:
+                logger.warning(f"LLM cache lookup failed for {node}: {str(e)}")
+                value = None
+            if value is not None:
+                LLM_CACHE_HITS.inc(node=node)
+                logger.info(f"LLM cache hit for {node} ({key[:12]})")
+                return value
+            LLM_CACHE_MISSES.inc(node=node)
+
+        value = await compute()
+        try:
+            await self.put(key, node, model, value)
+        except Exception as e:
+            logger.warning(f"LLM cache store failed for {node}: {str(e)}")
+        return value
+
+
+# Shared by all agent graphs of the process
+llm_response_cache = LLMResponseCache()
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from app.features.agent.schemas import ChatRequest, ChatResponse, InitChatRequest
 from app.features.agent.service import AgentService
 from typing import Optional
+import json
 import logging
-from app.features.users.users import current_active_user
-from app.database import get_db
+from app.features.users.users import current_active_user, current_active_user_read
+from app.database import get_db, get_read_db
 from app.features.users.models import User
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -35,7 +37,8 @@ async def start_chat(request: InitChatRequest,  db: AsyncSession = Depends(get_d
             message=request.message,
             thread_id=None,
             user=user,
-            mode=request.mode
+            mode=request.mode,
+            bypass_llm_cache=request.bypass_llm_cache
         )
         return response
     except ValueError as e:
@@ -64,7 +67,8 @@ async def continue_chat(thread_id: str, request: ChatRequest, db: AsyncSession =
             db=db,
             user=user,
             message=request.message,
-            thread_id=thread_id
+            thread_id=thread_id,
+            bypass_llm_cache=request.bypass_llm_cache
         )
         return response
     except ValueError as e:
@@ -80,15 +84,59 @@ async def continue_chat(thread_id: str, request: ChatRequest, db: AsyncSession =
         )
 
 
+def _sse(event: str, data: dict) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/chat/{thread_id}/stream")
+async def stream_chat(thread_id: str, request: ChatRequest, db: AsyncSession = Depends(get_db), user: User = Depends(current_active_user)):
+    """
+    Continue an existing chat conversation, streaming progress as server-sent events.
+    
+    Events (text/event-stream), each with a JSON data line:
+    - start: {"thread_id": ...}
+    - node_start / node_end: {"node": "define_goal"}
+    - token: {"node": ..., "content": "..."} for every streamed model token
+    - done: the ChatResponse of the turn, including learning_path_id when a path was saved
+    - error: {"detail": "..."} if the run failed
+    """
+    async def events():
+        try:
+            async for event, data in service.stream_graph(
+                db=db,
+                user=user,
+                message=request.message,
+                thread_id=thread_id,
+                bypass_llm_cache=request.bypass_llm_cache
+            ):
+                yield _sse(event, data)
+        except ValueError as e:
+            yield _sse("error", {"detail": str(e)})
+        except Exception as e:
+            logger.error(f"Error streaming chat {thread_id}: {str(e)}")
+            yield _sse("error", {"detail": "Failed to continue conversation"})
+
+    # Disable proxy buffering so tokens reach the client as they are produced
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/chat/{thread_id}", response_model=ChatResponse)
-async def get_chat(thread_id: str, db: AsyncSession = Depends(get_db),user: User = Depends(current_active_user)):
+async def get_chat(thread_id: str, db: AsyncSession = Depends(get_read_db),user: User = Depends(current_active_user_read)):
     """
     Retrieve the current state and history of a chat conversation.
     
     Returns all messages, current status, and learning path (if completed).
     """
+    # The session only resolved the user; return its connection before the
+    # checkpointer opens its own (read sessions are never committed)
+    await db.close()
     try:
-        response = service.get_conversation(thread_id)
+        response = await service.get_conversation(thread_id)
         return response
     except ValueError as e:
         raise HTTPException(
@@ -7,6 +7,7 @@ from app.features.agent.type import AgentMode
 class BaseChatRequest(BaseModel):
     """Base schema for chat requests."""
     message: str
+    bypass_llm_cache: bool = False  # Force fresh model calls instead of cached responses
 
 class ChatRequest(BaseChatRequest):
     """Request schema for chat interactions."""
@@ -31,4 +32,5 @@ class ChatResponse(BaseModel):
     messages: List[ChatMessage]
     topic: Optional[str] = None
     learning_path_json: Optional[Any] = None  # Raw JSON learning path when completed
-    learning_path: Optional[Any] = None  # DB model instance when completed
\ No newline at end of file
+    learning_path: Optional[Any] = None  # DB model instance when completed
+    learning_path_id: Optional[int] = None  # ID of the learning path saved by this turn
\ No newline at end of file
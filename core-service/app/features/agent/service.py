@@ -2,11 +2,13 @@ import uuid
 import json
 import re
 from enum import Enum
-from typing import Optional, List, Any
+from typing import AsyncIterator, Optional, List, Any
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
 from app.features.agent.learning_path_graph.learning_path_graph import learning_path_graph as graph
 # from app.features.agent.graph import graph
 from app.features.agent.schemas import ChatResponse, ChatMessage
+from app.features.agent.response_cache import BYPASS_CONFIG_KEY
+from app.features.agent.memory import COMPACT_MEMORY_NODE
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -30,6 +32,19 @@ class AgentService:
     def __init__(self):
         self.learning_path_service = LearningPathService()
 
+    @staticmethod
+    async def _release_connection(db: Optional[AsyncSession]) -> None:
+        """
+        End the request session's transaction so its connection returns to the pool.
+
+        The checkpointer and the LLM response cache use connections of their own;
+        holding the session's connection across them (and the model calls between
+        them) can exhaust a small pool. Loaded objects stay usable
+        (expire_on_commit=False) and the session reconnects on its next statement.
+        """
+        if db is not None and db.in_transaction():
+            await db.commit()
+
     def _determine_graph_stage(
         self, thread_id: Optional[str]
     ) -> tuple[GraphStage, str]:
@@ -53,29 +68,28 @@ class AgentService:
             # Resuming an existing conversation
             return GraphStage.RESUME_CONVERSATION, thread_id
 
-    async def invoke_graph(
+    async def _prepare_graph_input(
         self,
-        db: AsyncSession,
-        user: User,
-        message: str,
-        thread_id: Optional[str] = None,
-        mode: Optional[AgentMode] = None,
-    ) -> ChatResponse:
+        message: Optional[str],
+        thread_id: Optional[str],
+        mode: Optional[AgentMode],
+        bypass_llm_cache: bool = False,
+    ) -> tuple[str, dict, Optional[dict]]:
         """
-        Unified method to handle all graph interactions.
+        Resolve the thread and build the input for the next graph run.
+        
+        When the thread is paused at an interrupt, the message is written into
+        the paused state and the run resumes with no input.
         
         Args:
             message: User's message input
             thread_id: Optional thread ID for continuing conversation
-            topic: Required for new conversations (when thread_id is None)
+            mode: Agent mode for the run
+            bypass_llm_cache: Skip cached LLM responses for this run
             
         Returns:
-            ChatResponse with updated conversation state
-            
-        Raises:
-            ValueError: If topic is missing for new conversation or thread_id is invalid
+            Tuple of (thread_id, graph config, graph input)
         """
-        
         state = {}
         
         # Set mode in state
@@ -91,100 +105,181 @@ class AgentService:
             logger.info(f"Resuming conversation with thread_id: {resolved_thread_id}")
 
         # Configure graph with thread_id
-        config = {"configurable": {"thread_id": resolved_thread_id}}
-        graph_state = graph.get_state(config)
+        config = {"configurable": {"thread_id": resolved_thread_id, BYPASS_CONFIG_KEY: bypass_llm_cache}}
+        graph_state = await graph.aget_state(config)
         logger.info(f"Graph state for thread {resolved_thread_id}: {graph_state}")
 
-        try:
+        # Add message to state if provided
+        if message:
+            state["messages"] = [HumanMessage(content=message)]
+
+        if stage == GraphStage.RESUME_CONVERSATION and graph_state.next:
+            logger.info(f"Resuming from interrupt for thread {resolved_thread_id}")
+            # For paused conversations, update state then continue with no input
+            await graph.aupdate_state(config, state)
+            return resolved_thread_id, config, None
+        
+        return resolved_thread_id, config, state
+
+    async def _finish_turn(
+        self,
+        db: AsyncSession,
+        user: User,
+        config: dict,
+        messages: List[BaseMessage],
+    ) -> ChatResponse:
+        """
+        Save a completed learning path (if any) and build the response of a graph run.
+        
+        Args:
+            db: Database session
+            user: Current user
+            config: Graph config of the thread
+            messages: Conversation messages after the run
+            
+        Returns:
+            ChatResponse with the conversation and the saved learning path id
+        """
+        resolved_thread_id = config["configurable"]["thread_id"]
+        state = await graph.aget_state(config)
+        formatted_messages = self._format_messages(messages)
+        
+        # Parse and save learning path if completed
+        learning_path_id = None
+        concept_graph = state.values.get('concept_graph')
+        if concept_graph:
             try:
-                # Build state based on graph stage
-                # if stage == GraphStage.NEW_CONVERSATION:
-                    # For new conversations, set topic
-                    # state = {"topic": topic}
+                logger.info(f"Parsed learning path JSON for thread {resolved_thread_id}")
                 
-                # Add message to state if provided
-                if message:
-                    if "messages" in state:
-                        state["messages"].append(HumanMessage(content=message))
-                    else:
-                        state["messages"] = [HumanMessage(content=message)]
-
-                # Invoke graph based on stage
-                if stage == GraphStage.RESUME_CONVERSATION:
-                    if graph_state.next:
-                        logger.info(f"Resuming from interrupt for thread {resolved_thread_id}")
-                        # For existing conversations, update state then invoke
-                        graph.update_state(config, state)
-                        result = graph.invoke(None, config)
-                    else:
-                        # For existing conversations, invoke with no state update
-                        result = graph.invoke(state, config)
-                else:
-                    # For new conversations, invoke with full state
-                    result = graph.invoke(state, config)
+                db_learning_path = await self.learning_path_service.parse_and_save_learning_path(
+                    db=db,
+                    json_data=concept_graph,
+                    topic=state.values.get('topic'),
+                    goal=state.values.get('desired_outcome'),
+                    user=user
+                )
+                learning_path_id = db_learning_path.id
+                await self._release_connection(db)
+                
+                # Reset all state values after successful save
+                await graph.aupdate_state(config, {
+                    "concept_graph": None,
+                    "desired_outcome": None,
+                    "context": None,
+                    "topic": None,
+                    "is_intention_clear": False,
+                    "follow_up_count": 0,
+                    "learning_goal": None,
+                    "competencies": None,
+                    "success_criteria": None
+                })
+                logger.info(f"Reset all state values after saving learning path for thread {resolved_thread_id}")
             except Exception as e:
-                logger.error(f"Graph invocation error for thread {resolved_thread_id}: {str(e)}")
+                logger.error(f"Error saving learning path for thread {resolved_thread_id}: {str(e)}")
                 raise
+        
+        return ChatResponse(
+            thread_id=resolved_thread_id,
+            messages=formatted_messages,
+            learning_path_id=learning_path_id,
+        )
+
+    async def invoke_graph(
+        self,
+        db: AsyncSession,
+        user: User,
+        message: str,
+        thread_id: Optional[str] = None,
+        mode: Optional[AgentMode] = None,
+        bypass_llm_cache: bool = False,
+    ) -> ChatResponse:
+        """
+        Unified method to handle all graph interactions.
+        
+        Args:
+            message: User's message input
+            thread_id: Optional thread ID for continuing conversation
+            mode: Agent mode for a new conversation
+            bypass_llm_cache: Force fresh model calls instead of cached responses
             
-            # Get the final state
-            state = graph.get_state(config)
-            
-            # Determine conversation status
-            # status = self._determine_status(state)
-            
-            # Extract topic from state
-            # current_topic = result.get("topic") if result else None
-            
-            # Format messages
-            formatted_messages = self._format_messages(result.get("messages", []))
+        Returns:
+            ChatResponse with updated conversation state
             
-            # Parse and save learning path if completed
-            concept_graph = state.values.get('concept_graph')
-            if concept_graph:
-                try:
-                    # learning_path_json = self._parse_learning_path(result.get("messages", []))
-                    logger.info(f"Parsed learning path JSON for thread {resolved_thread_id}")
-                    
-                    db_learning_path = await self.learning_path_service.parse_and_save_learning_path(
-                        db=db,
-                        json_data=concept_graph,
-                        topic=state.values.get('topic'),
-                        goal=state.values.get('desired_outcome'),
-                        user=user
-                    )
-                    # Convert SQLAlchemy model to Pydantic schema
-                    # learning_path_response = LearningPathResponse.model_validate(db_learning_path)
-                    
-                    # Reset all state values after successful save
-                    graph.update_state(config, {
-                        "concept_graph": None,
-                        "desired_outcome": None,
-                        "context": None,
-                        "topic": None,
-                        "is_intention_clear": False,
-                        "follow_up_count": 0,
-                        "learning_goal": None,
-                        "competencies": None,
-                        "success_criteria": None
-                    })
-                    logger.info(f"Reset all state values after saving learning path for thread {resolved_thread_id}")
-                except Exception as e:
-                    logger.error(f"Error saving learning path for thread {resolved_thread_id}: {str(e)}")
-                    raise
+        Raises:
+            ValueError: If thread_id is invalid
+        """
+        await self._release_connection(db)
+        resolved_thread_id, config, graph_input = await self._prepare_graph_input(
+            message, thread_id, mode, bypass_llm_cache
+        )
+
+        try:
+            try:
+                result = await graph.ainvoke(graph_input, config)
+            except Exception as e:
+                logger.error(f"Graph invocation error for thread {resolved_thread_id}: {str(e)}")
+                raise
             
-            return ChatResponse(
-                thread_id=resolved_thread_id,
-                # status=status,
-                messages=formatted_messages,
-                # topic=current_topic,
-                # learning_path=learning_path_response
-            )
+            return await self._finish_turn(db, user, config, result.get("messages", []))
 
         except Exception as e:
             logger.error(f"Error invoking graph for thread {resolved_thread_id}: {str(e)}")
             raise
 
-    def get_conversation(self, thread_id: str) -> ChatResponse:
+    async def stream_graph(
+        self,
+        db: AsyncSession,
+        user: User,
+        message: str,
+        thread_id: Optional[str] = None,
+        mode: Optional[AgentMode] = None,
+        bypass_llm_cache: bool = False,
+    ) -> AsyncIterator[tuple[str, dict]]:
+        """
+        Run the graph like invoke_graph, yielding progress events as they happen.
+        
+        Yields (event, data) pairs:
+        - ("start", {"thread_id": ...}) before the run
+        - ("node_start", {"node": ...}) / ("node_end", {"node": ...}) per graph node
+        - ("token", {"node": ..., "content": ...}) per streamed model token
+        - ("done", ChatResponse fields) after the run, including learning_path_id
+        """
+        await self._release_connection(db)
+        resolved_thread_id, config, graph_input = await self._prepare_graph_input(
+            message, thread_id, mode, bypass_llm_cache
+        )
+        yield "start", {"thread_id": resolved_thread_id}
+
+        async for event in graph.astream_events(graph_input, config, version="v2"):
+            kind = event["event"]
+            node = event.get("metadata", {}).get("langgraph_node")
+            if node == COMPACT_MEMORY_NODE:
+                # Memory housekeeping is not part of the conversation
+                continue
+            if kind == "on_chat_model_stream":
+                content = self._chunk_text(event["data"]["chunk"])
+                if content:
+                    yield "token", {"node": node, "content": content}
+            elif kind in ("on_chain_start", "on_chain_end") and event["name"] == node and not node.startswith("__"):
+                yield ("node_start" if kind == "on_chain_start" else "node_end"), {"node": node}
+
+        state = await graph.aget_state(config)
+        response = await self._finish_turn(db, user, config, state.values.get("messages", []))
+        yield "done", response.model_dump()
+
+    @staticmethod
+    def _chunk_text(chunk: BaseMessage) -> str:
+        """Text of a streamed message chunk (structured-output chunks carry none)."""
+        content = chunk.content
+        if isinstance(content, str):
+            return content
+        return "".join(
+            part if isinstance(part, str) else part.get("text", "")
+            for part in content
+            if isinstance(part, str) or part.get("type") == "text"
+        )
+
+    async def get_conversation(self, thread_id: str) -> ChatResponse:
         """
         Retrieve conversation state without invoking the graph.
         
@@ -200,7 +295,7 @@ class AgentService:
         config = {"configurable": {"thread_id": thread_id}}
         
         try:
-            state = graph.get_state(config)
+            state = await graph.aget_state(config)
             
             if not state or not state.values:
                 raise ValueError(f"Thread {thread_id} not found")
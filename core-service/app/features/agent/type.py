@@ -14,3 +14,4 @@ class AgentMode(Enum):
 class AgentState(MessagesState):
     messages: Annotated[Sequence[BaseMessage], add_messages]
     mode: Optional["AgentMode"] = None
+    summary: Optional[str] = None  # Running summary of turns folded out of messages
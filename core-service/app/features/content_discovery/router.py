@@ -5,8 +5,8 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.features.users.users import current_active_user
+from app.database import get_db, get_read_db
+from app.features.users.users import current_active_user, current_active_user_read
 from app.features.users.models import User
 from app.features.preference.preference_service import PreferenceService
 from app.features.content_personalization.router import get_personalization_service
@@ -196,8 +196,8 @@ async def index_content(
 
 @router.get("/stats")
 async def get_stats(
-    user: User = Depends(current_active_user),
-    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_active_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Dict:
     """Get content discovery statistics."""
     service = get_discovery_service()
@@ -256,8 +256,8 @@ async def set_custom_keywords(
 @router.get("/content/{content_id}", response_model=LearningContentSchema)
 async def get_content(
     content_id: str,
-    user: User = Depends(current_active_user),
-    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_active_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ) -> LearningContentSchema:
     """Get a specific content item by ID."""
     service = get_discovery_service()
@@ -273,8 +273,8 @@ async def get_content(
 async def list_contents(
     skip: int = 0,
     limit: int = 100,
-    user: User = Depends(current_active_user),
-    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_active_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[LearningContentSchema]:
     """List all indexed content items."""
     service = get_discovery_service()
@@ -6,8 +6,8 @@ from typing import Dict
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.features.users.users import current_active_user
+from app.database import get_db, get_read_db
+from app.features.users.users import current_active_user, current_active_user_read
 from app.features.users.models import User
 
 from .service import ContentPersonalizationService
@@ -175,8 +175,8 @@ async def adapt_difficulty(
 
 @router.get("/stats")
 async def get_stats(
-    user: User = Depends(current_active_user),
-    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_active_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Dict:
     """Get content personalization statistics."""
     service = get_personalization_service()
@@ -12,11 +12,11 @@ import logging
 import re
 from typing import Dict, List, Optional
 
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from app.features.content_discovery.models import LearningContent
+from app.util.chat_models import chat_models
 from .models import PersonalizedContent, VideoHighlight, ContentSummary
 
 logger = logging.getLogger(__name__)
@@ -25,14 +25,14 @@ logger = logging.getLogger(__name__)
 class ContentPersonalizationService:
     """Service for personalizing learning content based on user preferences and level."""
     
-    def __init__(self, model_name: str = "gemini-2.0-flash-exp"):
+    def __init__(self, model_name: Optional[str] = None):
         """Initialize the personalization service.
         
         Args:
-            model_name: Name of the Gemini model to use
+            model_name: Name of the model to use (default: the "personalization" model in settings.LLM_MODELS)
         """
-        self.model = ChatGoogleGenerativeAI(model=model_name)
-        logger.info(f"Initialized ContentPersonalizationService with {model_name}")
+        self.model = chat_models.get_named(model_name) if model_name else chat_models.get("personalization")
+        logger.info(f"Initialized ContentPersonalizationService with {getattr(self.model, 'model', self.model._llm_type)}")
     
     def personalize_content(
         self,
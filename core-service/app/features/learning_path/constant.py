@@ -1 +1,4 @@
-LEARNING_PATH_GRAPH_LOCAL_IDENTIFIER_PREFIX = "learning_path_"
\ No newline at end of file
+LEARNING_PATH_GRAPH_LOCAL_IDENTIFIER_PREFIX = "learning_path_"
+
+# Number of items inserted, converted to RDF and committed together by the bulk import
+BULK_IMPORT_BATCH_SIZE = 500
@@ -1,9 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional, List
+from sqlalchemy import select, insert, update, delete, func, or_, and_
+from typing import Optional, List, Tuple, Dict, Any
 from app.features.learning_path.models import LearningPath
 from app.features.learning_path.schemas import LearningPathCreate, LearningPathUpdate
 from app.features.users.models import User
+from app.util.pagination import encode_cursor, decode_cursor
 
 
 async def create_learning_path(db: AsyncSession, learning_path: LearningPathCreate) -> LearningPath:
@@ -15,6 +16,39 @@ async def create_learning_path(db: AsyncSession, learning_path: LearningPathCrea
     return db_learning_path
 
 
+async def bulk_create_learning_paths(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Insert many learning paths with a multi-row INSERT ... RETURNING.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: Database session
+        rows: Column values for each new learning path
+
+    Returns:
+        IDs of the new rows, in the order of ``rows``
+    """
+    result = await db.execute(
+        insert(LearningPath).returning(LearningPath.id, sort_by_parameter_order=True),
+        rows,
+    )
+    return list(result.scalars().all())
+
+
+async def set_learning_path_graph_uris(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """
+    Set graph_uri on many learning paths with one executemany UPDATE by primary key.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: Database session
+        rows: Dicts with ``id`` and ``graph_uri``
+    """
+    await db.execute(update(LearningPath), rows)
+
+
 async def get_learning_path_by_id(db: AsyncSession, learning_path_id: int) -> Optional[LearningPath]:
     """Get learning path by ID."""
     result = await db.execute(
@@ -35,28 +69,159 @@ async def get_all_learning_paths(db: AsyncSession, user: User, skip: int = 0, li
     return list(result.scalars().all())
 
 
-async def update_learning_path(
-    db: AsyncSession, 
-    learning_path_id: int, 
+async def get_learning_paths_page(
+    db: AsyncSession,
+    user: User,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[LearningPath], Optional[str]]:
+    """
+    Get a page of the user's learning paths using keyset pagination.
+
+    Rows are ordered newest first by (created_at, id); the cursor holds the sort
+    key of the last row of the previous page, so each page is an index range scan
+    instead of skipping OFFSET rows.
+
+    Args:
+        db: Database session
+        user: Owner of the learning paths
+        limit: Page size
+        cursor: Cursor returned with the previous page, or None for the first page
+
+    Returns:
+        Tuple of (learning paths, cursor for the next page or None on the last page)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = (
+        select(LearningPath)
+        .filter(LearningPath.user_id == user.id)
+        .order_by(LearningPath.created_at.desc(), LearningPath.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                LearningPath.created_at < created_at,
+                and_(LearningPath.created_at == created_at, LearningPath.id < last_id),
+            )
+        )
+
+    result = await db.execute(query)
+    items = list(result.scalars().all())
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return items, next_cursor
+
+
+async def get_user_learning_path(db: AsyncSession, learning_path_id: int, user_id: int) -> Optional[LearningPath]:
+    """Get a learning path by ID only if it is owned by the user."""
+    result = await db.execute(
+        select(LearningPath).where(
+            LearningPath.id == learning_path_id,
+            LearningPath.user_id == user_id,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_user_learning_paths_by_ids(
+    db: AsyncSession,
+    learning_path_ids: List[int],
+    user_id: int
+) -> List[LearningPath]:
+    """Get the learning paths among ``learning_path_ids`` owned by the user, with one IN query."""
+    if not learning_path_ids:
+        return []
+    result = await db.execute(
+        select(LearningPath).where(
+            LearningPath.id.in_(learning_path_ids),
+            LearningPath.user_id == user_id,
+        )
+    )
+    return list(result.scalars().all())
+
+
+async def update_user_learning_path(
+    db: AsyncSession,
+    learning_path_id: int,
+    user_id: int,
     update_data: LearningPathUpdate
 ) -> Optional[LearningPath]:
-    """Update learning path by ID."""
-    db_learning_path = await get_learning_path_by_id(db, learning_path_id)
-    if db_learning_path:
-        update_dict = update_data.model_dump(exclude_unset=True)
-        for key, value in update_dict.items():
-            setattr(db_learning_path, key, value)
-        await db.commit()
-        await db.refresh(db_learning_path)
+    """
+    Update a learning path owned by the user in a single statement.
+
+    Issues ``UPDATE ... WHERE id = :id AND user_id = :uid RETURNING *`` so the
+    ownership check, the write and the read-back share one round trip. Dialects
+    without UPDATE ... RETURNING fall back to a follow-up SELECT.
+
+    Returns:
+        The updated learning path, or None if no row with that ID is owned by the user
+    """
+    columns = LearningPath.__table__.columns.keys()
+    values = {
+        key: value
+        for key, value in update_data.model_dump(exclude_unset=True).items()
+        if key in columns
+    }
+    # KG-only updates still mark the row as modified
+    values.setdefault("updated_at", func.now())
+
+    stmt = (
+        update(LearningPath)
+        .where(LearningPath.id == learning_path_id, LearningPath.user_id == user_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if db.get_bind().dialect.update_returning:
+        result = await db.execute(
+            stmt.returning(LearningPath).execution_options(populate_existing=True)
+        )
+        db_learning_path = result.scalar_one_or_none()
+    else:
+        result = await db.execute(stmt)
+        db_learning_path = None
+        if result.rowcount:
+            db_learning_path = (await db.execute(
+                select(LearningPath)
+                .where(LearningPath.id == learning_path_id)
+                .execution_options(populate_existing=True)
+            )).scalar_one()
+
+    await db.commit()
     return db_learning_path
 
 
-async def delete_learning_path(db: AsyncSession, learning_path_id: int) -> bool:
-    """Delete a learning path by ID."""
-    db_learning_path = await get_learning_path_by_id(db, learning_path_id)
-    if db_learning_path:
-        await db.delete(db_learning_path)
-        await db.commit()
-        return True
-    return False
+async def delete_user_learning_path(db: AsyncSession, learning_path_id: int, user_id: int) -> bool:
+    """
+    Delete a learning path owned by the user in a single statement.
+
+    Returns:
+        True if a row was deleted, False if no row with that ID is owned by the user
+    """
+    stmt = (
+        delete(LearningPath)
+        .where(LearningPath.id == learning_path_id, LearningPath.user_id == user_id)
+        .execution_options(synchronize_session=False)
+    )
+    if db.get_bind().dialect.delete_returning:
+        result = await db.execute(stmt.returning(LearningPath.id))
+        deleted = result.scalar_one_or_none() is not None
+    else:
+        result = await db.execute(stmt)
+        deleted = result.rowcount > 0
 
+    await db.commit()
+    return deleted
+
+
+async def learning_path_exists(db: AsyncSession, learning_path_id: int) -> bool:
+    """Check whether a learning path with the given ID exists."""
+    result = await db.execute(
+        select(LearningPath.id).where(LearningPath.id == learning_path_id)
+    )
+    return result.scalar_one_or_none() is not None
@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from app.database.base import BaseModel
 from sqlalchemy.orm import relationship
 
 class LearningPath(BaseModel):
     """SQLAlchemy model for learning paths"""
     __tablename__ = "learning_path"
+    __table_args__ = (
+        # Serves the per-user listing ordered by (created_at, id)
+        Index("ix_learning_path_user_id_created_at", "user_id", "created_at", "id"),
+    )
+    # Load server-generated timestamps with the INSERT/UPDATE (RETURNING) instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     topic = Column(String(255), nullable=False)
     graph_uri = Column(String(255), nullable=True, unique=False)
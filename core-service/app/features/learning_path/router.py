@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.features.learning_path.schemas import (
     LearningPathCreate,
     LearningPathUpdate,
     LearningPathResponse,
+    LearningPathPage,
+    LearningPathBulkRequest,
+    LearningPathBatchGetRequest,
+    LearningPathBatchGetResponse,
 )
 from app.features.learning_path.service import LearningPathService
-from typing import List
+from typing import List, Literal, Optional, Union
 from app.features.users.models import User
-from app.features.users.users import current_active_user
+from app.features.users.users import current_active_user, current_active_user_read
 
 router = APIRouter()
 service = LearningPathService()
@@ -29,12 +35,49 @@ async def create_learning_path(
     return await service.create_learning_path(db, learning_path, current_user)
 
 
+@router.post("/bulk")
+async def bulk_create_learning_paths(
+    request: LearningPathBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(current_active_user)
+):
+    """Create many learning paths with their knowledge graphs.
+
+    Items are processed in batches; each batch is committed on its own. The
+    response streams one JSON object per line (application/x-ndjson) for each
+    item, in input order:
+    - {"index": 0, "status": "created", "id": 12, "graph_uri": "..."}
+    - {"index": 1, "status": "error", "detail": "..."}
+    """
+    async def stream_results():
+        async for result in service.bulk_create_learning_paths(db, request.items, current_user):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@router.post("/batch-get", response_model=LearningPathBatchGetResponse)
+async def batch_get_learning_paths(
+    request: LearningPathBatchGetRequest,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(current_active_user_read)
+):
+    """Get several learning paths by ID in one request.
+
+    Loads the user's knowledge graph once for all paths when include_kg is true.
+    IDs that do not exist or belong to another user are listed in "missing".
+    """
+    items, missing = await service.batch_get_learning_paths(
+        db, request.ids, current_user, request.include_kg)
+    return LearningPathBatchGetResponse(items=items, missing=missing)
+
+
 @router.get("/{learning_path_id}", response_model=LearningPathResponse)
 async def get_learning_path(
     learning_path_id: int,
     include_kg: bool = False,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(current_active_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(current_active_user_read)
 ):
     """Get a learning path by ID with optional knowledge graph data.
     
@@ -47,14 +90,30 @@ async def get_learning_path(
     return learning_path
 
 
-@router.get("/", response_model=List[LearningPathResponse])
+@router.get("/", response_model=Union[List[LearningPathResponse], LearningPathPage])
 async def get_all_learning_paths(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(current_active_user)
+    cursor: Optional[str] = None,
+    pagination: Literal["offset", "cursor"] = "offset",
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(current_active_user_read)
 ):
-    """Get all learning paths with pagination."""
+    """Get all learning paths with pagination.
+
+    Query Parameters:
+        pagination: "offset" (default) returns a plain list paged by skip/limit;
+            "cursor" returns {items, next_cursor} paged by keyset
+        cursor: next_cursor from the previous page (implies cursor pagination)
+
+    In cursor mode the next cursor is also sent in the X-Next-Cursor header.
+    """
+    if pagination == "cursor" or cursor:
+        items, next_cursor = await service.get_learning_paths_page(db, current_user, limit, cursor)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return LearningPathPage(items=items, next_cursor=next_cursor)
     return await service.get_all_learning_paths(db, current_user, skip, limit)
 
 
@@ -1,8 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Any, List
 from typing import Literal
 from datetime import datetime
 
+from app.config import settings
+
 # --- Start Graph Run ---
 class StartRequest(BaseModel):
     learning_topic: str
@@ -47,6 +49,47 @@ class LearningPathResponse(LearningPathBase):
         from_attributes = True
 
 
+class LearningPathPage(BaseModel):
+    """A page of learning paths from keyset pagination."""
+    items: List[LearningPathResponse]
+    next_cursor: Optional[str] = None
+
+
+class LearningPathBatchGetRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=settings.LEARNING_PATH_BATCH_GET_MAX_IDS)
+    include_kg: bool = True
+
+    @field_validator("ids")
+    @classmethod
+    def drop_duplicate_ids(cls, ids: List[int]) -> List[int]:
+        """Keep the first occurrence of each id, in request order."""
+        return list(dict.fromkeys(ids))
+
+
+class LearningPathBatchGetResponse(BaseModel):
+    """Learning paths found for a batch get, in request order."""
+    items: List[LearningPathResponse]
+    missing: List[int] = []  # IDs that do not exist or are not owned by the user
+
+
+class LearningPathConceptItem(BaseModel):
+    """A concept and the names of its prerequisites."""
+    concept: str
+    prerequisites: List[str] = []
+
+
+class LearningPathBulkItem(BaseModel):
+    """One learning path in a bulk import."""
+    topic: str
+    goal: str
+    concepts: List[LearningPathConceptItem]
+    user_id: Optional[int] = None  # Defaults to the current user; other users require a superuser
+
+
+class LearningPathBulkRequest(BaseModel):
+    items: List[LearningPathBulkItem] = Field(..., min_length=1, max_length=settings.LEARNING_PATH_BULK_MAX_ITEMS)
+
+
 # Knowledge Graph schemas
 class ConceptInfo(BaseModel):
     """Information about a concept in the knowledge graph."""
@@ -1,12 +1,15 @@
 import re
+from contextlib import ExitStack
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import uuid4
 from langchain_core.messages import HumanMessage, AIMessage
 from rdflib import RDF, Graph as RDFGraph, Namespace, URIRef
-from typing import List, Dict, Any, Tuple, Optional
+from typing import AsyncIterator, List, Dict, Any, Tuple, Optional
 from app.features.learning_path import crud
+from app.features.learning_path.constant import BULK_IMPORT_BATCH_SIZE
 from app.features.learning_path.schemas import (
+    LearningPathBulkItem,
     LearningPathCreate,
     LearningPathResponse,
     LearningPathUpdate,
@@ -19,6 +22,7 @@ import json
 from app.kg.storage import KGStorage
 from app.util.string_util import normalize_string
 from app.kg.base import KGBase
+from app.kg.metrics import kg_operation
 from app.features.users.models import User
 from app.util.kg_util import extract_subgraph, get_learning_path_kg_local_name
 
@@ -89,6 +93,50 @@ class LearningPathService:
 
         return learning_path
 
+    async def batch_get_learning_paths(
+        self,
+        db: AsyncSession,
+        learning_path_ids: List[int],
+        current_user: User,
+        include_kg: bool = True
+    ) -> Tuple[List[LearningPath], List[int]]:
+        """
+        Get several learning paths, optionally with KG data, in one request.
+
+        Ownership is part of a single IN query, and the user graph is loaded
+        once for every requested path.
+
+        Returns:
+            Tuple of (learning paths in request order, IDs not found for the user)
+        """
+        requested = list(dict.fromkeys(learning_path_ids))
+        found = {
+            lp.id: lp
+            for lp in await crud.get_user_learning_paths_by_ids(db, requested, current_user.id)
+        }
+        learning_paths = [found[lp_id] for lp_id in requested if lp_id in found]
+        missing = [lp_id for lp_id in requested if lp_id not in found]
+
+        with_graph = [lp for lp in learning_paths if lp.graph_uri]
+        if include_kg and with_graph:
+            try:
+                user_graph = self.storage.load_user_graph(str(current_user.id))
+                extracted = self.extract_learning_path_graphs(
+                    user_graph,
+                    [URIRef(lp.graph_uri) for lp in with_graph],
+                    user=current_user,
+                    include_users=True,
+                )
+                for lp in with_graph:
+                    lp.kg_data = extracted[URIRef(lp.graph_uri)]
+            except Exception as e:
+                logger.error(f"Error retrieving KG data: {str(e)}")
+                # Don't fail the request if KG data retrieval fails
+                for lp in with_graph:
+                    lp.kg_data = None
+
+        return learning_paths, missing
+
     async def get_all_learning_paths(
         self,
         db: AsyncSession,
@@ -99,6 +147,19 @@ class LearningPathService:
         """Get all learning paths with pagination."""
         return await crud.get_all_learning_paths(db, current_user, skip, limit)
 
+    async def get_learning_paths_page(
+        self,
+        db: AsyncSession,
+        current_user: User,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[LearningPath], Optional[str]]:
+        """Get a page of learning paths with keyset pagination."""
+        try:
+            return await crud.get_learning_paths_page(db, current_user, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     async def update_learning_path(
         self,
         db: AsyncSession,
@@ -106,22 +167,25 @@ class LearningPathService:
         update_data: LearningPathUpdate,
         current_user: User
     ) -> Optional[LearningPath]:
-        """Update a learning path with authorization check."""
-        learning_path = await crud.get_learning_path_by_id(db, learning_path_id)
-
-        if not learning_path:
-            return None
-
-        if learning_path.user_id != current_user.id:
-            raise HTTPException(
-                status_code=403, detail="Not authorized to update this learning path")
+        """Update a learning path with authorization check.
 
+        The ownership check is part of the UPDATE statement; the row is only
+        read beforehand when KG data has to be rewritten.
+        """
         # Handle KG data update if provided
         if update_data.kg_data is not None:
+            learning_path = await crud.get_user_learning_path(db, learning_path_id, current_user.id)
+            if not learning_path:
+                await self._check_not_owned(db, learning_path_id, "update")
+                return None
             self.update_learning_path_kg(
                 learning_path, update_data.kg_data, current_user, update_data.goal)
 
-        return await crud.update_learning_path(db, learning_path_id, update_data)
+        learning_path = await crud.update_user_learning_path(
+            db, learning_path_id, current_user.id, update_data)
+        if not learning_path:
+            await self._check_not_owned(db, learning_path_id, "update")
+        return learning_path
 
     async def delete_learning_path(
         self,
@@ -130,16 +194,19 @@ class LearningPathService:
         current_user: User
     ) -> bool:
         """Delete a learning path with authorization check."""
-        learning_path = await crud.get_learning_path_by_id(db, learning_path_id)
+        if await crud.delete_user_learning_path(db, learning_path_id, current_user.id):
+            return True
+        await self._check_not_owned(db, learning_path_id, "delete")
+        return False
 
-        if not learning_path:
-            return False
+    async def _check_not_owned(self, db: AsyncSession, learning_path_id: int, action: str) -> None:
+        """Raise 403 if an owner-scoped statement missed because the row belongs to another user.
 
-        if learning_path.user_id != current_user.id:
+        Only runs after a miss, so successful mutations stay a single statement.
+        """
+        if await crud.learning_path_exists(db, learning_path_id):
             raise HTTPException(
-                status_code=403, detail="Not authorized to delete this learning path")
-
-        return await crud.delete_learning_path(db, learning_path_id)
+                status_code=403, detail=f"Not authorized to {action} this learning path")
 
     # ===== Knowledge Graph Operations =====
 
@@ -180,44 +247,100 @@ class LearningPathService:
             Graph: New RDF graph containing the learning path and related concepts, 
                 and optionally users and goals.
         """
-        result_graph = RDFGraph()
-        visited = set()
-
-        def add_related_concepts(concept_uri):
-            """Recursively add a concept and its prerequisites."""
-            if concept_uri in visited:
-                return
-            visited.add(concept_uri)
-
-            for s, p, o in user_graph.triples((concept_uri, None, None)):
-                result_graph.add((s, p, o))
-                if p == self.kg_base.ONT.hasPrerequisite:
-                    add_related_concepts(o)
-
-        # Add learning path triple itself
-        for s, p, o in user_graph.triples((learning_path_uri, None, None)):
-            result_graph.add((s, p, o))
-
-            # Add included concepts recursively
-            if p == self.kg_base.ONT.includesConcept:
-                add_related_concepts(o)
-
-            # Optionally add goal
-            if include_goals and p == self.kg_base.ONT.hasGoal:
-                for goal_s, goal_p, goal_o in user_graph.triples((o, None, None)):
-                    result_graph.add((goal_s, goal_p, goal_o))
-
-        # Optionally include users who follow this path
-        if include_users:
-            user_uri = self.kg_base.ONT[normalize_string(f"user_{user.id}")]
-            for user_s, user_p, user_o in user_graph.triples((user_uri, self.kg_base.RDF.type, None)):
-                result_graph.add((user_s, user_p, user_o))
-            for user_s, user_p, user_o in user_graph.triples((None, self.kg_base.ONT.followsPath, learning_path_uri)):
-                result_graph.add((user_s, user_p, user_o))
-            for user_s, user_p, user_o in user_graph.triples((user_uri, self.kg_base.ONT.knows, None)):
-                result_graph.add((user_s, user_p, user_o))
-
-        return json.loads(result_graph.serialize(format='json-ld', indent=4))
+        return self.extract_learning_path_graphs(
+            user_graph, [learning_path_uri], user, include_users, include_goals)[learning_path_uri]
+
+    def extract_learning_path_graphs(
+        self,
+        user_graph: RDFGraph,
+        learning_path_uris: List[URIRef],
+        user: User = None,
+        include_users: bool = False,
+        include_goals: bool = True
+    ) -> Dict[URIRef, Any]:
+        """
+        Extract several learning path subgraphs from one loaded user graph.
+
+        Concept closures and user triples are looked up once and shared by all
+        requested paths.
+
+        Args:
+            user_graph: Original RDF graph
+            learning_path_uris: URIs of the learning paths to extract
+            user: Owner of the graph (required when include_users is True)
+            include_users: Whether to include users following each path
+            include_goals: Whether to include each learning path's goal
+
+        Returns:
+            Dict mapping each learning path URI to its parsed JSON-LD
+        """
+        user_id = str(user.id) if user is not None else None
+        with kg_operation("extract_learning_path_graph", user_id) as op:
+            concept_triples: Dict[URIRef, tuple] = {}
+
+            def own_concept_triples(concept_uri) -> tuple:
+                """Triples of one concept and its direct prerequisites (looked up once)."""
+                if concept_uri not in concept_triples:
+                    triples = list(user_graph.triples((concept_uri, None, None)))
+                    prerequisites = [o for _, p, o in triples if p == self.kg_base.ONT.hasPrerequisite]
+                    concept_triples[concept_uri] = (triples, prerequisites)
+                return concept_triples[concept_uri]
+
+            def add_related_concepts(result_graph: RDFGraph, concept_uri, visited: set) -> None:
+                """Add a concept and, transitively, its prerequisites (each visited once per path)."""
+                stack = [concept_uri]
+                while stack:
+                    uri = stack.pop()
+                    if uri in visited:
+                        continue
+                    visited.add(uri)
+                    triples, prerequisites = own_concept_triples(uri)
+                    for triple in triples:
+                        result_graph.add(triple)
+                    stack.extend(prerequisites)
+
+            user_triples = []
+            if include_users:
+                user_uri = self.kg_base.ONT[normalize_string(f"user_{user.id}")]
+                user_triples.extend(user_graph.triples((user_uri, self.kg_base.RDF.type, None)))
+                user_triples.extend(user_graph.triples((user_uri, self.kg_base.ONT.knows, None)))
+
+            result_graphs = {}
+            for learning_path_uri in learning_path_uris:
+                result_graph = RDFGraph()
+                visited_concepts: set = set()
+
+                # Add learning path triple itself
+                for s, p, o in user_graph.triples((learning_path_uri, None, None)):
+                    result_graph.add((s, p, o))
+
+                    # Add included concepts recursively
+                    if p == self.kg_base.ONT.includesConcept:
+                        add_related_concepts(result_graph, o, visited_concepts)
+
+                    # Optionally add goal
+                    if include_goals and p == self.kg_base.ONT.hasGoal:
+                        for goal_s, goal_p, goal_o in user_graph.triples((o, None, None)):
+                            result_graph.add((goal_s, goal_p, goal_o))
+
+                # Optionally include users who follow this path
+                if include_users:
+                    for triple in user_triples:
+                        result_graph.add(triple)
+                    for user_s, user_p, user_o in user_graph.triples((None, self.kg_base.ONT.followsPath, learning_path_uri)):
+                        result_graph.add((user_s, user_p, user_o))
+                result_graphs[learning_path_uri] = result_graph
+            op["triples"] = sum(len(g) for g in result_graphs.values())
+
+        extracted = {}
+        with kg_operation("jsonld_serialize", user_id) as op:
+            op["bytes"] = 0
+            for learning_path_uri, result_graph in result_graphs.items():
+                jsonld_str = result_graph.serialize(format='json-ld', indent=4)
+                op["bytes"] += len(jsonld_str)
+                extracted[learning_path_uri] = json.loads(jsonld_str)
+            op["triples"] = sum(len(g) for g in result_graphs.values())
+        return extracted
 
     # ===== Helper Methods =====
 
@@ -238,10 +361,27 @@ class LearningPathService:
                 {"concept": "ConceptName3", "prerequisites": ["ConceptName1", "ConceptName2"]}
             ]
         """
-        # Create a new graph
         graph = self.kg_base.create_graph()
+        learning_path_uri = self.add_learning_path_triples(
+            graph, json_data, topic, goal, db_learning_path.id)
+        return graph, learning_path_uri
+
+    def add_learning_path_triples(self, graph: RDFGraph, json_data: List[Dict[str, Any]], topic: str, goal: str, learning_path_id: int) -> URIRef:
+        """
+        Add the triples of one learning path (path, goal, concepts, prerequisites) to a graph.
+
+        Args:
+            graph: Graph to add the triples to
+            json_data: List of dicts with 'concept' and 'prerequisites' keys
+            topic: Topic of the learning path
+            goal: Goal of the learning path
+            learning_path_id: Database ID of the learning path
+
+        Returns:
+            URI of the learning path
+        """
         learning_path_uri = self.kg_base.ONT[get_learning_path_kg_local_name(
-            db_learning_path.id)]
+            learning_path_id)]
 
         graph.add((learning_path_uri, self.kg_base.RDF.type,
                   self.kg_base.ONT.LearningPath))
@@ -249,7 +389,7 @@ class LearningPathService:
 
         # Create and link Goal
         goal_uri = self.kg_base.ONT[normalize_string(
-            f"goal_{db_learning_path.id}")]
+            f"goal_{learning_path_id}")]
         graph.add((goal_uri, self.kg_base.RDF.type, self.kg_base.ONT.Goal))
         graph.add((goal_uri, self.kg_base.ONT.label, Literal(goal)))
         graph.add((learning_path_uri, self.kg_base.ONT.hasGoal, goal_uri))
@@ -281,43 +421,153 @@ class LearningPathService:
                 graph.add(
                     (concept_uri, self.kg_base.ONT.hasPrerequisite, prereq_uri))
 
-        return graph, learning_path_uri
+        return learning_path_uri
 
     async def parse_and_save_learning_path(self, db: AsyncSession, json_data: List[Dict[str, Any]], topic: str, goal: str, user: User) -> LearningPath:
+        """
+        Create a learning path row and its knowledge graph as one unit of work.
 
-        learning_path_create_obj = LearningPathCreate(
-            user_id=user.id,
-            topic=topic
-        )
+        The row is flushed to obtain its ID, the graph URI is set and the user's
+        KG is written before the single commit. If anything fails, the database
+        transaction is rolled back and the KG file is restored.
 
-        # Create DB record
-        db_learning_path = await crud.create_learning_path(
-            db,
-            learning_path_create_obj
-        )
+        Args:
+            db: Database session
+            json_data: List of dicts with 'concept' and 'prerequisites' keys
+            topic: Topic of the learning path
+            goal: Goal of the learning path
+            user: Owner of the learning path
 
-        parsed_graph, learning_path_uri = self.convert_learning_path_json_to_rdf_graph(
-            json_data, topic, goal, db_learning_path=db_learning_path)
+        Returns:
+            The committed LearningPath
+        """
+        user_id = str(user.id)
+        db_learning_path = LearningPath(user_id=user.id, topic=topic)
+
+        try:
+            with self.storage.user_graph_transaction(user_id):
+                db.add(db_learning_path)
+                await db.flush()
+
+                parsed_graph, learning_path_uri = self.convert_learning_path_json_to_rdf_graph(
+                    json_data, topic, goal, db_learning_path=db_learning_path)
+                db_learning_path.graph_uri = str(learning_path_uri)
+
+                # Create user triplets if not already existing
+                user_uri = self.kg_base.ONT[normalize_string(f"user_{user.id}")]
+                # Check if user exists by querying for any triple with user_uri as subject and type User
+                if (user_uri, self.kg_base.RDF.type, self.kg_base.ONT.User) not in parsed_graph:
+                    parsed_graph.add(
+                        (user_uri, self.kg_base.RDF.type, self.kg_base.ONT.User))
+                    parsed_graph.add(
+                        (user_uri, self.kg_base.ONT.followsPath, learning_path_uri))
+
+                self.storage.save_user_graph(user_id, parsed_graph)
+                await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        return db_learning_path
+
+    async def bulk_create_learning_paths(
+        self,
+        db: AsyncSession,
+        items: List[LearningPathBulkItem],
+        current_user: User
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Create many learning paths with their knowledge graphs, batch by batch.
 
-        # update learning path with graph URI
-        updated_db_learning_path = await crud.update_learning_path(
-            db,
-            db_learning_path.id,
-            LearningPathUpdate(graph_uri=str(learning_path_uri))
-        )
+        Each batch is one multi-row INSERT, one RDF build pass, one KG write per
+        user and one commit. A failed batch is rolled back as a whole (database
+        and KG files) and its items are reported as errors; other batches are
+        unaffected.
 
-        # Create user triplets if not already existing
-        user_uri = self.kg_base.ONT[normalize_string(f"user_{user.id}")]
-        # Check if user exists by querying for any triple with user_uri as subject and type User
-        if (user_uri, self.kg_base.RDF.type, self.kg_base.ONT.User) not in parsed_graph:
-            parsed_graph.add(
-                (user_uri, self.kg_base.RDF.type, self.kg_base.ONT.User))
-            parsed_graph.add(
-                (user_uri, self.kg_base.ONT.followsPath, learning_path_uri))
+        Args:
+            db: Database session
+            items: Learning paths to create
+            current_user: User performing the import
 
-        self.storage.save_user_graph(str(user.id), parsed_graph)
+        Yields:
+            One result dict per item, in input order: ``index``, ``status``
+            ("created" or "error") and ``id``/``graph_uri`` or ``detail``
+        """
+        # Read before any rollback expires the user object
+        current_user_id = current_user.id
+        is_superuser = current_user.is_superuser
+
+        for offset in range(0, len(items), BULK_IMPORT_BATCH_SIZE):
+            batch = items[offset:offset + BULK_IMPORT_BATCH_SIZE]
+            results = await self._create_learning_path_batch(
+                db, batch, offset, current_user_id, is_superuser)
+            for result in results:
+                yield result
+
+    async def _create_learning_path_batch(
+        self,
+        db: AsyncSession,
+        batch: List[LearningPathBulkItem],
+        offset: int,
+        current_user_id: int,
+        is_superuser: bool
+    ) -> List[Dict[str, Any]]:
+        """Create one batch of a bulk import as a single unit of work."""
+        results: Dict[int, Dict[str, Any]] = {}
+        accepted = []
+        for index, item in enumerate(batch, start=offset):
+            user_id = item.user_id if item.user_id is not None else current_user_id
+            if user_id != current_user_id and not is_superuser:
+                results[index] = {
+                    "index": index,
+                    "status": "error",
+                    "detail": "Not authorized to create learning path for another user",
+                }
+            else:
+                accepted.append((index, item, user_id))
+
+        if accepted:
+            try:
+                ids = await crud.bulk_create_learning_paths(
+                    db, [{"topic": item.topic, "user_id": user_id} for _, item, user_id in accepted])
+
+                # Build every user's new triples in one pass
+                user_graphs: Dict[int, RDFGraph] = {}
+                graph_uris = []
+                for (index, item, user_id), learning_path_id in zip(accepted, ids):
+                    graph = user_graphs.setdefault(user_id, self.kg_base.create_graph())
+                    learning_path_uri = self.add_learning_path_triples(
+                        graph,
+                        [concept.model_dump() for concept in item.concepts],
+                        item.topic,
+                        item.goal,
+                        learning_path_id,
+                    )
+                    user_uri = self.kg_base.ONT[normalize_string(f"user_{user_id}")]
+                    graph.add((user_uri, self.kg_base.RDF.type, self.kg_base.ONT.User))
+                    graph.add((user_uri, self.kg_base.ONT.followsPath, learning_path_uri))
+                    graph_uris.append({"id": learning_path_id, "graph_uri": str(learning_path_uri)})
+                    results[index] = {
+                        "index": index,
+                        "status": "created",
+                        "id": learning_path_id,
+                        "graph_uri": str(learning_path_uri),
+                    }
+
+                await crud.set_learning_path_graph_uris(db, graph_uris)
+
+                with ExitStack() as stack:
+                    for user_id, graph in user_graphs.items():
+                        stack.enter_context(self.storage.user_graph_transaction(str(user_id)))
+                        self.storage.save_user_graph(str(user_id), graph)
+                    await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Bulk learning path batch at offset {offset} failed: {str(e)}")
+                for index, _, _ in accepted:
+                    results[index] = {"index": index, "status": "error", "detail": str(e)}
 
-        return updated_db_learning_path
+        return [results[index] for index in sorted(results)]
 
     def update_learning_path_kg(
         self,
@@ -366,8 +616,12 @@ class LearningPathService:
                 user_graph.remove(triple)
 
             # Convert JSON-LD back to RDF graph and add to user graph
-            new_graph = RDFGraph()
-            new_graph.parse(data=json.dumps(kg_jsonld), format='json-ld')
+            with kg_operation("jsonld_parse", str(current_user.id)) as op:
+                jsonld_str = json.dumps(kg_jsonld)
+                new_graph = RDFGraph()
+                new_graph.parse(data=jsonld_str, format='json-ld')
+                op["triples"] = len(new_graph)
+                op["bytes"] = len(jsonld_str)
 
             # Add all triples from the new graph to user graph
             for s, p, o in new_graph:
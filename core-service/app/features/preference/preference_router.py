@@ -5,9 +5,9 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.features.users.models import User
-from app.features.users.users import current_active_user
+from app.features.users.users import current_active_user, current_active_user_read
 from .preference_service import PreferenceService
 from .preference_schemas import (
     PreferencesUpdate,
@@ -26,6 +26,7 @@ async def get_preferences(
     db: AsyncSession = Depends(get_db)
 ):
     """Get user's learning preferences."""
+    # Uses the read-write session: default preferences are created on first access
     service = PreferenceService(db)
     prefs = await service.get_or_create_preferences(user.id)
     
@@ -144,8 +145,8 @@ async def track_interaction(
 
 @router.get("/insights", response_model=InsightsResponse)
 async def get_insights(
-    user: User = Depends(current_active_user),
-    db: AsyncSession = Depends(get_db)
+    user: User = Depends(current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get insights about user's learning patterns.
@@ -27,8 +27,8 @@ class PreferenceService:
     def __init__(self, db: AsyncSession):
         self.db = db
     
-    async def get_or_create_preferences(self, user_id: int) -> UserLearningPreferences:
-        """Get user preferences, creating default if not exists."""
+    async def get_preferences_or_default(self, user_id: int) -> UserLearningPreferences:
+        """Get user preferences, or unsaved defaults if none exist (never writes)."""
         result = await self.db.execute(
             select(UserLearningPreferences).filter(
                 UserLearningPreferences.user_id == user_id
@@ -47,6 +47,14 @@ class PreferenceService:
                 preferred_difficulty="intermediate",
                 auto_evolve=True
             )
+        
+        return prefs
+    
+    async def get_or_create_preferences(self, user_id: int) -> UserLearningPreferences:
+        """Get user preferences, creating default if not exists."""
+        prefs = await self.get_preferences_or_default(user_id)
+        
+        if prefs.id is None:
             self.db.add(prefs)
             await self.db.commit()
             await self.db.refresh(prefs)
@@ -587,8 +595,8 @@ class PreferenceService:
         )
     
     async def get_insights(self, user_id: int) -> Dict[str, Any]:
-        """Get insights about user's learning patterns."""
-        prefs = await self.get_or_create_preferences(user_id)
+        """Get insights about user's learning patterns (read-only)."""
+        prefs = await self.get_preferences_or_default(user_id)
         
         # Get interaction stats
         total_interactions_result = await self.db.execute(
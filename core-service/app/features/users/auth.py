@@ -1,28 +1,90 @@
 """
 Authentication configuration and backends
 """
+from datetime import datetime, timezone
+from typing import Optional
+
+import jwt
+from fastapi_users import BaseUserManager, exceptions
 from fastapi_users.authentication import (
     AuthenticationBackend,
     BearerTransport,
     JWTStrategy,
 )
+from fastapi_users.jwt import decode_jwt, generate_jwt
 from app.config import settings
+from app.features.users.cache import attach_cached_user, detached_user, user_cache
+from app.features.users.models import User
+from app.features.users.revocation import revoked_users
 
 # Secret key for JWT (from settings)
 SECRET = settings.SECRET_KEY
 
+# Token lifetime in seconds
+JWT_LIFETIME_SECONDS = 3600
+
+# Version of the claims layout written into tokens; tokens with another
+# version are never trusted without a database lookup
+CLAIMS_VERSION = 1
+CLAIM_FIELDS = ("email", "is_active", "is_verified", "is_superuser")
+
 # Bearer token transport (Authorization: Bearer <token>)
 bearer_transport = BearerTransport(tokenUrl="api/v1/auth/jwt/login")
 
 
+class CachedJWTStrategy(JWTStrategy[User, int]):
+    """
+    JWT strategy that resolves users through the process-wide user cache.
+
+    Tokens carry their issue time (``iat``); the user row is looked up in the
+    cache by user id and issue time and only loaded from the database on a miss.
+    Tokens also carry the user claims read by ``resolve_claims_user`` in
+    stateless mode.
+    """
+
+    async def read_token(
+        self, token: Optional[str], user_manager: BaseUserManager[User, int]
+    ) -> Optional[User]:
+        if token is None:
+            return None
+
+        try:
+            data = decode_jwt(token, self.decode_key, self.token_audience, algorithms=[self.algorithm])
+            user_id = user_manager.parse_id(data["sub"])
+        except (jwt.PyJWTError, KeyError, exceptions.InvalidID):
+            return None
+
+        issued_at = data.get("iat")
+        values = user_cache.get(user_id, issued_at)
+        if values is not None:
+            return await attach_cached_user(user_manager.user_db.session, values)
+
+        try:
+            user = await user_manager.get(user_id)
+        except exceptions.UserNotExists:
+            return None
+        user_cache.put(user, issued_at)
+        return user
+
+    async def write_token(self, user: User) -> str:
+        data = {
+            "sub": str(user.id),
+            "aud": self.token_audience,
+            "iat": int(datetime.now(timezone.utc).timestamp()),
+            "ver": CLAIMS_VERSION,
+            **{field: getattr(user, field) for field in CLAIM_FIELDS},
+        }
+        return generate_jwt(data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm)
+
+
 def get_jwt_strategy() -> JWTStrategy:
     """
     JWT strategy for token generation and validation.
     
-    Tokens expire after 1 hour (3600 seconds) by default.
+    Tokens expire after 1 hour (JWT_LIFETIME_SECONDS) by default.
     You can adjust the lifetime_seconds parameter as needed.
     """
-    return JWTStrategy(secret=SECRET, lifetime_seconds=3600)
+    return CachedJWTStrategy(secret=SECRET, lifetime_seconds=JWT_LIFETIME_SECONDS)
 
 
 # Authentication backend
@@ -31,3 +93,50 @@ auth_backend = AuthenticationBackend(
     transport=bearer_transport,
     get_strategy=get_jwt_strategy,
 )
+
+
+async def resolve_claims_user(token: Optional[str]) -> Optional[User]:
+    """
+    Resolve a token to a detached ``User`` from its signed claims (stateless mode).
+
+    Only the signature, audience and expiry are verified; the claims are
+    trusted unless the user is in the revocation list or the token predates
+    the current claims layout. Those users are resolved through the user
+    cache and the database instead. Columns that are not claims (e.g. names)
+    are not loaded on the returned object.
+
+    Args:
+        token: Bearer token, or None if the request had none
+
+    Returns:
+        The user, or None if the token is invalid or the user does not exist
+
+    Raises:
+        DBOverloadedError: If the database lookup is not admitted in time
+    """
+    if token is None:
+        return None
+    strategy = get_jwt_strategy()
+    try:
+        data = decode_jwt(token, strategy.decode_key, strategy.token_audience, algorithms=[strategy.algorithm])
+        user_id = int(data["sub"])
+    except (jwt.PyJWTError, KeyError, ValueError):
+        return None
+
+    if data.get("ver") == CLAIMS_VERSION and user_id not in revoked_users:
+        return detached_user({"id": user_id, **{field: data[field] for field in CLAIM_FIELDS}})
+
+    issued_at = data.get("iat")
+    values = user_cache.get(user_id, issued_at)
+    if values is not None:
+        return detached_user(values)
+
+    from app.database import SessionLocal
+    from app.database.admission import admission_controller
+
+    async with admission_controller.admit(reentrant=True), SessionLocal() as session:
+        user = await session.get(User, user_id)
+    if user is None:
+        return None
+    user_cache.put(user, issued_at)
+    return user
@@ -0,0 +1,107 @@
+"""
+Process-wide cache of authenticated users.
+
+Resolving a JWT through fastapi-users loads the ``User`` row on every request.
+``UserCache`` keeps the column values of recently resolved users for a short
+TTL, keyed by user id and token issue time, and hands out a copy attached to
+the request's session without running a query.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.features.users.models import User
+from app.util.metrics import registry
+
+AUTH_USER_CACHE_HITS = registry.counter("auth_user_cache_hits_total", "Authenticated users served from the cache")
+AUTH_USER_CACHE_MISSES = registry.counter("auth_user_cache_misses_total", "Authenticated users loaded from the database")
+
+# Attribute names match column names on User
+_COLUMN_KEYS = tuple(column.key for column in User.__table__.columns)
+
+
+class UserCache:
+    """LRU cache of user column values with a per-entry TTL."""
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        """
+        Args:
+            ttl_seconds: Lifetime of an entry (0 disables caching)
+            max_size: Maximum number of entries kept
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def get(self, user_id: int, issued_at: Optional[int]) -> Optional[dict[str, Any]]:
+        """Return the cached column values for a token, or None if missing or expired."""
+        if not self.enabled:
+            return None
+        key = (user_id, issued_at)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                AUTH_USER_CACHE_HITS.inc()
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        AUTH_USER_CACHE_MISSES.inc()
+        return None
+
+    def put(self, user: User, issued_at: Optional[int]) -> None:
+        """Remember the current column values of ``user`` for tokens issued at ``issued_at``."""
+        if not self.enabled:
+            return
+        values = {key: getattr(user, key) for key in _COLUMN_KEYS}
+        key = (user.id, issued_at)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, values)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every entry of ``user_id`` (all of their tokens)."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def detached_user(values: dict[str, Any]) -> User:
+    """Build a detached ``User`` (as if loaded and then expunged) from column values."""
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+async def attach_cached_user(session: AsyncSession, values: dict[str, Any]) -> User:
+    """
+    Build a ``User`` from cached values, attached to ``session`` without a query.
+
+    Each request gets its own instance, so lazy loads and writes go through
+    the request's session as if the row had been loaded there.
+    """
+    return await session.merge(detached_user(values), load=False)
+
+
+# Process-wide cache used by the JWT strategy
+user_cache = UserCache(settings.AUTH_USER_CACHE_TTL_SECONDS, settings.AUTH_USER_CACHE_MAX_SIZE)
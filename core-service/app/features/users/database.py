@@ -6,7 +6,7 @@ from fastapi import Depends
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.features.users.models import User
-from app.database import get_db
+from app.database import get_db, get_read_db
 
 
 async def get_user_db(session: AsyncSession = Depends(get_db)) -> AsyncGenerator[SQLAlchemyUserDatabase, None]:
@@ -20,3 +20,16 @@ async def get_user_db(session: AsyncSession = Depends(get_db)) -> AsyncGenerator
         user_db = Depends(get_user_db)
     """
     yield SQLAlchemyUserDatabase(session, User)
+
+
+async def get_read_user_db(session: AsyncSession = Depends(get_read_db)) -> AsyncGenerator[SQLAlchemyUserDatabase, None]:
+    """
+    Dependency to get read-only user database access.
+    
+    Resolves the current user through the request's read session, so routes
+    using ``get_read_db`` open no second session for authentication.
+    
+    Usage:
+        user_db = Depends(get_read_user_db)
+    """
+    yield SQLAlchemyUserDatabase(session, User)
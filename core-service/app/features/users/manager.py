@@ -1,11 +1,14 @@
 """
 User manager for handling user-related operations
 """
+from datetime import datetime, timezone
 from typing import Optional
 from fastapi import Depends, Request
 from fastapi_users import BaseUserManager, IntegerIDMixin
-from app.features.users.models import User
-from app.features.users.database import get_user_db
+from app.features.users.models import RevokedUser, User
+from app.features.users.database import get_read_user_db, get_user_db
+from app.features.users.cache import user_cache
+from app.features.users.revocation import revoked_users
 from app.config import settings
 import logging
 
@@ -46,7 +49,38 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
         logger.info(f"Verification requested for user {user.id} ({user.email}).")
         logger.debug(f"Verification token: {token}")
 
+    # ===== Authenticated-user cache invalidation and revocation =====
+
+    async def on_after_update(self, user: User, update_dict: dict, request: Optional[Request] = None):
+        """Called after a user is updated (including activation changes)"""
+        user_cache.invalidate_user(user.id)
+        revoked_users.add(user.id)
+
+    async def on_after_verify(self, user: User, request: Optional[Request] = None):
+        """Called after a user's email is verified"""
+        user_cache.invalidate_user(user.id)
+        revoked_users.add(user.id)
+
+    async def on_after_reset_password(self, user: User, request: Optional[Request] = None):
+        """Called after a user resets their password"""
+        user_cache.invalidate_user(user.id)
+        revoked_users.add(user.id)
+
+    async def on_before_delete(self, user: User, request: Optional[Request] = None):
+        """Called before a user is deleted; the tombstone commits with the deletion"""
+        await self.user_db.session.merge(RevokedUser(user_id=user.id, revoked_at=datetime.now(timezone.utc)))
+
+    async def on_after_delete(self, user: User, request: Optional[Request] = None):
+        """Called after a user is deleted"""
+        user_cache.invalidate_user(user.id)
+        revoked_users.add(user.id)
+
 
 async def get_user_manager(user_db=Depends(get_user_db)):
     """Dependency to get user manager instance"""
     yield UserManager(user_db)
+
+
+async def get_read_user_manager(user_db=Depends(get_read_user_db)):
+    """Dependency to get a user manager over the read session (lookups only)"""
+    yield UserManager(user_db)
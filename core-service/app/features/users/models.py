@@ -2,10 +2,10 @@
 User models for authentication using fastapi-users
 """
 from fastapi_users_db_sqlalchemy import SQLAlchemyBaseUserTable
-from sqlalchemy import String, Column, Integer, DateTime
+from sqlalchemy import String, Column, Integer
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.database.base import Base
+from app.database.base import Base, Timestamp
 
 
 class User(SQLAlchemyBaseUserTable[int], Base):
@@ -29,9 +29,9 @@ class User(SQLAlchemyBaseUserTable[int], Base):
     first_name = Column(String(50), nullable=True)
     last_name = Column(String(50), nullable=True)
     
-    # Add timestamp fields
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Add timestamp fields (Timestamp: comparable with bound cutoffs on SQLite)
+    created_at = Column(Timestamp, server_default=func.now(), nullable=False)
+    updated_at = Column(Timestamp, onupdate=func.now())
 
     # Learning preferences relationships
     learning_preferences = relationship(
@@ -55,3 +55,20 @@ class User(SQLAlchemyBaseUserTable[int], Base):
         if self.first_name and self.last_name:
             return f"{self.first_name} {self.last_name}"
         return self.email
+
+
+class RevokedUser(Base):
+    """
+    Tombstone of a deleted user.
+
+    Deleted users leave no row for the revocation refresh to find, so each
+    deletion writes one here (in the same transaction). Tombstones are kept
+    for the token lifetime, while tokens of the deleted user can still verify.
+    """
+    __tablename__ = "revoked_user"
+
+    user_id = Column(Integer, primary_key=True)
+    revoked_at = Column(Timestamp, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<RevokedUser(user_id={self.user_id}, revoked_at={self.revoked_at})>"
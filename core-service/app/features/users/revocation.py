@@ -0,0 +1,107 @@
+"""
+Server-side revocation list for stateless JWT claims.
+
+In stateless mode (``AUTH_STATELESS_CLAIMS``) a token's signed claims are
+trusted without a database lookup. ``RevocationBitmap`` marks the users whose
+claims can no longer be trusted: inactive users and users modified within the
+token lifetime, whose older tokens may carry stale claims. Marked users are
+resolved from the database instead. The bitmap costs one bit per user id and
+is rebuilt from the user table periodically, so changes made in other worker
+processes are picked up as well. Deleted users are found through their
+``revoked_user`` tombstones, which are pruned once older than the token
+lifetime.
+"""
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, or_, select
+
+from app.config import settings
+from app.features.users.models import RevokedUser, User
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationBitmap:
+    """Set of non-negative integer user ids stored as a bitmap."""
+
+    def __init__(self, user_ids: Iterable[int] = ()):
+        self._bits = bytearray()
+        self._lock = threading.Lock()
+        for user_id in user_ids:
+            self.add(user_id)
+
+    def add(self, user_id: int) -> None:
+        index, bit = divmod(user_id, 8)
+        with self._lock:
+            if index >= len(self._bits):
+                self._bits.extend(bytes(index + 1 - len(self._bits)))
+            self._bits[index] |= 1 << bit
+
+    def replace(self, user_ids: Iterable[int]) -> None:
+        """Atomically replace the content with ``user_ids``."""
+        rebuilt = RevocationBitmap(user_ids)
+        with self._lock:
+            self._bits = rebuilt._bits
+
+    def __contains__(self, user_id: int) -> bool:
+        index, bit = divmod(user_id, 8)
+        bits = self._bits
+        return 0 <= index < len(bits) and bool(bits[index] & (1 << bit))
+
+    def __len__(self) -> int:
+        return sum(bin(byte).count("1") for byte in self._bits)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+# Process-wide revocation list consulted by the stateless claims dependency
+revoked_users = RevocationBitmap()
+
+
+async def refresh_revoked_users(token_lifetime_seconds: int) -> int:
+    """
+    Rebuild ``revoked_users`` from the user table and the deletion tombstones.
+
+    Args:
+        token_lifetime_seconds: Lifetime of issued tokens; users updated or deleted within it are marked
+
+    Returns:
+        Number of marked users
+    """
+    from app.database import SessionLocal
+    from app.database.admission import admission_controller
+
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=token_lifetime_seconds)
+    async with admission_controller.admit(reentrant=True), SessionLocal() as session:
+        result = await session.execute(
+            select(User.id).where(or_(User.is_active.is_(False), User.updated_at >= cutoff))
+        )
+        user_ids = set(result.scalars().all())
+        result = await session.execute(select(RevokedUser.user_id).where(RevokedUser.revoked_at >= cutoff))
+        user_ids.update(result.scalars().all())
+        # Tokens issued before these deletions have expired
+        await session.execute(delete(RevokedUser).where(RevokedUser.revoked_at < cutoff))
+        await session.commit()
+    revoked_users.replace(user_ids)
+    return len(user_ids)
+
+
+async def run_revocation_refresh(token_lifetime_seconds: int, interval_seconds: Optional[float] = None) -> None:
+    """
+    Periodically rebuild the revocation list until cancelled.
+
+    Intended to be started as a background task from the application lifespan.
+    """
+    interval_seconds = interval_seconds or settings.AUTH_REVOCATION_REFRESH_SECONDS
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await refresh_revoked_users(token_lifetime_seconds)
+        except Exception as e:
+            logger.error(f"Revocation list refresh failed: {str(e)}")
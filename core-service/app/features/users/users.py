@@ -1,10 +1,16 @@
 """
 FastAPI Users instance and current user dependencies
 """
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
 from fastapi_users import FastAPIUsers
+from app.config import settings
+from app.database.admission import DBOverloadedError
+from app.database.session import overloaded_error
 from app.features.users.models import User
-from app.features.users.manager import get_user_manager
-from app.features.users.auth import auth_backend
+from app.features.users.manager import get_read_user_manager, get_user_manager
+from app.features.users.auth import auth_backend, bearer_transport, resolve_claims_user
 
 # Create FastAPI Users instance (SYNC mode)
 fastapi_users = FastAPIUsers[User, int](
@@ -12,8 +18,42 @@ fastapi_users = FastAPIUsers[User, int](
     [auth_backend],
 )
 
+# Same authentication, resolving the user through the read session (get_read_db)
+fastapi_users_read = FastAPIUsers[User, int](
+    get_read_user_manager,
+    [auth_backend],
+)
+
+
+
+async def current_active_user_from_claims(token: Optional[str] = Depends(bearer_transport.scheme)) -> User:
+    """
+    Stateless variant of current_active_user.
+
+    Builds the user from the signed token claims without opening a database
+    session; revoked users are still checked against the database.
+    """
+    try:
+        user = await resolve_claims_user(token)
+    except DBOverloadedError as e:
+        raise overloaded_error(e)
+    if user is None or not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    return user
+
+
 # Dependencies for getting current user
-current_active_user = fastapi_users.current_user(active=True)
+current_active_user = (
+    current_active_user_from_claims
+    if settings.AUTH_STATELESS_CLAIMS
+    else fastapi_users.current_user(active=True)
+)
+# For routes using get_read_db: the user lookup shares their read session
+current_active_user_read = (
+    current_active_user_from_claims
+    if settings.AUTH_STATELESS_CLAIMS
+    else fastapi_users_read.current_user(active=True)
+)
 current_superuser = fastapi_users.current_user(active=True, superuser=True)
 current_verified_user = fastapi_users.current_user(active=True, verified=True)
 
@@ -5,6 +5,8 @@ from rdflib.namespace import RDF, RDFS, OWL, XSD
 from pathlib import Path
 from typing import Optional
 from app.kg.config import KGConfig
+from app.kg.metrics import kg_operation
+from app.kg.cache import file_signature, graph_cache
 
 
 class KGBase:
@@ -34,12 +36,13 @@ class KGBase:
         
         return g
     
-    def load_graph(self, file_path: Path) -> Optional[Graph]:
+    def load_graph(self, file_path: Path, user_id: Optional[str] = None) -> Optional[Graph]:
         """
         Load an RDF graph from a file.
         
         Args:
             file_path: Path to the RDF file
+            user_id: Owner of the graph, reported in slow-operation logs
             
         Returns:
             Graph object if file exists, None otherwise
@@ -47,23 +50,53 @@ class KGBase:
         if not file_path.exists():
             return None
         
-        g = self.create_graph()
-        g.parse(file_path, format=KGConfig.RDF_FORMAT)
+        # Callers may mutate the returned graph, so always hand out a copy
+        cached = graph_cache.get(file_path)
+        if cached is not None:
+            return self.copy_graph(cached)
+        
+        # Taken before parsing, so a rewrite during the parse is not cached as current
+        signature = file_signature(file_path)
+        with kg_operation("load_graph", user_id) as op:
+            op["bytes"] = file_path.stat().st_size
+            g = self.create_graph()
+            g.parse(file_path, format=KGConfig.RDF_FORMAT)
+            op["triples"] = len(g)
+        graph_cache.put(file_path, g, signature)
         return g
     
-    def save_graph(self, graph: Graph, file_path: Path) -> None:
+    def save_graph(self, graph: Graph, file_path: Path, user_id: Optional[str] = None) -> None:
         """
         Save an RDF graph to a file.
         
         Args:
             graph: RDF graph to save
             file_path: Path where to save the graph
+            user_id: Owner of the graph, reported in slow-operation logs
         """
         # Ensure parent directory exists
         file_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Serialize graph to file
-        graph.serialize(destination=str(file_path), format=KGConfig.RDF_FORMAT)
+        with kg_operation("save_graph", user_id) as op:
+            op["triples"] = len(graph)
+            graph.serialize(destination=str(file_path), format=KGConfig.RDF_FORMAT)
+            op["bytes"] = file_path.stat().st_size
+        graph_cache.put(file_path, graph)
+    
+    def copy_graph(self, graph: Graph) -> Graph:
+        """
+        Copy a graph's triples into a new graph with standard namespace bindings.
+        
+        Args:
+            graph: RDF graph to copy
+            
+        Returns:
+            A new, independent Graph with the same triples
+        """
+        g = self.create_graph()
+        g += graph
+        return g
     
     def merge_graphs(self, *graphs: Graph) -> Graph:
         """
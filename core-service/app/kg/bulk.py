@@ -0,0 +1,329 @@
+"""Bulk export and import of all user Knowledge Graphs.
+
+Exports every user graph (hot or cold) into a single N-Quads archive where
+each user's triples form one contiguous block in a named graph, and imports
+such an archive back into per-user Turtle files. Parsing and serialization
+run in a process pool. Progress is checkpointed next to the archive so an
+interrupted run can be resumed, and every user block carries a SHA-256
+checksum that import verifies. File paths are resolved in the parent and
+handed to the workers, so results do not depend on workers inheriting the
+parent's ``KGConfig`` (spawned workers re-import it from settings).
+
+Usage:
+    python -m app.kg.bulk export backup.nq.gz --workers 8
+    python -m app.kg.bulk import backup.nq.gz --workers 8
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from rdflib import Graph
+
+from app.kg.base import KGBase
+from app.kg.config import KGConfig
+from app.kg.tiering import COMPRESSION_SUFFIXES, KGTiering
+
+logger = logging.getLogger(__name__)
+
+USER_GRAPH_NAMESPACE = KGConfig.BASE_NAMESPACE + "/graph/"
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+DEFAULT_CHECKPOINT_EVERY = 100
+
+
+def user_graph_iri(user_id: str) -> str:
+    """Named graph IRI used for a user's triples in an archive."""
+    return f"{USER_GRAPH_NAMESPACE}{KGConfig.USER_FILE_PREFIX}{user_id}"
+
+
+def user_id_from_graph_iri(iri: str) -> str:
+    """Inverse of ``user_graph_iri``."""
+    return iri[len(USER_GRAPH_NAMESPACE) + len(KGConfig.USER_FILE_PREFIX):]
+
+
+def list_user_ids() -> list[str]:
+    """List every user with a graph in the hot or cold tier, sorted."""
+    user_ids = {KGConfig.get_user_id_from_file_path(p) for p in KGConfig.iter_user_files()}
+    for suffix in COMPRESSION_SUFFIXES.values():
+        for cold_path in KGConfig.COLD_USERS_DIR.glob(f"{KGConfig.USER_FILE_PREFIX}*{KGConfig.USER_FILE_SUFFIX}{suffix}"):
+            user_ids.add(KGConfig.get_user_id_from_file_path(cold_path))
+    return sorted(user_ids)
+
+
+class Throughput:
+    """Accumulates counts and logs users/s, triples/s and MB/s."""
+
+    def __init__(self, label: str, total: int):
+        self.label = label
+        self.total = total
+        self.users = 0
+        self.triples = 0
+        self.bytes = 0
+        self.start = time.perf_counter()
+
+    def add(self, triples: int, size: int) -> None:
+        self.users += 1
+        self.triples += triples
+        self.bytes += size
+
+    def summary(self) -> dict:
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        return {
+            "users": self.users,
+            "triples": self.triples,
+            "bytes": self.bytes,
+            "seconds": elapsed,
+            "users_per_second": self.users / elapsed,
+            "triples_per_second": self.triples / elapsed,
+            "mb_per_second": self.bytes / elapsed / 1_000_000,
+        }
+
+    def log(self) -> None:
+        s = self.summary()
+        logger.info(
+            f"{self.label}: {self.users}/{self.total} users, {s['triples']} triples, "
+            f"{s['users_per_second']:.1f} users/s, {s['triples_per_second']:.0f} triples/s, "
+            f"{s['mb_per_second']:.2f} MB/s"
+        )
+
+
+# ===== Checkpoints =====
+
+def _checkpoint_path(archive_path: Path, mode: str) -> Path:
+    return archive_path.with_name(f"{archive_path.name}.{mode}{CHECKPOINT_SUFFIX}")
+
+
+def _load_checkpoint(archive_path: Path, mode: str) -> dict:
+    path = _checkpoint_path(archive_path, mode)
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"offset": 0, "users": {}, "complete": False}
+
+
+def _save_checkpoint(archive_path: Path, mode: str, checkpoint: dict) -> None:
+    path = _checkpoint_path(archive_path, mode)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(checkpoint))
+    tmp_path.replace(path)
+
+
+# ===== Process pool helpers =====
+
+def _bounded_map(executor: ProcessPoolExecutor, fn: Callable, items: Iterable, max_in_flight: int) -> Iterator:
+    """Yield ``fn(item)`` results as they complete, with limited submissions in flight."""
+    pending = set()
+    for item in items:
+        pending.add(executor.submit(fn, item))
+        if len(pending) >= max_in_flight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+
+def _export_items(user_ids: Iterable[str]) -> Iterator[tuple[str, Path, Optional[tuple[Path, str]]]]:
+    """Resolve each user's hot file and cold archive in the parent process."""
+    tiering = KGTiering()
+    for user_id in user_ids:
+        yield user_id, KGConfig.get_user_file_path(user_id), tiering.find_cold_file(user_id)
+
+
+def _export_user(item: tuple[str, Path, Optional[tuple[Path, str]]]) -> tuple[str, bytes, str, int]:
+    """Worker: serialize one user's graph as a sorted N-Quads block."""
+    user_id, file_path, cold = item
+    if file_path.exists():
+        source = file_path.read_bytes()
+    elif cold is not None:
+        source = KGTiering().read_cold_path(*cold)
+    else:
+        source = b""
+
+    graph = Graph()
+    graph.parse(data=source, format=KGConfig.RDF_FORMAT)
+    graph_term = f"<{user_graph_iri(user_id)}>"
+    lines = sorted(
+        f"{line.rstrip()[:-1].rstrip()} {graph_term} .\n"
+        for line in graph.serialize(format="nt").splitlines()
+        if line.strip()
+    )
+    block = "".join(lines).encode("utf-8")
+    return user_id, block, hashlib.sha256(block).hexdigest(), len(lines)
+
+
+def _import_user(item: tuple[str, bytes, Path]) -> tuple[str, str, int, int]:
+    """Worker: write one user's N-Quads block back as a Turtle graph file."""
+    user_id, block, file_path = item
+    triples = "".join(
+        line.rsplit(" ", 2)[0] + " .\n"
+        for line in block.decode("utf-8").splitlines()
+        if line.strip()
+    )
+    graph = KGBase().create_graph()
+    graph.parse(data=triples, format="nt")
+    KGBase().save_graph(graph, file_path)
+    return user_id, hashlib.sha256(block).hexdigest(), len(graph), len(block)
+
+
+# ===== Export / import =====
+
+def export_user_graphs(
+    archive_path: Path,
+    workers: Optional[int] = None,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    user_ids: Optional[list[str]] = None,
+) -> dict:
+    """
+    Export all user graphs into a single N-Quads archive.
+
+    A ``.gz`` suffix writes each user block as its own gzip member so the
+    archive can be truncated back to the last checkpoint and appended to.
+
+    Args:
+        archive_path: Destination archive (.nq or .nq.gz)
+        workers: Process pool size (default: CPU count)
+        checkpoint_every: Persist progress after this many users
+        user_ids: Restrict the export to these users (default: all)
+
+    Returns:
+        Throughput summary plus the number of users skipped from a previous run
+    """
+    archive_path = Path(archive_path)
+    checkpoint = _load_checkpoint(archive_path, "export")
+    archive_size = archive_path.stat().st_size if archive_path.exists() else 0
+    if checkpoint["complete"] or archive_size < checkpoint["offset"]:
+        # Previous export finished (or its archive is gone): start over
+        checkpoint = {"offset": 0, "users": {}, "complete": False}
+    done = checkpoint["users"]
+
+    # Drop anything written after the last checkpoint
+    with open(archive_path, "ab") as f:
+        f.truncate(checkpoint["offset"])
+
+    todo = [u for u in (user_ids if user_ids is not None else list_user_ids()) if u not in done]
+    stats = Throughput("Export", len(todo))
+    compress = archive_path.suffix == ".gz"
+    workers = workers or os.cpu_count() or 1
+
+    with open(archive_path, "ab") as archive, ProcessPoolExecutor(max_workers=workers) as executor:
+        for user_id, block, checksum, triple_count in _bounded_map(
+            executor, _export_user, _export_items(todo), workers * 4
+        ):
+            archive.write(gzip.compress(block) if compress else block)
+            done[user_id] = {"sha256": checksum, "triples": triple_count}
+            stats.add(triple_count, len(block))
+            if stats.users % checkpoint_every == 0:
+                archive.flush()
+                checkpoint["offset"] = archive.tell()
+                _save_checkpoint(archive_path, "export", checkpoint)
+                stats.log()
+        archive.flush()
+        checkpoint["offset"] = archive.tell()
+
+    checkpoint["complete"] = True
+    _save_checkpoint(archive_path, "export", checkpoint)
+    stats.log()
+    return {**stats.summary(), "skipped": len(done) - stats.users}
+
+
+def _iter_archive_blocks(archive_path: Path) -> Iterator[tuple[str, bytes]]:
+    """Yield (user_id, N-Quads block) pairs from an archive in file order."""
+    opener = gzip.open if archive_path.suffix == ".gz" else open
+    current_iri, lines = None, []
+    with opener(archive_path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            iri = line.rstrip().rsplit(b" ", 2)[1][1:-1].decode("utf-8")
+            if iri != current_iri and lines:
+                yield user_id_from_graph_iri(current_iri), b"".join(lines)
+                lines = []
+            current_iri = iri
+            lines.append(line)
+    if lines:
+        yield user_id_from_graph_iri(current_iri), b"".join(lines)
+
+
+def import_user_graphs(
+    archive_path: Path,
+    workers: Optional[int] = None,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    verify: bool = True,
+) -> dict:
+    """
+    Import user graphs from an N-Quads archive, replacing existing files.
+
+    Args:
+        archive_path: Archive produced by ``export_user_graphs``
+        workers: Process pool size (default: CPU count)
+        checkpoint_every: Persist progress after this many users
+        verify: Compare each block against the export checksums when available
+
+    Returns:
+        Throughput summary plus skipped users and checksum mismatches
+    """
+    archive_path = Path(archive_path)
+    expected = _load_checkpoint(archive_path, "export")["users"] if verify else {}
+    checkpoint = _load_checkpoint(archive_path, "import")
+    if checkpoint["complete"]:
+        checkpoint = {"offset": 0, "users": {}, "complete": False}
+    done = checkpoint["users"]
+
+    mismatches = []
+    skipped = 0
+
+    def blocks():
+        nonlocal skipped
+        for user_id, block in _iter_archive_blocks(archive_path):
+            if user_id in done:
+                skipped += 1
+                continue
+            yield user_id, block, KGConfig.get_user_file_path(user_id)
+
+    stats = Throughput("Import", len(expected) - len(done) if expected else 0)
+    workers = workers or os.cpu_count() or 1
+    tiering = KGTiering()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for user_id, checksum, triple_count, size in _bounded_map(executor, _import_user, blocks(), workers * 4):
+            tiering.discard_cold_file(user_id)
+            if user_id in expected and expected[user_id]["sha256"] != checksum:
+                logger.error(f"Checksum mismatch for user {user_id}")
+                mismatches.append(user_id)
+            done[user_id] = {"sha256": checksum, "triples": triple_count}
+            stats.add(triple_count, size)
+            if stats.users % checkpoint_every == 0:
+                _save_checkpoint(archive_path, "import", checkpoint)
+                stats.log()
+
+    checkpoint["complete"] = True
+    _save_checkpoint(archive_path, "import", checkpoint)
+    stats.log()
+    return {**stats.summary(), "skipped": skipped, "checksum_mismatches": mismatches}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk export/import of user knowledge graphs")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("archive", type=Path, help="N-Quads archive path (.nq or .nq.gz)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--checkpoint-every", type=int, default=DEFAULT_CHECKPOINT_EVERY)
+    parser.add_argument("--no-verify", action="store_true", help="Skip checksum verification on import")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "export":
+        result = export_user_graphs(args.archive, args.workers, args.checkpoint_every)
+    else:
+        result = import_user_graphs(args.archive, args.workers, args.checkpoint_every, verify=not args.no_verify)
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,107 @@
+"""In-process cache of parsed RDF graphs.
+
+Parsed graphs are kept in a size-bounded LRU keyed by file path. Each entry
+remembers the file's modification time and size, so a file rewritten by
+another worker process is detected and re-parsed on the next access.
+"""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from rdflib import Graph
+
+from app.config import settings
+from app.util.metrics import registry
+
+KG_CACHE_HITS = registry.counter("kg_cache_hits_total", "Graph loads served from the in-process KG cache")
+KG_CACHE_MISSES = registry.counter("kg_cache_misses_total", "Graph loads that had to parse the file")
+KG_CACHE_SIZE = registry.gauge("kg_cache_graphs", "Number of parsed graphs held in the KG cache")
+
+
+def file_signature(file_path: Path) -> Optional[tuple[int, int]]:
+    """``(mtime_ns, size)`` of ``file_path``, or None if it does not exist."""
+    try:
+        stat = file_path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class KGGraphCache:
+    """LRU cache of parsed graphs validated against the file on disk."""
+
+    def __init__(self, max_graphs: int):
+        """
+        Args:
+            max_graphs: Maximum number of graphs to keep (0 disables caching)
+        """
+        self.max_graphs = max_graphs
+        self._entries: OrderedDict[str, tuple[tuple[int, int], Graph]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path: Path) -> Optional[Graph]:
+        """Return the cached graph for ``file_path`` if it is still current."""
+        if self.max_graphs <= 0:
+            return None
+        key = str(file_path)
+        signature = file_signature(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                KG_CACHE_HITS.inc()
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        KG_CACHE_MISSES.inc()
+        return None
+
+    def put(self, file_path: Path, graph: Graph, signature: Optional[tuple[int, int]] = None) -> None:
+        """
+        Cache a private copy of ``graph`` as the current content of ``file_path``.
+
+        Args:
+            file_path: File the graph was read from or written to
+            graph: Parsed graph
+            signature: ``file_signature`` taken before the file was parsed; the
+                graph is not cached if the file has changed since
+        """
+        if self.max_graphs <= 0:
+            return
+        current = file_signature(file_path)
+        if current is None or (signature is not None and signature != current):
+            return
+        signature = current
+        snapshot = Graph()
+        snapshot += graph
+        key = str(file_path)
+        with self._lock:
+            self._entries[key] = (signature, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_graphs:
+                self._entries.popitem(last=False)
+            KG_CACHE_SIZE.set(len(self._entries))
+
+    def invalidate(self, file_path: Path) -> None:
+        """Drop any cached graph for ``file_path``."""
+        with self._lock:
+            self._entries.pop(str(file_path), None)
+            KG_CACHE_SIZE.set(len(self._entries))
+
+    def clear(self) -> None:
+        """Drop every cached graph."""
+        with self._lock:
+            self._entries.clear()
+            KG_CACHE_SIZE.set(0)
+
+    def __contains__(self, file_path: Path) -> bool:
+        return str(file_path) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache shared by all KGBase instances
+graph_cache = KGGraphCache(settings.KG_CACHE_MAX_GRAPHS)
@@ -1,7 +1,9 @@
 """Knowledge Graph configuration and constants."""
 
 from pathlib import Path
+from typing import Iterator
 from app.config import settings
+from app.kg.partitioning import HashRing
 
 
 class KGConfig:
@@ -12,14 +14,36 @@ class KGConfig:
     INSTANCES_PATH = BASE_PATH / "instances"
     
     # Instance data paths
-    USERS_DIR = INSTANCES_PATH / "users"
+    USERS_SUBDIR = Path("instances") / "users"
+    USERS_DIR = BASE_PATH / USERS_SUBDIR
+    
+    # User graphs are spread across these roots by consistent hashing.
+    # The primary root (BASE_PATH) is used when KG_STORAGE_ROOTS is empty.
+    STORAGE_ROOTS = [Path(p) for p in settings.KG_STORAGE_ROOTS] or [BASE_PATH]
+    USER_RING = HashRing(STORAGE_ROOTS)
+    
+    # Shared concept catalog
+    CONCEPTS_FILE = INSTANCES_PATH / "concepts.ttl"
     
     # Ontology file
     ONTOLOGY = BASE_PATH / "ontology.ttl"
     
+    # Cold storage paths (compressed archives of inactive user graphs). The default
+    # sits next to, not inside, BASE_PATH so hot-tree backups and scans skip it
+    COLD_PATH = (
+        Path(settings.KG_COLD_STORAGE_PATH) if settings.KG_COLD_STORAGE_PATH
+        else BASE_PATH.parent / f"{BASE_PATH.name}-cold"
+    )
+    COLD_USERS_DIR = COLD_PATH / "users"
+    COLD_COMPRESSION = settings.KG_COLD_COMPRESSION
+    
     # RDF format
     RDF_FORMAT = settings.KG_FORMAT
     
+    # User graph file naming
+    USER_FILE_PREFIX = "user_"
+    USER_FILE_SUFFIX = ".ttl"
+    
     # Namespaces
     BASE_NAMESPACE = "http://learnora.ai"
     ONTOLOGY_NAMESPACE = BASE_NAMESPACE + "/ont#"
@@ -29,6 +53,26 @@ class KGConfig:
         """Ensure all necessary directories exist."""
         cls.INSTANCES_PATH.mkdir(parents=True, exist_ok=True)
         cls.USERS_DIR.mkdir(parents=True, exist_ok=True)
+        for root in cls.STORAGE_ROOTS:
+            cls.get_users_dir_for_root(root).mkdir(parents=True, exist_ok=True)
+    
+    @classmethod
+    def set_storage_roots(cls, roots: list[Path]) -> None:
+        """Replace the storage roots and rebuild the placement ring."""
+        cls.STORAGE_ROOTS = [Path(r) for r in roots] or [cls.BASE_PATH]
+        cls.USER_RING = HashRing(cls.STORAGE_ROOTS)
+    
+    @classmethod
+    def get_users_dir_for_root(cls, root: Path) -> Path:
+        """Get the users directory inside a storage root."""
+        if Path(root) == cls.BASE_PATH:
+            return cls.USERS_DIR
+        return Path(root) / cls.USERS_SUBDIR
+    
+    @classmethod
+    def get_user_root(cls, user_id: str) -> Path:
+        """Get the storage root that owns a user's knowledge graph."""
+        return Path(cls.USER_RING.get_node(str(user_id)))
     
     @classmethod
     def get_user_file_path(cls, user_id: str) -> Path:
@@ -36,7 +80,34 @@ class KGConfig:
         Get the file path for a user's knowledge graph.
         This file now contains both user knowledge and their learning paths.
         """
-        return cls.USERS_DIR / f"user_{user_id}.ttl"
+        users_dir = cls.get_users_dir_for_root(cls.get_user_root(user_id))
+        return users_dir / f"{cls.USER_FILE_PREFIX}{user_id}{cls.USER_FILE_SUFFIX}"
+    
+    @classmethod
+    def iter_user_files(cls) -> Iterator[Path]:
+        """Iterate over every hot user graph file across all storage roots."""
+        for root in cls.STORAGE_ROOTS:
+            yield from cls.get_users_dir_for_root(root).glob(f"{cls.USER_FILE_PREFIX}*{cls.USER_FILE_SUFFIX}")
+    
+    @classmethod
+    def get_user_cold_file_path(cls, user_id: str, suffix: str) -> Path:
+        """
+        Get the cold storage archive path for a user's knowledge graph.
+        
+        Args:
+            user_id: User identifier
+            suffix: Compression suffix appended to the Turtle file name (e.g. '.gz')
+        """
+        return cls.COLD_USERS_DIR / f"{cls.USER_FILE_PREFIX}{user_id}{cls.USER_FILE_SUFFIX}{suffix}"
+    
+    @classmethod
+    def get_user_id_from_file_path(cls, file_path: Path) -> str:
+        """
+        Recover the user identifier from a hot or cold user graph file path.
+        """
+        name = file_path.name
+        name = name[len(cls.USER_FILE_PREFIX):]
+        return name[:name.index(cls.USER_FILE_SUFFIX)]
 
 
 # Ensure directories exist on import
@@ -0,0 +1,102 @@
+"""Instrumentation for Knowledge Graph operations.
+
+Records duration, triple count and byte size of rdflib parse/serialize work
+as histograms and logs operations slower than ``KG_SLOW_OPERATION_MS``.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from app.config import settings
+from app.kg.tiering import tiering_stats
+from app.util.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+KG_OPERATION_SECONDS = registry.histogram(
+    "kg_operation_seconds",
+    "Duration of Knowledge Graph operations",
+    labelnames=("operation",),
+)
+KG_OPERATION_TRIPLES = registry.histogram(
+    "kg_operation_triples",
+    "Number of triples handled by Knowledge Graph operations",
+    labelnames=("operation",),
+    buckets=(10, 100, 1_000, 10_000, 100_000, 1_000_000),
+)
+KG_OPERATION_BYTES = registry.histogram(
+    "kg_operation_bytes",
+    "Size in bytes of files or documents handled by Knowledge Graph operations",
+    labelnames=("operation",),
+    buckets=(1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000),
+)
+
+
+@contextmanager
+def kg_operation(operation: str, user_id: Optional[str] = None) -> Iterator[dict]:
+    """
+    Time a Knowledge Graph operation.
+
+    The yielded dict may be filled with ``triples`` and ``bytes`` by the caller
+    before the block exits.
+
+    Usage:
+        with kg_operation("load_graph", user_id) as op:
+            graph.parse(file_path)
+            op["triples"] = len(graph)
+            op["bytes"] = file_path.stat().st_size
+    """
+    op: dict = {}
+    start = time.perf_counter()
+    try:
+        yield op
+    finally:
+        elapsed = time.perf_counter() - start
+        KG_OPERATION_SECONDS.observe(elapsed, operation=operation)
+        if "triples" in op:
+            KG_OPERATION_TRIPLES.observe(op["triples"], operation=operation)
+        if "bytes" in op:
+            KG_OPERATION_BYTES.observe(op["bytes"], operation=operation)
+        if elapsed * 1000 >= settings.KG_SLOW_OPERATION_MS:
+            logger.warning(
+                f"Slow KG operation {operation}: {elapsed * 1000:.1f} ms "
+                f"(user={user_id}, triples={op.get('triples')}, bytes={op.get('bytes')})"
+            )
+
+
+# ===== Cold storage tiering =====
+
+# Monotonic totals are exported as counters, derived ratios and latencies as gauges
+_TIERING_COUNTERS = {
+    name: registry.counter(f"kg_tiering_{name}_total", description)
+    for name, description in {
+        "hot_hits": "User graph loads served from the hot tier",
+        "rehydrations": "User graph loads restored from cold storage",
+        "misses": "User graph loads with no graph in either tier",
+        "archived": "User graphs moved to cold storage",
+    }.items()
+}
+_TIERING_COUNTERS["rehydration_seconds_total"] = registry.counter(
+    "kg_tiering_rehydration_seconds_total", "Total time spent restoring graphs from cold storage"
+)
+_TIERING_GAUGES = {
+    name: registry.gauge(f"kg_tiering_{name}", description)
+    for name, description in {
+        "hit_rate": "Fraction of existing user graph loads served from the hot tier",
+        "rehydration_seconds_avg": "Average cold storage rehydration latency",
+        "rehydration_seconds_max": "Maximum cold storage rehydration latency",
+    }.items()
+}
+
+
+def _collect_tiering_stats() -> None:
+    stats = tiering_stats.as_dict()
+    for name, counter in _TIERING_COUNTERS.items():
+        counter.set_total(stats[name])
+    for name, gauge in _TIERING_GAUGES.items():
+        gauge.set(stats[name])
+
+
+registry.register_collector(_collect_tiering_stats)
@@ -0,0 +1,114 @@
+"""Consistent-hash placement of user Knowledge Graphs across storage roots.
+
+Each storage root is placed on a hash ring many times (virtual nodes) and a
+user is owned by the first root clockwise from the hash of their ID. Adding
+or removing a root therefore only moves the users whose arc changed owner.
+"""
+
+import bisect
+import hashlib
+import logging
+import shutil
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VIRTUAL_NODES = 128
+
+
+def _hash(key: str) -> int:
+    """Stable 64-bit hash of a key (independent of PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent hash ring mapping keys to nodes."""
+
+    def __init__(self, nodes: Iterable[str], virtual_nodes: int = DEFAULT_VIRTUAL_NODES):
+        """
+        Build the ring.
+
+        Args:
+            nodes: Node identifiers (storage root paths)
+            virtual_nodes: Number of ring positions per node
+        """
+        self.nodes = list(dict.fromkeys(str(n) for n in nodes))
+        if not self.nodes:
+            raise ValueError("HashRing requires at least one node")
+
+        ring = []
+        for node in self.nodes:
+            for i in range(virtual_nodes):
+                ring.append((_hash(f"{node}#{i}"), node))
+        ring.sort()
+        self._hashes = [h for h, _ in ring]
+        self._owners = [n for _, n in ring]
+
+    def get_node(self, key: str) -> str:
+        """Return the node that owns ``key``."""
+        if len(self.nodes) == 1:
+            return self.nodes[0]
+        idx = bisect.bisect(self._hashes, _hash(str(key))) % len(self._hashes)
+        return self._owners[idx]
+
+
+def rebalance_user_graphs(extra_source_roots: Optional[list[Path]] = None, dry_run: bool = False) -> list[tuple[str, Path, Path]]:
+    """
+    Move user graphs so every file lives in the root that owns it.
+
+    Scans the configured storage roots plus any ``extra_source_roots`` (roots
+    that were removed from the configuration) and moves only the files whose
+    owner changed. Run it after changing ``KG_STORAGE_ROOTS`` and before
+    serving traffic with the new layout.
+
+    Args:
+        extra_source_roots: Additional roots to drain
+        dry_run: Only report the moves that would be made
+
+    Returns:
+        List of (user_id, source path, destination path) moves
+    """
+    from app.kg.config import KGConfig
+
+    source_dirs = [KGConfig.get_users_dir_for_root(r) for r in KGConfig.STORAGE_ROOTS]
+    source_dirs += [KGConfig.get_users_dir_for_root(Path(r)) for r in extra_source_roots or []]
+    source_files = [
+        src
+        for users_dir in dict.fromkeys(source_dirs)
+        for src in users_dir.glob(f"{KGConfig.USER_FILE_PREFIX}*{KGConfig.USER_FILE_SUFFIX}")
+    ]
+
+    moves = []
+    for src in source_files:
+        user_id = KGConfig.get_user_id_from_file_path(src)
+        dst = KGConfig.get_user_file_path(user_id)
+        if src.resolve() == dst.resolve():
+            continue
+        if dst.exists():
+            logger.warning(f"Skipping user {user_id}: {dst} already exists (source {src})")
+            continue
+        moves.append((user_id, src, dst))
+        if not dry_run:
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(src), str(dst))
+            logger.info(f"Moved user {user_id} graph {src} -> {dst}")
+
+    logger.info(f"Rebalance {'planned' if dry_run else 'moved'} {len(moves)} user graphs")
+    return moves
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rebalance user knowledge graphs across KG storage roots")
+    parser.add_argument(
+        "--drain", nargs="*", default=[], metavar="ROOT",
+        help="Storage roots removed from KG_STORAGE_ROOTS whose users should be moved out",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only print the planned moves")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    for user_id, src, dst in rebalance_user_graphs([Path(r) for r in args.drain], dry_run=args.dry_run):
+        print(f"{user_id}: {src} -> {dst}")
@@ -1,10 +1,14 @@
 """Storage operations for Knowledge Graph files."""
 
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from rdflib import Graph
 from app.kg.base import KGBase
+from app.kg.cache import graph_cache
 from app.kg.config import KGConfig
+from app.kg.tiering import KGTiering, mark_accessed, record_access, user_graph_lock
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +20,19 @@ class KGStorage(KGBase):
         """Initialize storage handler."""
         super().__init__()
         KGConfig.ensure_directories()
+        self.tiering = KGTiering()
+    
+    def _ensure_hot(self, user_id: str) -> bool:
+        """
+        Make sure a user's graph is in the hot directory, rehydrating it from
+        cold storage if needed.
+        
+        Returns:
+            True if the user has a graph file, False otherwise
+        """
+        if KGConfig.get_user_file_path(user_id).exists():
+            return True
+        return self.tiering.rehydrate_user_graph(user_id)
     
     # ===== User Knowledge Storage =====
     
@@ -30,7 +47,12 @@ class KGStorage(KGBase):
             Graph with user's knowledge and learning paths, or empty graph if file doesn't exist
         """
         file_path = KGConfig.get_user_file_path(user_id)
-        graph = self.load_graph(file_path)
+        if file_path.exists():
+            record_access("hot")
+        elif not self.tiering.rehydrate_user_graph(user_id):
+            record_access("miss")
+        mark_accessed(file_path)
+        graph = self.load_graph(file_path, user_id)
         if graph is None:
             logger.info(f"User graph file not found for user {user_id}, returning empty graph")
             return self.create_graph()
@@ -48,26 +70,65 @@ class KGStorage(KGBase):
         """
         file_path = KGConfig.get_user_file_path(user_id)
         
-        if replace:
-            # Replace mode: just save the new graph
-            self.save_graph(graph, file_path)
-            logger.info(f"Replaced user {user_id} graph with {len(graph)} triples")
-        else:
-            # Merge mode: existing behavior
-            existing_graph = self.load_graph(file_path)
-            if existing_graph is None:
-                # File does not exist or failed to load, create new file
-                self.save_graph(graph, file_path)
-                logger.info(f"Created new user {user_id} graph with {len(graph)} triples")
+        # Never interleave with archiving (or rehydrating) this user's graph
+        with user_graph_lock(user_id):
+            if replace:
+                # Replace mode: just save the new graph, any cold archive is now stale
+                self.save_graph(graph, file_path, user_id)
+                self.tiering.discard_cold_file(user_id)
+                logger.info(f"Replaced user {user_id} graph with {len(graph)} triples")
             else:
-                # File exists, update it
-                merged_graph = existing_graph + graph
-                self.save_graph(merged_graph, file_path)
-                logger.info(f"Updated existing user {user_id} graph with {len(merged_graph)} triples")
+                # Merge mode: existing behavior (bring archived graphs back before merging)
+                self._ensure_hot(user_id)
+                existing_graph = self.load_graph(file_path, user_id)
+                if existing_graph is None:
+                    # File does not exist or failed to load, create new file
+                    self.save_graph(graph, file_path, user_id)
+                    logger.info(f"Created new user {user_id} graph with {len(graph)} triples")
+                else:
+                    # File exists, update it
+                    merged_graph = existing_graph + graph
+                    self.save_graph(merged_graph, file_path, user_id)
+                    logger.info(f"Updated existing user {user_id} graph with {len(merged_graph)} triples")
+
+    @contextmanager
+    def user_graph_transaction(self, user_id: str) -> Iterator[None]:
+        """
+        Restore a user's graph file to its previous content if the block fails.
+        
+        Lets callers tie KG writes to a database transaction: write the graph
+        inside the block, commit the database last, and a failure anywhere in
+        the block undoes the file as well. Writes to the same user's graph by
+        other requests while the block runs are not isolated.
+        
+        Usage:
+            with storage.user_graph_transaction(user_id):
+                storage.save_user_graph(user_id, graph)
+                await db.commit()
+        
+        Args:
+            user_id: User identifier
+        """
+        file_path = KGConfig.get_user_file_path(user_id)
+        self._ensure_hot(user_id)
+        previous = file_path.read_bytes() if file_path.exists() else None
+        try:
+            yield
+        except BaseException:
+            with user_graph_lock(user_id):
+                if previous is None:
+                    file_path.unlink(missing_ok=True)
+                else:
+                    tmp_path = file_path.with_name(file_path.name + ".rollback")
+                    tmp_path.write_bytes(previous)
+                    os.replace(tmp_path, file_path)
+                graph_cache.invalidate(file_path)
+            logger.warning(f"Rolled back user {user_id} graph after a failed transaction")
+            raise
 
     def user_graph_exists(self, user_id: str) -> bool:
         """
-        Check if a user's graph file exists.
+        Check if a user's graph file exists in either the hot or cold tier.
         
         Args:
             user_id: User identifier
@@ -75,10 +136,48 @@ class KGStorage(KGBase):
         Returns:
             True if file exists, False otherwise
         """
-        return KGConfig.get_user_file_path(user_id).exists()
+        return KGConfig.get_user_file_path(user_id).exists() or self.tiering.is_cold(user_id)
+    
+    # ===== Concept Catalog Storage =====
+    
+    def load_concepts(self) -> Graph:
+        """
+        Load the shared concept catalog.
+        
+        Returns:
+            Graph with all concepts, or empty graph if the catalog doesn't exist yet
+        """
+        graph = self.load_graph(KGConfig.CONCEPTS_FILE)
+        if graph is None:
+            logger.info("Concept catalog not found, returning empty graph")
+            return self.create_graph()
+        return graph
+    
+    def save_concepts(self, graph: Graph) -> None:
+        """
+        Save the shared concept catalog (replaces the existing file).
+        
+        Args:
+            graph: Graph containing all concepts
+        """
+        self.save_graph(graph, KGConfig.CONCEPTS_FILE)
+        logger.info(f"Saved concept catalog with {len(graph)} triples")
     
     # ===== Ontology Storage =====
     
+    def load_base_ontology(self) -> Graph:
+        """
+        Load the Learnora ontology (KGConfig.ONTOLOGY).
+        
+        Returns:
+            Graph with the ontology, or empty graph if the file doesn't exist
+        """
+        graph = self.load_graph(KGConfig.ONTOLOGY)
+        if graph is None:
+            logger.info("Ontology file not found, returning empty graph")
+            return self.create_graph()
+        return graph
+    
     def load_ontology(self, ontology_name: str) -> Graph:
         """
         Load an ontology file.
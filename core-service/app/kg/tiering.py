@@ -0,0 +1,363 @@
+"""Cold storage tiering for inactive user Knowledge Graphs.
+
+User graphs that have not been read or modified for a configurable number of
+days are moved from the hot users directory into compressed archives in the
+cold directory. ``KGStorage`` rehydrates an archived graph back into the hot
+directory the first time it is accessed again.
+
+Reads are recorded in the hot file's access time (``mark_accessed``), which
+leaves the modification time, and so the graph cache, untouched. Archiving,
+rehydration and saves of one user are serialized within the process by
+``user_graph_lock``; a write from another process during archiving is
+detected because the archiver moves the hot file aside before deleting it.
+"""
+
+import asyncio
+import gzip
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from app.config import settings
+from app.kg.config import KGConfig
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# File suffix appended to the Turtle file name for each compression codec
+COMPRESSION_SUFFIXES = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+SECONDS_PER_DAY = 86400
+
+# Reads refresh the recorded access time at most this often per graph
+ACCESS_TOUCH_INTERVAL_SECONDS = 3600
+
+
+@dataclass
+class TieringStats:
+    """Process-wide counters for user graph access across storage tiers."""
+
+    hot_hits: int = 0  # Loads served directly from the hot directory
+    rehydrations: int = 0  # Loads that had to restore a cold archive first
+    misses: int = 0  # Loads for users with no graph in either tier
+    archived: int = 0  # Graphs moved to cold storage by the tiering job
+    rehydration_seconds_total: float = 0.0
+    rehydration_seconds_max: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of existing graphs served from the hot tier."""
+        total = self.hot_hits + self.rehydrations
+        return self.hot_hits / total if total else 1.0
+
+    @property
+    def rehydration_seconds_avg(self) -> float:
+        """Average time spent restoring a graph from cold storage."""
+        return self.rehydration_seconds_total / self.rehydrations if self.rehydrations else 0.0
+
+    def as_dict(self) -> dict:
+        """Return counters plus derived hit rate and average latency."""
+        data = asdict(self)
+        data["hit_rate"] = self.hit_rate
+        data["rehydration_seconds_avg"] = self.rehydration_seconds_avg
+        return data
+
+
+_stats_lock = threading.Lock()
+tiering_stats = TieringStats()
+
+# Striped locks serializing archiving, rehydration and saves of the same user
+# within this process (reentrant: a merge save rehydrates under the lock)
+_USER_GRAPH_LOCKS = [threading.RLock() for _ in range(64)]
+
+
+def user_graph_lock(user_id: str) -> threading.RLock:
+    """Lock guarding tier transitions and writes of one user's hot graph file."""
+    return _USER_GRAPH_LOCKS[hash(user_id) % len(_USER_GRAPH_LOCKS)]
+
+
+def mark_accessed(file_path: Path) -> None:
+    """
+    Record a read of a hot graph file in its access time.
+
+    The modification time is kept, so cached parses stay valid. Updates are
+    throttled to one per ``ACCESS_TOUCH_INTERVAL_SECONDS``.
+    """
+    try:
+        stat = file_path.stat()
+        now_ns = time.time_ns()
+        if now_ns - stat.st_atime_ns >= ACCESS_TOUCH_INTERVAL_SECONDS * 1_000_000_000:
+            os.utime(file_path, ns=(now_ns, stat.st_mtime_ns))
+    except FileNotFoundError:
+        pass
+
+
+def last_access(file_path: Path) -> float:
+    """Latest of the recorded read and the last write of a hot graph file."""
+    stat = file_path.stat()
+    return max(stat.st_atime, stat.st_mtime)
+
+
+def _signature(file_path: Path) -> tuple[int, int]:
+    stat = file_path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def record_access(tier: str, seconds: float = 0.0) -> None:
+    """
+    Record a user graph access.
+
+    Args:
+        tier: 'hot', 'cold' (rehydrated) or 'miss'
+        seconds: Rehydration latency, only used for 'cold'
+    """
+    with _stats_lock:
+        if tier == "hot":
+            tiering_stats.hot_hits += 1
+        elif tier == "cold":
+            tiering_stats.rehydrations += 1
+            tiering_stats.rehydration_seconds_total += seconds
+            tiering_stats.rehydration_seconds_max = max(tiering_stats.rehydration_seconds_max, seconds)
+        else:
+            tiering_stats.misses += 1
+
+
+class KGTiering:
+    """Moves user graphs between the hot directory and compressed cold archives."""
+
+    def __init__(self, compression: Optional[str] = None):
+        """
+        Initialize the tiering handler.
+
+        Args:
+            compression: 'gzip' or 'zstd' for new archives (default: KGConfig.COLD_COMPRESSION).
+                Existing archives are always readable regardless of this setting.
+        """
+        compression = compression or KGConfig.COLD_COMPRESSION
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unsupported cold storage compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, falling back to gzip for cold storage")
+            compression = "gzip"
+        self.compression = compression
+
+    # ===== Codec helpers =====
+
+    def _open_writer(self, file_path: Path, compression: str) -> BinaryIO:
+        if compression == "zstd":
+            return zstandard.ZstdCompressor().stream_writer(open(file_path, "wb"), closefd=True)
+        return gzip.open(file_path, "wb")
+
+    def _open_reader(self, file_path: Path, compression: str) -> BinaryIO:
+        if compression == "zstd":
+            if zstandard is None:
+                raise RuntimeError(f"Cannot read {file_path}: zstandard is not installed")
+            return zstandard.ZstdDecompressor().stream_reader(open(file_path, "rb"), closefd=True)
+        return gzip.open(file_path, "rb")
+
+    # ===== Lookup =====
+
+    def find_cold_file(self, user_id: str) -> Optional[tuple[Path, str]]:
+        """
+        Find an existing cold archive for a user.
+
+        Returns:
+            Tuple of (archive path, compression) or None if the user has no archive
+        """
+        for compression, suffix in COMPRESSION_SUFFIXES.items():
+            cold_path = KGConfig.get_user_cold_file_path(user_id, suffix)
+            if cold_path.exists():
+                return cold_path, compression
+        return None
+
+    def is_cold(self, user_id: str) -> bool:
+        """Check whether a user's graph currently lives in cold storage."""
+        return self.find_cold_file(user_id) is not None
+
+    def read_cold_file(self, user_id: str) -> Optional[bytes]:
+        """Read a user's archived graph without rehydrating it."""
+        found = self.find_cold_file(user_id)
+        if found is None:
+            return None
+        return self.read_cold_path(*found)
+
+    def read_cold_path(self, cold_path: Path, compression: str) -> bytes:
+        """Read and decompress an archive found by ``find_cold_file``."""
+        with self._open_reader(cold_path, compression) as src:
+            return src.read()
+
+    def discard_cold_file(self, user_id: str) -> None:
+        """Remove any cold archive for a user (used when the hot graph is replaced)."""
+        found = self.find_cold_file(user_id)
+        if found is not None:
+            found[0].unlink(missing_ok=True)
+
+    # ===== Tier transitions =====
+
+    def archive_user_graph(self, user_id: str) -> Optional[Path]:
+        """
+        Compress a user's hot graph into cold storage and remove the hot file.
+
+        Runs under ``user_graph_lock``. Before deleting, the hot file is renamed
+        aside and compared with what was compressed; if another process wrote
+        it meanwhile, it is moved back and the archive is dropped.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Path of the new archive, or None if nothing was archived
+        """
+        hot_path = KGConfig.get_user_file_path(user_id)
+        with user_graph_lock(user_id):
+            try:
+                signature = _signature(hot_path)
+            except FileNotFoundError:
+                return None
+
+            cold_path = KGConfig.get_user_cold_file_path(user_id, COMPRESSION_SUFFIXES[self.compression])
+            cold_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cold_path.with_name(f"{cold_path.name}.{os.getpid()}.tmp")
+
+            with open(hot_path, "rb") as src, self._open_writer(tmp_path, self.compression) as dst:
+                shutil.copyfileobj(src, dst)
+
+            # Take the hot file out of reach of other writers, then check it is what we compressed
+            aside_path = hot_path.with_name(f"{hot_path.name}.{os.getpid()}.archiving")
+            try:
+                hot_path.replace(aside_path)
+            except FileNotFoundError:
+                tmp_path.unlink(missing_ok=True)
+                return None
+            if _signature(aside_path) != signature:
+                # Graph was written while we were compressing it, keep it hot
+                aside_path.replace(hot_path)
+                tmp_path.unlink(missing_ok=True)
+                logger.info(f"User {user_id} graph changed during archiving, leaving it hot")
+                return None
+
+            self.discard_cold_file(user_id)
+            tmp_path.replace(cold_path)
+            aside_path.unlink()
+
+        with _stats_lock:
+            tiering_stats.archived += 1
+        logger.info(f"Archived user {user_id} graph to {cold_path}")
+        return cold_path
+
+    def rehydrate_user_graph(self, user_id: str) -> bool:
+        """
+        Restore a user's graph from cold storage into the hot directory.
+
+        Concurrent loads of the same user are serialized within the process; a
+        load that finds the archive already restored by another process (hot
+        file present, archive gone) counts as restored.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            True if the graph is hot again, False if the user has no archive
+        """
+        hot_path = KGConfig.get_user_file_path(user_id)
+        with user_graph_lock(user_id):
+            if hot_path.exists():
+                return True
+            found = self.find_cold_file(user_id)
+            if found is None:
+                return False
+            cold_path, compression = found
+
+            start = time.perf_counter()
+            hot_path.parent.mkdir(parents=True, exist_ok=True)
+            # Per-process temp file, so workers restoring the same user never share one
+            tmp_path = hot_path.with_name(f"{hot_path.name}.{os.getpid()}.tmp")
+
+            try:
+                with self._open_reader(cold_path, compression) as src, open(tmp_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+            except FileNotFoundError:
+                # Another process restored and removed the archive first
+                tmp_path.unlink(missing_ok=True)
+                return hot_path.exists()
+            tmp_path.replace(hot_path)
+            cold_path.unlink(missing_ok=True)
+
+        elapsed = time.perf_counter() - start
+        record_access("cold", elapsed)
+        logger.info(
+            f"Rehydrated user {user_id} graph from cold storage in {elapsed * 1000:.1f} ms "
+            f"(hot hit rate {tiering_stats.hit_rate:.2%})"
+        )
+        return True
+
+    def archive_idle_user_graphs(self, max_idle_days: Optional[int] = None, now: Optional[float] = None) -> list[str]:
+        """
+        Archive every hot user graph that has not been read or modified for ``max_idle_days``.
+
+        Args:
+            max_idle_days: Idle threshold in days (default: settings.KG_TIERING_IDLE_DAYS)
+            now: Reference timestamp (default: current time)
+
+        Returns:
+            List of user IDs whose graphs were archived
+        """
+        max_idle_days = settings.KG_TIERING_IDLE_DAYS if max_idle_days is None else max_idle_days
+        cutoff = (now or time.time()) - max_idle_days * SECONDS_PER_DAY
+
+        archived = []
+        for hot_path in list(KGConfig.iter_user_files()):
+            try:
+                if last_access(hot_path) > cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            user_id = KGConfig.get_user_id_from_file_path(hot_path)
+            try:
+                if self.archive_user_graph(user_id) is not None:
+                    archived.append(user_id)
+            except Exception as e:
+                logger.error(f"Failed to archive user {user_id} graph: {str(e)}")
+
+        logger.info(f"Tiering pass archived {len(archived)} user graphs idle for {max_idle_days}+ days")
+        return archived
+
+
+async def run_tiering_job(interval_seconds: Optional[int] = None) -> None:
+    """
+    Periodically archive idle user graphs until cancelled.
+
+    Intended to be started as a background task from the application lifespan.
+    """
+    interval_seconds = interval_seconds or settings.KG_TIERING_INTERVAL_SECONDS
+    tiering = KGTiering()
+    while True:
+        try:
+            await asyncio.to_thread(tiering.archive_idle_user_graphs)
+        except Exception as e:
+            logger.error(f"Tiering job failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Archive idle user knowledge graphs to cold storage")
+    parser.add_argument("--idle-days", type=int, default=None, help="Idle threshold in days")
+    parser.add_argument("--compression", choices=sorted(COMPRESSION_SUFFIXES), default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    KGTiering(args.compression).archive_idle_user_graphs(args.idle_days)
@@ -0,0 +1,115 @@
+"""Startup warmup of the in-process KG cache.
+
+Parses the ontology, the concept catalog and the most recently active user
+graphs into ``graph_cache`` in the background, so the first requests after a
+deploy do not pay a cold Turtle parse.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from app.config import settings
+from app.kg.cache import graph_cache
+from app.kg.config import KGConfig
+from app.kg.storage import KGStorage
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """Progress of the warmup task, reported by the readiness endpoint."""
+
+    def __init__(self):
+        self.status = "disabled"  # disabled | running | complete | partial | failed
+        self.users_loaded = 0
+        self.load_failures = 0
+        self.seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """The app is ready once warmup is not running (a failed warmup does not block traffic)."""
+        return self.status != "running"
+
+    def as_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "users_loaded": self.users_loaded,
+            "load_failures": self.load_failures,
+            "seconds": self.seconds,
+        }
+
+
+warmup_state = WarmupState()
+
+
+def most_recent_user_ids(limit: int) -> list[str]:
+    """Return the users whose hot graph files were modified most recently."""
+    files = []
+    for file_path in KGConfig.iter_user_files():
+        try:
+            files.append((file_path.stat().st_mtime, file_path))
+        except FileNotFoundError:
+            continue
+    files.sort(reverse=True)
+    return [KGConfig.get_user_id_from_file_path(p) for _, p in files[:limit]]
+
+
+async def warm_kg_cache(user_limit: Optional[int] = None, concurrency: Optional[int] = None) -> None:
+    """
+    Preload global KG structures and hot user graphs into the cache.
+
+    Each graph is loaded independently: a file that fails to parse is logged
+    and counted, and the remaining graphs are still warmed (status "partial").
+
+    Args:
+        user_limit: Number of recently active user graphs to load (default: settings.KG_WARMUP_USER_COUNT)
+        concurrency: Maximum parallel loads (default: settings.KG_WARMUP_CONCURRENCY)
+    """
+    user_limit = settings.KG_WARMUP_USER_COUNT if user_limit is None else user_limit
+    concurrency = concurrency or settings.KG_WARMUP_CONCURRENCY
+    storage = KGStorage()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    if graph_cache.max_graphs <= 0:
+        logger.warning("KG cache warmup skipped: the KG cache is disabled (KG_CACHE_MAX_GRAPHS=0)")
+        warmup_state.status = "disabled"
+        return
+
+    warmup_state.status = "running"
+    warmup_state.users_loaded = 0
+    warmup_state.load_failures = 0
+    start = time.perf_counter()
+
+    async def load(name: str, loader, *args) -> bool:
+        try:
+            await asyncio.to_thread(loader, *args)
+            return True
+        except Exception as e:
+            logger.error(f"KG cache warmup could not load {name}: {str(e)}")
+            warmup_state.load_failures += 1
+            return False
+
+    async def load_user(user_id: str) -> None:
+        async with semaphore:
+            if await load(f"user graph {user_id}", storage.load_user_graph, user_id):
+                warmup_state.users_loaded += 1
+
+    try:
+        await asyncio.gather(
+            load("ontology", storage.load_base_ontology),
+            load("concept catalog", storage.load_concepts),
+        )
+        user_ids = await asyncio.to_thread(most_recent_user_ids, user_limit)
+        await asyncio.gather(*(load_user(user_id) for user_id in user_ids))
+        warmup_state.status = "partial" if warmup_state.load_failures else "complete"
+    except Exception as e:
+        logger.error(f"KG cache warmup failed: {str(e)}")
+        warmup_state.status = "failed"
+    finally:
+        warmup_state.seconds = time.perf_counter() - start
+        logger.info(
+            f"KG cache warmup {warmup_state.status}: {warmup_state.users_loaded} user graphs "
+            f"in {warmup_state.seconds:.2f}s"
+        )
@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 # Load environment variables from .env file BEFORE importing modules that need them
@@ -13,6 +15,13 @@ from app.features.concept.router import router as concept_router
 from app.features.users.router import router as users_router
 from app.features.agent.router import router as agent_router
 from app.database import init_db
+from app.database.connection import engine_kwargs, describe_engine_config
+from app.database.instrumentation import SQLInstrumentationMiddleware
+from app.features.users.auth import JWT_LIFETIME_SECONDS
+from app.features.users.revocation import refresh_revoked_users, run_revocation_refresh
+from app.kg.tiering import run_tiering_job
+from app.kg.warmup import warm_kg_cache, warmup_state
+from app.util.metrics import registry as metrics_registry
 
 from app.features.content_discovery.router import router as content_discovery_router
 from app.features.preference.preference_router import router as preferences_router
@@ -31,10 +40,28 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"Starting {settings.APP_NAME} v{settings.VERSION}")
     logger.info(f"Environment: {settings.APP_ENV}")
+    logger.info(f"Database pool: {describe_engine_config(engine_kwargs)}")
     await init_db()
+    revocation_task = None
+    if settings.AUTH_STATELESS_CLAIMS:
+        revoked = await refresh_revoked_users(JWT_LIFETIME_SECONDS)
+        logger.info(f"Stateless JWT claims enabled ({revoked} users on the revocation list)")
+        revocation_task = asyncio.create_task(run_revocation_refresh(JWT_LIFETIME_SECONDS))
+    tiering_task = None
+    if settings.KG_TIERING_ENABLED:
+        logger.info(f"Starting KG cold storage tiering (idle after {settings.KG_TIERING_IDLE_DAYS} days)")
+        tiering_task = asyncio.create_task(run_tiering_job())
+    warmup_task = None
+    if settings.KG_WARMUP_ENABLED:
+        # Runs in the background; /ready reports 503 until it finishes
+        warmup_state.status = "running"
+        warmup_task = asyncio.create_task(warm_kg_cache())
     yield
     # Shutdown
     logger.info("Shutting down application")
+    for task in (revocation_task, tiering_task, warmup_task):
+        if task is not None:
+            task.cancel()
 
 
 # Initialize FastAPI app with async lifespan
@@ -46,6 +73,17 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Per-request SQL query stats and N+1 detection
+app.add_middleware(
+    SQLInstrumentationMiddleware,
+    expose_headers=(
+        settings.SQL_DEBUG_HEADERS
+        if settings.SQL_DEBUG_HEADERS is not None
+        else settings.APP_ENV != "production"
+    ),
+    n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+)
+
 # TODO: Make sure to configure CORS origins properly in production
 # Add CORS middleware
 app.add_middleware(
@@ -111,4 +149,17 @@ def health_check():
         "status": "healthy",
         "environment": settings.APP_ENV,
         "version": settings.VERSION
-    }
\ No newline at end of file
+    }
+
+
+@app.get(f"{settings.API_V1_PREFIX}/ready")
+def readiness_check():
+    """Readiness probe: 503 until the optional KG cache warmup has finished."""
+    content = {"ready": warmup_state.ready, "kg_warmup": warmup_state.as_dict()}
+    return JSONResponse(content, status_code=200 if warmup_state.ready else 503)
+
+
+@app.get(f"{settings.API_V1_PREFIX}/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Process metrics in the Prometheus text exposition format."""
+    return metrics_registry.render()
@@ -0,0 +1,150 @@
+"""Shared registry of chat model clients.
+
+Features ask for a model by role (``chat_models.get("mcq")``) instead of
+constructing their own clients at import time. Clients are created on first
+use, one per (provider, model name), so every caller of the same model shares
+its HTTP connection pool; variants with other parameters (e.g. temperature)
+are shallow copies that reuse the underlying client. Model names per role come
+from ``settings.LLM_MODELS``.
+
+The ``fake`` provider (``LLM_PROVIDER=fake``) answers offline and
+deterministically, for tests and local runs without an API key.
+"""
+
+import logging
+import threading
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable, RunnableLambda
+from pydantic import PrivateAttr
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+FAKE_PROVIDER = "fake"
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Offline chat model.
+
+    Replies with ``responses`` in turn, or echoes the last message when none
+    are scripted. Streams one chunk per whitespace-separated token. Structured
+    output parses the reply as JSON into the requested schema.
+    """
+
+    model: str = "fake"
+    responses: list[str] = []
+    _calls: int = PrivateAttr(default=0)
+
+    @property
+    def _llm_type(self) -> str:
+        return FAKE_PROVIDER
+
+    def _reply(self, messages: list[BaseMessage]) -> str:
+        if self.responses:
+            text = self.responses[self._calls % len(self.responses)]
+        else:
+            text = f"[{self.model}] {messages[-1].content if messages else ''}"
+        self._calls += 1
+        return text
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        for token in self._tokens(self._reply(messages)):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        for token in self._tokens(self._reply(messages)):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    @staticmethod
+    def _tokens(text: str) -> list[str]:
+        words = text.split(" ")
+        return [word + " " for word in words[:-1]] + words[-1:]
+
+    def with_structured_output(self, schema, **kwargs) -> Runnable:
+        return self | RunnableLambda(lambda message: schema.model_validate_json(message.content))
+
+
+class ChatModelRegistry:
+    """Lazily created, shared chat model clients."""
+
+    def __init__(self):
+        self._clients: dict[tuple, BaseChatModel] = {}
+        self._overrides: dict[str, BaseChatModel] = {}
+        self._lock = threading.Lock()
+
+    def get(self, role: str, **params: Any) -> BaseChatModel:
+        """
+        Return the chat model configured for ``role``.
+
+        Args:
+            role: Feature role, looked up in settings.LLM_MODELS (default: settings.LLM_DEFAULT_MODEL)
+            **params: Model parameters such as temperature
+
+        Returns:
+            The shared client (or a parameter variant of it)
+        """
+        if role in self._overrides:
+            return self._overrides[role]
+        return self.get_named(settings.LLM_MODELS.get(role, settings.LLM_DEFAULT_MODEL), **params)
+
+    def model_id(self, role: str) -> str:
+        """Return "provider:model" of the model serving ``role`` (used in cache keys)."""
+        if role in self._overrides:
+            model = self._overrides[role]
+            return f"pinned:{getattr(model, 'model', type(model).__name__)}"
+        return f"{settings.LLM_PROVIDER}:{settings.LLM_MODELS.get(role, settings.LLM_DEFAULT_MODEL)}"
+
+    def get_named(self, model_name: str, provider: Optional[str] = None, **params: Any) -> BaseChatModel:
+        """Return the shared client for an explicit model name (and parameter variant)."""
+        provider = provider or settings.LLM_PROVIDER
+        base_key = (provider, model_name)
+        key = base_key + tuple(sorted(params.items()))
+        with self._lock:
+            model = self._clients.get(key)
+            if model is not None:
+                return model
+            base = self._clients.get(base_key)
+            if base is None:
+                base = self._create(provider, model_name)
+                self._clients[base_key] = base
+            # Shallow copy: the variant keeps using the base client's connection pool
+            model = base.model_copy(update=params) if params else base
+            self._clients[key] = model
+            return model
+
+    @staticmethod
+    def _create(provider: str, model_name: str) -> BaseChatModel:
+        logger.info(f"Creating chat model client {provider}:{model_name}")
+        if provider == FAKE_PROVIDER:
+            return FakeChatModel(model=model_name)
+        return init_chat_model(model_name, model_provider=provider)
+
+    def set(self, role: str, model: BaseChatModel) -> None:
+        """Pin a model instance for ``role`` (e.g. a FakeChatModel with scripted responses in tests)."""
+        self._overrides[role] = model
+
+    def clear(self) -> None:
+        """Drop all clients and pinned models."""
+        with self._lock:
+            self._clients.clear()
+            self._overrides.clear()
+
+
+# Process-wide registry
+chat_models = ChatModelRegistry()
@@ -0,0 +1,35 @@
+"""Shared fixtures for learning path tests that need a real database."""
+
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.base import Base
+from app.features.users.models import User
+import app.features.learning_path.models  # noqa: F401  (register tables)
+import app.features.preference.preferences  # noqa: F401  (register tables)
+
+
+@pytest_asyncio.fixture
+async def sqlite_engine():
+    """In-memory SQLite engine with all tables created."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def sqlite_db(sqlite_engine):
+    """Session bound to the in-memory SQLite engine."""
+    async with async_sessionmaker(sqlite_engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def db_user(sqlite_db):
+    """A persisted user owning the learning paths under test."""
+    user = User(email="learner@example.com", hashed_password="x")
+    sqlite_db.add(user)
+    await sqlite_db.commit()
+    return user
@@ -0,0 +1,111 @@
+"""Tests for fetching several learning paths with KG data in one request."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.config import settings
+from app.database import get_db, get_read_db
+from app.features.learning_path import crud
+from app.features.learning_path.router import router
+from app.features.learning_path.schemas import LearningPathBatchGetRequest, LearningPathCreate
+from app.features.learning_path.service import LearningPathService
+from app.features.users.users import current_active_user_read
+from app.kg.cache import graph_cache
+from app.kg.config import KGConfig
+
+
+@pytest.fixture(autouse=True)
+def isolated_kg(tmp_path, monkeypatch):
+    """Point user graphs at a temporary directory."""
+    monkeypatch.setattr(KGConfig, "USERS_DIR", tmp_path / "users")
+    monkeypatch.setattr(KGConfig, "COLD_USERS_DIR", tmp_path / "cold" / "users")
+    KGConfig.USERS_DIR.mkdir(parents=True)
+    graph_cache.clear()
+    yield
+    graph_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_batch_get_loads_user_graph_once(sqlite_db, db_user, monkeypatch):
+    """Owned paths come back in request order with KG data; others are reported missing."""
+    service = LearningPathService()
+    python = await service.parse_and_save_learning_path(
+        sqlite_db, [{"concept": "Loops", "prerequisites": ["Variables"]}, {"concept": "Variables"}],
+        "Python", "Automate", db_user)
+    sql = await service.parse_and_save_learning_path(
+        sqlite_db, [{"concept": "Joins"}], "SQL", "Query", db_user)
+    foreign = await crud.create_learning_path(sqlite_db, LearningPathCreate(topic="Other", user_id=db_user.id + 1))
+
+    loads = []
+    original_load = service.storage.load_user_graph
+    monkeypatch.setattr(service.storage, "load_user_graph",
+                        lambda user_id: loads.append(user_id) or original_load(user_id))
+
+    items, missing = await service.batch_get_learning_paths(
+        sqlite_db, [sql.id, foreign.id, python.id, 9999], db_user)
+
+    assert [lp.id for lp in items] == [sql.id, python.id]
+    assert missing == [foreign.id, 9999]
+    assert loads == [str(db_user.id)]
+    python_ids = {node["@id"] for node in items[1].kg_data}
+    assert python.graph_uri in python_ids
+    assert any(node_id.endswith("variables") for node_id in python_ids)
+    assert python.graph_uri not in {node["@id"] for node in items[0].kg_data}
+
+
+@pytest.mark.asyncio
+async def test_batch_get_without_kg_skips_graph(sqlite_db, db_user, monkeypatch):
+    """With include_kg false, the user graph is not loaded."""
+    service = LearningPathService()
+    lp = await crud.create_learning_path(sqlite_db, LearningPathCreate(topic="Python", user_id=db_user.id))
+    monkeypatch.setattr(service.storage, "load_user_graph", lambda user_id: pytest.fail("graph loaded"))
+
+    items, missing = await service.batch_get_learning_paths(sqlite_db, [lp.id], db_user, include_kg=False)
+
+    assert [i.id for i in items] == [lp.id]
+    assert missing == []
+
+
+def test_extract_shared_prerequisites_is_linear():
+    """Diamond-shaped prerequisites are visited once per path, not once per route to them."""
+    service = LearningPathService()
+    ont = service.kg_base.ONT
+    graph = service.kg_base.create_graph()
+    path_uri = ont.lp_layers
+    layers = [[ont[f"c_{layer}_{i}"] for i in range(2)] for layer in range(40)]
+    for upper, lower in zip(layers, layers[1:]):
+        for concept in upper:
+            for prerequisite in lower:
+                graph.add((concept, ont.hasPrerequisite, prerequisite))
+    for concept in layers[0]:
+        graph.add((path_uri, ont.includesConcept, concept))
+
+    result = service.extract_learning_path_graphs(graph, [path_uri])[path_uri]
+
+    node_ids = {node["@id"] for node in result}
+    assert {str(c) for layer in layers[:-1] for c in layer} <= node_ids
+
+
+def test_batch_get_route_uses_read_session():
+    """Batch get only reads, so it gets the replica-routed, never-committed session."""
+    route = next(r for r in router.routes if r.path == "/batch-get")
+    dependencies = {d.call for d in route.dependant.dependencies}
+    assert get_read_db in dependencies
+    assert get_db not in dependencies
+
+
+def test_batch_get_ids_are_bounded_and_deduplicated():
+    """Duplicate ids collapse in request order; too many (or no) ids get 422."""
+    assert LearningPathBatchGetRequest(ids=[3, 1, 3, 2, 1]).ids == [3, 1, 2]
+    with pytest.raises(ValidationError):
+        LearningPathBatchGetRequest(ids=[])
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_read_db] = lambda: None
+    app.dependency_overrides[current_active_user_read] = lambda: None
+    ids = list(range(settings.LEARNING_PATH_BATCH_GET_MAX_IDS + 1))
+
+    assert TestClient(app).post("/batch-get", json={"ids": ids}).status_code == 422
@@ -0,0 +1,91 @@
+"""Tests for bulk learning path import."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import get_db
+from app.features.learning_path import service as service_module
+from app.features.learning_path.router import router
+from app.features.users.users import current_active_user
+from app.features.learning_path.models import LearningPath
+from app.features.learning_path.schemas import LearningPathBulkItem
+from app.features.learning_path.service import LearningPathService
+from app.kg.cache import graph_cache
+from app.kg.config import KGConfig
+
+
+@pytest.fixture(autouse=True)
+def isolated_kg(tmp_path, monkeypatch):
+    """Point user graphs at a temporary directory."""
+    monkeypatch.setattr(KGConfig, "USERS_DIR", tmp_path / "users")
+    monkeypatch.setattr(KGConfig, "COLD_USERS_DIR", tmp_path / "cold" / "users")
+    KGConfig.USERS_DIR.mkdir(parents=True)
+    graph_cache.clear()
+    yield
+    graph_cache.clear()
+
+
+def _item(topic, user_id=None):
+    return LearningPathBulkItem(
+        topic=topic,
+        goal=f"Learn {topic}",
+        concepts=[{"concept": f"{topic} Basics"}, {"concept": f"{topic} Advanced", "prerequisites": [f"{topic} Basics"]}],
+        user_id=user_id,
+    )
+
+
+async def _collect(service, db, items, user):
+    return [result async for result in service.bulk_create_learning_paths(db, items, user)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_writes_each_user_graph_once_per_batch(sqlite_db, db_user, monkeypatch):
+    """Rows are created in batches with one KG write per user per batch."""
+    monkeypatch.setattr(service_module, "BULK_IMPORT_BATCH_SIZE", 2)
+    service = LearningPathService()
+    saves = []
+    original_save = service.storage.save_user_graph
+    monkeypatch.setattr(service.storage, "save_user_graph",
+                        lambda user_id, graph: saves.append(user_id) or original_save(user_id, graph))
+    user_id = str(db_user.id)
+
+    results = await _collect(service, sqlite_db, [_item("Python"), _item("SQL"), _item("Rust")], db_user)
+
+    assert [r["status"] for r in results] == ["created"] * 3
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert saves == [user_id, user_id]
+    rows = (await sqlite_db.execute(select(LearningPath).order_by(LearningPath.id))).scalars().all()
+    assert [row.graph_uri for row in rows] == [r["graph_uri"] for r in results]
+    user_graph = service.storage.load_user_graph(user_id)
+    assert len(list(user_graph.subjects(service.kg_base.RDF.type, service.kg_base.ONT.LearningPath))) == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_rejects_items_for_other_users(sqlite_db, db_user):
+    """Non-superusers can only import for themselves; other items still succeed."""
+    service = LearningPathService()
+
+    results = await _collect(service, sqlite_db, [_item("Python"), _item("SQL", user_id=db_user.id + 1)], db_user)
+
+    assert results[0]["status"] == "created"
+    assert results[1]["status"] == "error"
+    assert "another user" in results[1]["detail"]
+
+
+def test_bulk_import_rejects_oversized_requests():
+    """Requests beyond LEARNING_PATH_BULK_MAX_ITEMS (or empty ones) get 422 before any work."""
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[current_active_user] = lambda: None
+    client = TestClient(app)
+    item = _item("Python").model_dump()
+
+    too_many = client.post("/bulk", json={"items": [item] * (settings.LEARNING_PATH_BULK_MAX_ITEMS + 1)})
+    empty = client.post("/bulk", json={"items": []})
+
+    assert too_many.status_code == 422
+    assert empty.status_code == 422
@@ -0,0 +1,82 @@
+"""Tests for single-transaction learning path creation."""
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.features.learning_path.models import LearningPath
+from app.features.learning_path.service import LearningPathService
+from app.kg.cache import graph_cache
+from app.kg.config import KGConfig
+
+CONCEPTS = [
+    {"concept": "Variables", "prerequisites": []},
+    {"concept": "Loops", "prerequisites": ["Variables"]},
+]
+
+
+@pytest.fixture(autouse=True)
+def isolated_kg(tmp_path, monkeypatch):
+    """Point user graphs at a temporary directory."""
+    monkeypatch.setattr(KGConfig, "USERS_DIR", tmp_path / "users")
+    monkeypatch.setattr(KGConfig, "COLD_USERS_DIR", tmp_path / "cold" / "users")
+    KGConfig.USERS_DIR.mkdir(parents=True)
+    graph_cache.clear()
+    yield
+    graph_cache.clear()
+
+
+async def _row_count(db):
+    return (await db.execute(select(func.count()).select_from(LearningPath))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_creates_row_and_graph_with_one_commit(sqlite_db, sqlite_engine, db_user):
+    """The row gets its graph URI and the KG is written within a single transaction."""
+    service = LearningPathService()
+    commits = []
+    event.listen(sqlite_engine.sync_engine, "commit", lambda conn: commits.append(conn))
+
+    lp = await service.parse_and_save_learning_path(sqlite_db, CONCEPTS, "Python", "Automate", db_user)
+
+    assert len(commits) == 1
+    assert lp.id is not None and lp.created_at is not None
+    assert lp.graph_uri.endswith(str(lp.id))
+    user_graph = service.storage.load_user_graph(str(db_user.id))
+    assert len(user_graph) > 0
+
+
+@pytest.mark.asyncio
+async def test_kg_failure_leaves_no_row(sqlite_db, db_user, monkeypatch):
+    """If the KG write fails, the flushed row is rolled back."""
+    service = LearningPathService()
+    user_id = str(db_user.id)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(service.storage, "save_user_graph", fail)
+    with pytest.raises(OSError):
+        await service.parse_and_save_learning_path(sqlite_db, CONCEPTS, "Python", "Automate", db_user)
+
+    assert await _row_count(sqlite_db) == 0
+    assert not KGConfig.get_user_file_path(user_id).exists()
+
+
+@pytest.mark.asyncio
+async def test_commit_failure_restores_previous_graph(sqlite_db, db_user, monkeypatch):
+    """If the commit fails after the KG write, the user's graph file is restored."""
+    service = LearningPathService()
+    await service.parse_and_save_learning_path(sqlite_db, CONCEPTS, "Python", "Automate", db_user)
+    file_path = KGConfig.get_user_file_path(str(db_user.id))
+    before = file_path.read_bytes()
+
+    async def fail_commit():
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(sqlite_db, "commit", fail_commit)
+    with pytest.raises(RuntimeError):
+        await service.parse_and_save_learning_path(
+            sqlite_db, [{"concept": "Recursion", "prerequisites": []}], "Algorithms", "Solve", db_user)
+
+    assert file_path.read_bytes() == before
+    assert await _row_count(sqlite_db) == 1
@@ -331,26 +331,6 @@ class TestUpdateOperations:
         assert result is None
         mock_db.commit.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_update_learning_path_by_thread_id_success(self, mock_db, sample_learning_path_model):
-        """Test updating learning path by thread ID."""
-        # Setup mock
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = sample_learning_path_model
-        mock_db.execute = AsyncMock(return_value=mock_result)
-        mock_db.commit = AsyncMock()
-        mock_db.refresh = AsyncMock()
-        
-        update_data = LearningPathUpdate(topic="Updated via Thread")
-        
-        # Execute
-        result = await crud.update_learning_path(mock_db, "thread-123", update_data)
-        
-        # Assertions
-        assert result == sample_learning_path_model
-        assert sample_learning_path_model.topic == "Updated via Thread"
-        mock_db.commit.assert_called_once()
-
     @pytest.mark.asyncio
     async def test_add_thread_to_learning_path_success(self, mock_db, sample_learning_path_model):
         """Test adding a thread ID to learning path."""
@@ -482,24 +462,6 @@ class TestDeleteOperations:
         mock_db.delete.assert_not_called()
         mock_db.commit.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_delete_learning_path_by_thread_id_success(self, mock_db, sample_learning_path_model):
-        """Test deleting learning path by thread ID."""
-        # Setup mock
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = sample_learning_path_model
-        mock_db.execute = AsyncMock(return_value=mock_result)
-        mock_db.delete = AsyncMock()
-        mock_db.commit = AsyncMock()
-        
-        # Execute
-        result = await crud.delete_learning_path(mock_db, "thread-123")
-        
-        # Assertions
-        assert result is True
-        mock_db.delete.assert_called_once()
-        mock_db.commit.assert_called_once()
-
     @pytest.mark.asyncio
     async def test_delete_learning_paths_by_user_success(self, mock_db):
         """Test deleting all learning paths for a user."""
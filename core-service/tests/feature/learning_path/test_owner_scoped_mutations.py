@@ -0,0 +1,67 @@
+"""Tests for single-statement, owner-scoped learning path update and delete."""
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.features.learning_path import crud
+from app.features.learning_path.schemas import LearningPathCreate, LearningPathUpdate
+from app.features.learning_path.service import LearningPathService
+from app.features.users.models import User
+
+
+@pytest.fixture
+def statements(sqlite_engine):
+    """Record the SQL statements executed on the engine."""
+    executed = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement.split()[0].upper())
+
+    event.listen(sqlite_engine.sync_engine, "before_cursor_execute", before_execute)
+    yield executed
+    event.remove(sqlite_engine.sync_engine, "before_cursor_execute", before_execute)
+
+
+@pytest_asyncio.fixture
+async def learning_path(sqlite_db, db_user):
+    return await crud.create_learning_path(sqlite_db, LearningPathCreate(topic="Graphs", user_id=db_user.id))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("returning", [True, False])
+async def test_update_is_one_statement_with_returning(sqlite_db, db_user, learning_path, statements, returning, monkeypatch):
+    """The owner check and the write share a statement; the fallback adds a single SELECT."""
+    monkeypatch.setattr(sqlite_db.get_bind().dialect, "update_returning", returning)
+
+    updated = await crud.update_user_learning_path(
+        sqlite_db, learning_path.id, db_user.id, LearningPathUpdate(topic="Graph Theory"))
+
+    assert updated.topic == "Graph Theory"
+    assert updated.updated_at is not None
+    assert statements == (["UPDATE"] if returning else ["UPDATE", "SELECT"])
+
+
+@pytest.mark.asyncio
+async def test_mutations_are_scoped_to_owner(sqlite_db, db_user, learning_path):
+    """Another user's ID matches no row, so nothing is updated or deleted."""
+    assert await crud.update_user_learning_path(
+        sqlite_db, learning_path.id, db_user.id + 1, LearningPathUpdate(topic="Hijacked")) is None
+    assert await crud.delete_user_learning_path(sqlite_db, learning_path.id, db_user.id + 1) is False
+
+    assert await crud.delete_user_learning_path(sqlite_db, learning_path.id, db_user.id) is True
+    assert await crud.get_learning_path_by_id(sqlite_db, learning_path.id) is None
+
+
+@pytest.mark.asyncio
+async def test_service_distinguishes_forbidden_from_missing(sqlite_db, learning_path):
+    """A miss on someone else's row is 403; a miss on a missing row is None (404)."""
+    service = LearningPathService()
+    intruder = User(id=learning_path.user_id + 1, email="other@example.com", hashed_password="x")
+
+    with pytest.raises(HTTPException) as exc:
+        await service.delete_learning_path(sqlite_db, learning_path.id, intruder)
+    assert exc.value.status_code == 403
+    assert await service.update_learning_path(
+        sqlite_db, 9999, LearningPathUpdate(topic="x"), intruder) is None
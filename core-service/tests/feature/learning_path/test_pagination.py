@@ -0,0 +1,61 @@
+"""Tests for keyset pagination of learning paths."""
+
+import pytest
+from sqlalchemy import inspect
+
+from app.features.learning_path import crud
+from app.features.learning_path.schemas import LearningPathCreate
+from app.util.pagination import decode_cursor, encode_cursor
+
+
+async def _create_paths(db, user, count):
+    for i in range(count):
+        await crud.create_learning_path(db, LearningPathCreate(topic=f"Topic {i}", user_id=user.id))
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_row_once(sqlite_db, db_user):
+    """Walking the cursor chain returns each row once, newest first, even with equal timestamps."""
+    await _create_paths(sqlite_db, db_user, 7)
+
+    seen, cursor = [], None
+    while True:
+        items, cursor = await crud.get_learning_paths_page(sqlite_db, db_user, limit=3, cursor=cursor)
+        seen.extend(lp.id for lp in items)
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == len(set(seen)) == 7
+
+
+@pytest.mark.asyncio
+async def test_offset_mode_matches_first_cursor_page(sqlite_db, db_user):
+    """The first keyset page agrees with offset pagination."""
+    await _create_paths(sqlite_db, db_user, 4)
+
+    items, cursor = await crud.get_learning_paths_page(sqlite_db, db_user, limit=4)
+    offset_items = await crud.get_all_learning_paths(sqlite_db, db_user, skip=0, limit=4)
+
+    assert cursor is None
+    assert {lp.id for lp in items} == {lp.id for lp in offset_items}
+
+
+@pytest.mark.asyncio
+async def test_composite_index_is_created(sqlite_engine):
+    """The (user_id, created_at) index is part of the model's table definition."""
+    async with sqlite_engine.connect() as conn:
+        indexes = await conn.run_sync(lambda c: inspect(c).get_indexes("learning_path"))
+
+    index = next(i for i in indexes if i["name"] == "ix_learning_path_user_id_created_at")
+    assert index["column_names"][:2] == ["user_id", "created_at"]
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    """Cursors are opaque but decodable; malformed ones raise ValueError."""
+    from datetime import datetime
+
+    created_at = datetime(2025, 1, 2, 3, 4, 5)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
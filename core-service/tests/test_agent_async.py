@@ -0,0 +1,43 @@
+"""Test that agent chats run without blocking the event loop."""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.features.agent.learning_path_graph import learning_path_graph as lpg
+from app.features.agent.service import AgentService
+from app.util.chat_models import chat_models
+
+
+class SlowAsyncModel:
+    """Chat model stand-in that only supports async calls and takes 200 ms per call."""
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(0.2)
+        return AIMessage(content=f"reply to {prompt.messages[-1].content}")
+
+    def invoke(self, prompt):
+        raise AssertionError("sync model call would block the event loop")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_chats_overlap(monkeypatch):
+    """Ten chats on one loop finish in about the time of one model call."""
+    monkeypatch.setattr(chat_models, "_overrides", {"learning_path": SlowAsyncModel()})
+    monkeypatch.setattr(lpg.learning_path_graph, "checkpointer", MemorySaver())
+    service = AgentService()
+
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(
+        service.invoke_graph(db=None, user=None, message=f"hi {i}") for i in range(10)
+    ))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
+    assert [r.messages[-1].content for r in responses] == [f"reply to hi {i}" for i in range(10)]
+
+    conversation = await service.get_conversation(responses[0].thread_id)
+    assert [m.content for m in conversation.messages] == ["hi 0", "reply to hi 0"]
@@ -0,0 +1,121 @@
+"""Test the database-backed LangGraph checkpointer."""
+
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.database.base import Base
+from app.features.agent.checkpointer import COMPRESSED_SUFFIX, DatabaseCheckpointSaver
+from app.features.agent.learning_path_graph import learning_path_graph as lpg
+from app.features.agent.models import AgentCheckpoint, AgentCheckpointWrite, LLMResponseCacheEntry
+from app.features.agent.response_cache import llm_response_cache
+from app.features.agent.service import AgentService
+from app.util.chat_models import FakeChatModel, chat_models
+
+checkpoints = AgentCheckpoint.__table__
+
+
+def _echo(state: MessagesState):
+    return {"messages": [AIMessage(content=f"echo: {state['messages'][-1].content}")]}
+
+
+def _build_graph(saver, interrupt: bool = False):
+    builder = StateGraph(MessagesState)
+    builder.add_node("echo", _echo)
+    builder.add_edge(START, "echo")
+    builder.add_edge("echo", END)
+    return builder.compile(checkpointer=saver, interrupt_before=["echo"] if interrupt else None)
+
+
+async def _engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'agent.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[checkpoints, AgentCheckpointWrite.__table__])
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_thread_continues_in_another_worker(tmp_path):
+    """A second saver over the same database (another worker) sees and resumes the thread."""
+    config = {"configurable": {"thread_id": "t1"}}
+    worker_a = await _engine(tmp_path)
+    await _build_graph(DatabaseCheckpointSaver(worker_a), interrupt=True).ainvoke(
+        {"messages": [HumanMessage(content="hello")]}, config
+    )
+
+    worker_b = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'agent.db'}")
+    graph_b = _build_graph(DatabaseCheckpointSaver(worker_b), interrupt=True)
+    state = await graph_b.aget_state(config)
+    assert state.next == ("echo",)
+    result = await graph_b.ainvoke(None, config)
+
+    assert [m.content for m in result["messages"]] == ["hello", "echo: hello"]
+    await worker_a.dispose()
+    await worker_b.dispose()
+
+
+@pytest.mark.asyncio
+async def test_prunes_to_last_k_and_compresses(tmp_path):
+    """Only keep_last checkpoints survive per thread; large checkpoints are compressed."""
+    engine = await _engine(tmp_path)
+    graph = _build_graph(DatabaseCheckpointSaver(engine, keep_last=3, compress_min_bytes=512))
+    config = {"configurable": {"thread_id": "t2"}}
+    for turn in range(4):
+        await graph.ainvoke({"messages": [HumanMessage(content=f"message {turn} " + "x" * 200)]}, config)
+
+    async with engine.connect() as conn:
+        count = (await conn.execute(
+            select(func.count()).select_from(checkpoints).where(checkpoints.c.thread_id == "t2")
+        )).scalar_one()
+        types = (await conn.execute(select(checkpoints.c.checkpoint_type))).scalars().all()
+    state = await graph.aget_state(config)
+    history = [s async for s in graph.aget_state_history(config)]
+    await engine.dispose()
+
+    assert count == 3 and len(history) == 3
+    assert any(t.endswith(COMPRESSED_SUFFIX) for t in types)
+    assert len(state.values["messages"]) == 8
+
+
+@pytest.mark.asyncio
+async def test_sync_api_works_inside_running_loop(tmp_path):
+    """Sync graph calls from async code (as the agent service does) run on the saver's loop thread."""
+    engine = await _engine(tmp_path)
+    saver = DatabaseCheckpointSaver(engine)
+    graph = _build_graph(saver)
+    config = {"configurable": {"thread_id": "t3"}}
+
+    graph.invoke({"messages": [HumanMessage(content="sync")]}, config)
+    assert graph.get_state(config).values["messages"][-1].content == "echo: sync"
+
+    saver.delete_thread("t3")
+    assert graph.get_state(config).values == {}
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_turn_runs_while_request_session_is_open_on_a_single_connection_pool(tmp_path, monkeypatch):
+    """The request session releases its connection before the checkpointer needs one."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'agent.db'}",
+        poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0, pool_timeout=1,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[
+            checkpoints, AgentCheckpointWrite.__table__, LLMResponseCacheEntry.__table__,
+        ])
+    monkeypatch.setattr(lpg.learning_path_graph, "checkpointer", DatabaseCheckpointSaver(engine))
+    monkeypatch.setattr(llm_response_cache, "_engine", engine)
+    monkeypatch.setattr(chat_models, "_overrides", {"learning_path": FakeChatModel()})
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        # The user lookup of the request checked out the only connection
+        await db.execute(text("SELECT 1"))
+        response = await AgentService().invoke_graph(db=db, user=None, message="hi")
+
+    assert [m.content for m in response.messages] == ["hi", "[fake] hi"]
+    await engine.dispose()
@@ -0,0 +1,93 @@
+"""Test the bounded conversation memory of the agent graphs."""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.config import settings
+from app.features.agent.learning_path_graph import learning_path_graph as lpg
+from app.features.agent.memory import count_tokens, history_tokens, prompt_messages, split_for_summary
+from app.features.agent.service import AgentService
+from app.util.chat_models import FakeChatModel, chat_models
+
+
+class RecordingSummarizer:
+    """Memory model stand-in that records its prompts and numbers its summaries."""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt.to_string())
+        return AIMessage(content=f"summary v{len(self.prompts)}")
+
+
+def _turns(count: int, size: int = 10) -> list:
+    messages = []
+    for i in range(count):
+        messages += [HumanMessage(content=f"q{i} " + "x" * size), AIMessage(content=f"a{i} " + "y" * size)]
+    return messages
+
+
+def test_split_keeps_recent_turns_within_budget():
+    """The newest turns are kept; the token budget trims further but never drops the last turn."""
+    messages = _turns(5)
+
+    older, recent = split_for_summary(messages, keep_turns=2, max_tokens=0)
+    assert older == messages[:6] and recent == messages[6:]
+
+    older, recent = split_for_summary(messages, keep_turns=2, max_tokens=count_tokens(messages[8:]))
+    assert recent == messages[8:]
+
+    older, recent = split_for_summary(messages, keep_turns=2, max_tokens=1)
+    assert recent == messages[8:]
+
+    assert split_for_summary(messages[:2], keep_turns=2, max_tokens=0) == ([], messages[:2])
+
+
+def test_prompt_messages_prepend_summary():
+    state = {"messages": _turns(1), "summary": "Learner wants to build a web app"}
+    prompt = prompt_messages(state)
+    assert "Learner wants to build a web app" in prompt[0].content
+    assert prompt[1:] == state["messages"]
+    assert prompt_messages({"messages": state["messages"]}) == state["messages"]
+
+
+def test_history_tokens_count_summary_and_prompt_reserve(monkeypatch):
+    monkeypatch.setattr(settings, "AGENT_MEMORY_PROMPT_RESERVE_TOKENS", 100)
+    messages = _turns(1)
+    summary = "Learner wants to build a web app " * 20
+
+    assert history_tokens({"messages": messages}) == count_tokens(messages) + 100
+    assert history_tokens({"messages": messages, "summary": summary}) > count_tokens(messages) + 100 + 100
+
+
+@pytest.mark.asyncio
+async def test_long_thread_is_folded_into_running_summary(monkeypatch):
+    """Over budget, old turns leave the checkpointed state; the runs right after do not summarize again."""
+    summarizer = RecordingSummarizer()
+    monkeypatch.setattr(settings, "AGENT_MEMORY_KEEP_TURNS", 6)
+    monkeypatch.setattr(settings, "AGENT_MEMORY_MAX_TOKENS", 40)
+    monkeypatch.setattr(settings, "AGENT_MEMORY_PROMPT_RESERVE_TOKENS", 0)
+    monkeypatch.setattr(settings, "AGENT_MEMORY_TARGET_RATIO", 0.5)
+    monkeypatch.setattr(settings, "AGENT_MEMORY_SUMMARY_MAX_WORDS", 3)
+    monkeypatch.setattr(chat_models, "_overrides", {"learning_path": FakeChatModel(), "memory": summarizer})
+    monkeypatch.setattr(lpg.learning_path_graph, "checkpointer", MemorySaver())
+    service = AgentService()
+
+    response = await service.invoke_graph(db=None, user=None, message="hi 0")
+    calls = []
+    for i in range(1, 6):
+        response = await service.invoke_graph(db=None, user=None, message=f"hi {i}", thread_id=response.thread_id)
+        calls.append(len(summarizer.prompts))
+
+    # Summarized when the budget was exceeded (turn 3), then not again until turn 5
+    assert calls == [0, 0, 1, 1, 2]
+    conversation = await service.get_conversation(response.thread_id)
+    assert [m.content for m in conversation.messages] == ["hi 5", "[fake] hi 5"]
+
+    state = await lpg.learning_path_graph.aget_state({"configurable": {"thread_id": response.thread_id}})
+    assert state.values["summary"] == "summary v2"
+    assert "hi 0" in summarizer.prompts[0] and "hi 2" in summarizer.prompts[0]
+    assert "summary v1" in summarizer.prompts[1] and "hi 3" in summarizer.prompts[1]
+    assert "hi 0" not in summarizer.prompts[1]
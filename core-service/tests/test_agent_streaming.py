@@ -0,0 +1,66 @@
+"""Test the server-sent-events agent chat endpoint."""
+
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.database import get_db
+from app.features.agent.learning_path_graph import learning_path_graph as lpg
+from app.features.agent.router import router
+from app.features.users.users import current_active_user
+from app.util.chat_models import FakeChatModel, chat_models
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_nodes_tokens_and_done(monkeypatch):
+    """A basic chat turn streams node boundaries, each token, then the final response."""
+    monkeypatch.setattr(chat_models, "_overrides", {"learning_path": FakeChatModel(responses=["Hello there friend"])})
+    monkeypatch.setattr(lpg.learning_path_graph, "checkpointer", MemorySaver())
+    app = FastAPI()
+    app.include_router(router, prefix="/agent")
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[current_active_user] = lambda: None
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/agent/chat/thread-1/stream", json={"message": "hi"})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    kinds = [kind for kind, _ in events]
+    assert kinds[0] == "start" and events[0][1] == {"thread_id": "thread-1"}
+    assert ("node_start", {"node": "basic_chat"}) in events
+    assert kinds.index("node_start") < kinds.index("token") < kinds.index("node_end")
+    assert "".join(data["content"] for kind, data in events if kind == "token") == "Hello there friend"
+    assert kinds[-1] == "done"
+    assert events[-1][1]["messages"][-1] == {"role": "ai", "content": "Hello there friend"}
+    assert events[-1][1]["learning_path_id"] is None
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_errors_as_events(monkeypatch):
+    """A failing run ends the stream with an error event instead of a broken connection."""
+    monkeypatch.setattr(chat_models, "_overrides", {"learning_path": GenericFakeChatModel(messages=iter([]))})
+    monkeypatch.setattr(lpg.learning_path_graph, "checkpointer", MemorySaver())
+    app = FastAPI()
+    app.include_router(router, prefix="/agent")
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[current_active_user] = lambda: None
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/agent/chat/thread-2/stream", json={"message": "hi"})
+
+    events = _parse_sse(response.text)
+    assert events[0][0] == "start"
+    assert events[-1] == ("error", {"detail": "Failed to continue conversation"})
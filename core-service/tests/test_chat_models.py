@@ -0,0 +1,60 @@
+"""Test the shared chat model registry and the fake provider."""
+
+import pytest
+from pydantic import BaseModel
+
+from app.config import settings
+from app.util.chat_models import ChatModelRegistry, FakeChatModel
+
+
+class Answer(BaseModel):
+    value: int
+
+
+def test_clients_are_lazy_and_shared(monkeypatch):
+    """Nothing is created until first use; roles on the same model share one client."""
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "fake")
+    monkeypatch.setattr(settings, "LLM_MODELS", {"a": "model-x", "b": "model-x", "c": "model-y"})
+    registry = ChatModelRegistry()
+    assert registry._clients == {}
+
+    a = registry.get("a")
+    assert isinstance(a, FakeChatModel) and a.model == "model-x"
+    assert registry.get("b") is a
+    assert registry.get("c") is not a
+    assert registry.get("unknown").model == settings.LLM_DEFAULT_MODEL
+
+
+def test_parameter_variants_reuse_the_provider_client(monkeypatch):
+    """A temperature variant is a separate model object on the same HTTP client."""
+    monkeypatch.setenv("GOOGLE_API_KEY", "test")
+    registry = ChatModelRegistry()
+
+    base = registry.get_named("gemini-2.5-flash-lite", "google_genai")
+    variant = registry.get_named("gemini-2.5-flash-lite", "google_genai", temperature=0.7)
+
+    assert variant is not base and variant.temperature == 0.7
+    assert variant.client is base.client
+    assert registry.get_named("gemini-2.5-flash-lite", "google_genai", temperature=0.7) is variant
+
+
+@pytest.mark.asyncio
+async def test_fake_provider_is_offline_and_deterministic():
+    """The fake model echoes or replays scripted replies, streams tokens and parses structured output."""
+    echo = FakeChatModel(model="m")
+    assert (await echo.ainvoke("hello")).content == "[m] hello"
+
+    scripted = FakeChatModel(responses=["one two", '{"value": 3}'])
+    chunks = [chunk.content async for chunk in scripted.astream("x") if chunk.content]
+    assert chunks == ["one ", "two"]
+    assert await scripted.with_structured_output(Answer).ainvoke("x") == Answer(value=3)
+
+
+def test_pinned_model_overrides_role():
+    """Tests can pin a model instance for a role."""
+    registry = ChatModelRegistry()
+    pinned = FakeChatModel(responses=["pinned"])
+    registry.set("mcq", pinned)
+    assert registry.get("mcq", temperature=0.1) is pinned
+    registry.clear()
+    assert registry._overrides == {}
@@ -0,0 +1,110 @@
+"""Test process-wide database admission control."""
+
+import asyncio
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.database import session as session_module
+from app.database.admission import (
+    DB_ADMISSION_REJECTED,
+    AdmissionController,
+    DBOverloadedError,
+    per_process_limit,
+)
+
+
+def test_budget_is_split_across_workers():
+    assert per_process_limit(40, 4) == 10
+    assert per_process_limit(3, 8) == 1
+    assert per_process_limit(None, 4) is None
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_when_a_slot_frees():
+    """Requests beyond the limit queue until a slot is released."""
+    controller = AdmissionController(limit=1, timeout=1.0)
+    order = []
+
+    async def worker(name):
+        async with controller.admit():
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(worker("a"), worker("b"))
+
+    assert order == ["a", "b"]
+    assert controller.in_use == 0 and controller.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_full_queue_are_rejected():
+    """A request that cannot get a slot in time, or finds the queue full, is rejected."""
+    controller = AdmissionController(limit=1, timeout=0.01, max_queue=1, retry_after=3)
+    timeouts_before = DB_ADMISSION_REJECTED.value(reason="timeout")
+
+    async with controller.admit():
+        with pytest.raises(DBOverloadedError) as exc:
+            async with controller.admit():
+                pass
+        assert exc.value.reason == "timeout"
+        assert exc.value.retry_after == 3
+
+        controller.waiting = 1  # another request is already queued
+        with pytest.raises(DBOverloadedError) as exc:
+            async with controller.admit():
+                pass
+        assert exc.value.reason == "queue_full"
+        controller.waiting = 0
+
+    assert DB_ADMISSION_REJECTED.value(reason="timeout") == timeouts_before + 1
+
+
+@pytest.mark.asyncio
+async def test_dependency_returns_503_with_retry_after(monkeypatch):
+    """The request dependency turns overload into a fast 503 with Retry-After."""
+    controller = AdmissionController(limit=1, timeout=0.01, retry_after=2)
+    monkeypatch.setattr(session_module, "admission_controller", controller)
+
+    async with controller.admit():
+        with pytest.raises(HTTPException) as exc:
+            await anext(session_module.get_db_admission())
+
+    assert exc.value.status_code == 503
+    assert exc.value.headers == {"Retry-After": "2"}
+
+
+@pytest.mark.asyncio
+async def test_reentrant_admission_runs_under_the_held_slot():
+    """Connections opened while a slot is held join it; elsewhere they take their own."""
+    controller = AdmissionController(limit=1, timeout=0.01)
+
+    async with controller.admit():
+        async with controller.admit(reentrant=True):
+            assert controller.in_use == 1
+
+    async with controller.admit(reentrant=True):
+        assert controller.in_use == 1
+        with pytest.raises(DBOverloadedError):
+            async with controller.admit():
+                pass
+    assert controller.in_use == 0
+
+
+def test_each_session_dependency_takes_its_own_slot(monkeypatch):
+    """A request with a read-write and a read-only session holds two slots."""
+    controller = AdmissionController(limit=4, timeout=0.01)
+    monkeypatch.setattr(session_module, "admission_controller", controller)
+    app = FastAPI()
+
+    @app.get("/both")
+    async def both(
+        db=Depends(session_module.get_db),
+        read_db=Depends(session_module.get_read_db),
+    ):
+        return {"in_use": controller.in_use}
+
+    response = TestClient(app).get("/both")
+
+    assert response.json() == {"in_use": 2}
+    assert controller.in_use == 0
@@ -0,0 +1,93 @@
+"""Test bulk export/import of user Knowledge Graphs."""
+
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pytest
+from rdflib import URIRef, Literal
+from rdflib.compare import isomorphic
+from rdflib.namespace import RDF
+from app.kg import bulk
+from app.kg.bulk import export_user_graphs, import_user_graphs, list_user_ids
+from app.kg.config import KGConfig
+from app.kg.storage import KGStorage
+from app.kg.tiering import KGTiering
+
+USER_IDS = ["1", "2", "3"]
+
+
+@pytest.fixture(autouse=True)
+def isolated_dirs(tmp_path, monkeypatch):
+    """Point hot and cold user directories at a temporary location."""
+    monkeypatch.setattr(KGConfig, "USERS_DIR", tmp_path / "users")
+    monkeypatch.setattr(KGConfig, "COLD_USERS_DIR", tmp_path / "cold" / "users")
+    KGConfig.USERS_DIR.mkdir(parents=True)
+
+
+@pytest.fixture(autouse=True)
+def spawned_workers(monkeypatch):
+    """Start workers with spawn so they cannot inherit the patched KGConfig."""
+    monkeypatch.setattr(
+        bulk,
+        "ProcessPoolExecutor",
+        partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")),
+    )
+
+
+@pytest.fixture
+def storage():
+    """Create a KGStorage instance with three sample user graphs."""
+    storage = KGStorage()
+    for user_id in USER_IDS:
+        g = storage.create_graph()
+        user_uri = URIRef(storage.ONT[f"user_{user_id}"])
+        g.add((user_uri, RDF.type, storage.ONT.User))
+        for i in range(int(user_id)):
+            concept = URIRef(storage.ONT[f"concept_{user_id}_{i}"])
+            g.add((user_uri, storage.ONT.knows, concept))
+            g.add((concept, storage.ONT.label, Literal(f"Concept {i}")))
+        storage.save_user_graph(user_id, g, replace=True)
+    return storage
+
+
+def test_export_import_round_trip(storage, tmp_path):
+    """Exported graphs, including cold ones, are restored identically on import."""
+    KGTiering("gzip").archive_user_graph("2")
+    originals = {u: storage.load_user_graph(u) for u in USER_IDS}
+    KGTiering("gzip").archive_user_graph("2")
+    archive = tmp_path / "backup.nq.gz"
+
+    exported = export_user_graphs(archive, workers=2)
+    assert exported["users"] == 3
+
+    for user_id in USER_IDS:
+        KGConfig.get_user_file_path(user_id).unlink(missing_ok=True)
+    KGTiering().discard_cold_file("2")
+    assert list_user_ids() == []
+
+    imported = import_user_graphs(archive, workers=2)
+    assert imported["users"] == 3
+    assert imported["checksum_mismatches"] == []
+    for user_id in USER_IDS:
+        assert isomorphic(storage.load_user_graph(user_id), originals[user_id])
+
+
+def test_export_resumes_from_checkpoint(storage, tmp_path):
+    """An interrupted export only processes the users that are still missing."""
+    archive = tmp_path / "backup.nq"
+    export_user_graphs(archive, workers=1, checkpoint_every=1, user_ids=["1", "2"])
+
+    checkpoint_path = tmp_path / "backup.nq.export.checkpoint.json"
+    checkpoint = json.loads(checkpoint_path.read_text())
+    checkpoint["complete"] = False
+    checkpoint_path.write_text(json.dumps(checkpoint))
+
+    resumed = export_user_graphs(archive, workers=1)
+
+    assert resumed["users"] == 1
+    assert resumed["skipped"] == 2
+    graph_names = {line.rsplit(" ", 2)[1] for line in archive.read_text().splitlines()}
+    assert len(graph_names) == 3
+    assert set(json.loads(checkpoint_path.read_text())["users"]) == set(USER_IDS)
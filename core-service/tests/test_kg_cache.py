@@ -0,0 +1,147 @@
+"""Test the in-process KG cache and startup warmup."""
+
+import asyncio
+import os
+import pytest
+from rdflib import Graph, URIRef, Literal
+from rdflib.namespace import RDF
+from app.kg.cache import KGGraphCache, graph_cache
+from app.kg.config import KGConfig
+from app.kg.storage import KGStorage
+from app.kg.warmup import most_recent_user_ids, warm_kg_cache, warmup_state
+
+
+@pytest.fixture(autouse=True)
+def isolated_dirs(tmp_path, monkeypatch):
+    """Point user directories at a temporary location and start with an empty cache."""
+    monkeypatch.setattr(KGConfig, "USERS_DIR", tmp_path / "users")
+    monkeypatch.setattr(KGConfig, "COLD_USERS_DIR", tmp_path / "cold" / "users")
+    monkeypatch.setattr(KGConfig, "CONCEPTS_FILE", tmp_path / "concepts.ttl")
+    monkeypatch.setattr(KGConfig, "ONTOLOGY", tmp_path / "ontology.ttl")
+    monkeypatch.setattr(graph_cache, "max_graphs", 16)
+    KGConfig.USERS_DIR.mkdir(parents=True)
+    graph_cache.clear()
+    yield
+    graph_cache.clear()
+
+
+@pytest.fixture
+def storage():
+    """Create a KGStorage instance for testing."""
+    return KGStorage()
+
+
+def _save_user(storage, user_id, mtime=None):
+    g = storage.create_graph()
+    g.add((URIRef(storage.ONT[f"user_{user_id}"]), RDF.type, storage.ONT.User))
+    storage.save_user_graph(user_id, g, replace=True)
+    if mtime is not None:
+        os.utime(KGConfig.get_user_file_path(user_id), (mtime, mtime))
+
+
+def test_loaded_graphs_are_independent_copies(storage):
+    """Mutating a loaded graph does not change what the cache returns."""
+    _save_user(storage, "1")
+
+    first = storage.load_user_graph("1")
+    first.add((URIRef(storage.ONT.extra), RDF.type, storage.ONT.Concept))
+    second = storage.load_user_graph("1")
+
+    assert len(first) == 2
+    assert len(second) == 1
+
+
+def test_cache_detects_file_rewritten_elsewhere(storage):
+    """A file changed behind the cache's back is re-parsed."""
+    _save_user(storage, "1")
+    storage.load_user_graph("1")
+
+    file_path = KGConfig.get_user_file_path("1")
+    g = storage.create_graph()
+    g.parse(file_path)
+    g.add((URIRef(storage.ONT.other), RDF.type, storage.ONT.Concept))
+    g.serialize(destination=str(file_path), format="turtle")
+
+    assert len(storage.load_user_graph("1")) == 2
+
+
+def test_file_rewritten_during_parse_is_not_cached(storage, monkeypatch):
+    """A graph parsed from a file that changed mid-parse is not cached as current."""
+    _save_user(storage, "1")
+    graph_cache.clear()
+    file_path = KGConfig.get_user_file_path("1")
+    create_graph = storage.create_graph
+
+    class RacingGraph(Graph):
+        def parse(self, *args, **kwargs):
+            result = super().parse(*args, **kwargs)
+            # Another worker rewrites the file while this one is still parsing
+            g = create_graph()
+            g.parse(file_path)
+            g.add((URIRef(storage.ONT.other), RDF.type, storage.ONT.Concept))
+            g.serialize(destination=str(file_path), format="turtle")
+            return result
+
+    monkeypatch.setattr(storage, "create_graph", RacingGraph)
+    assert len(storage.load_user_graph("1")) == 1
+    monkeypatch.setattr(storage, "create_graph", create_graph)
+
+    assert file_path not in graph_cache
+    assert len(storage.load_user_graph("1")) == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path, storage):
+    """The cache never holds more than max_graphs entries."""
+    cache = KGGraphCache(max_graphs=2)
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.ttl"
+        path.write_text("")
+        cache.put(path, storage.create_graph())
+        paths.append(path)
+
+    assert len(cache) == 2
+    assert paths[0] not in cache
+
+
+def test_warmup_loads_most_recent_users(storage):
+    """Warmup caches the concept catalog and the N most recently modified user graphs."""
+    concepts = storage.create_graph()
+    concepts.add((URIRef(storage.ONT.python), RDF.type, storage.ONT.Concept))
+    storage.save_concepts(concepts)
+    for i, user_id in enumerate(["old", "mid", "new"]):
+        _save_user(storage, user_id, mtime=1_000_000 + i)
+    graph_cache.clear()
+
+    assert most_recent_user_ids(2) == ["new", "mid"]
+    asyncio.run(warm_kg_cache(user_limit=2, concurrency=2))
+
+    assert warmup_state.status == "complete"
+    assert warmup_state.ready
+    assert warmup_state.users_loaded == 2
+    assert KGConfig.get_user_file_path("new") in graph_cache
+    assert KGConfig.get_user_file_path("old") not in graph_cache
+    assert KGConfig.CONCEPTS_FILE in graph_cache
+
+
+def test_warmup_skips_unparsable_files(storage):
+    """A broken ontology or user graph does not stop the other graphs from being warmed."""
+    KGConfig.ONTOLOGY.write_text("ont:Goal a owl:Class ;\n    rdfs:label \"Goal\"\n")
+    _save_user(storage, "good")
+    KGConfig.get_user_file_path("broken").write_text("this is not turtle")
+    graph_cache.clear()
+
+    asyncio.run(warm_kg_cache(user_limit=10, concurrency=2))
+
+    assert warmup_state.status == "partial"
+    assert warmup_state.ready
+    assert warmup_state.users_loaded == 1
+    assert warmup_state.load_failures == 2
+    assert KGConfig.get_user_file_path("good") in graph_cache
+
+
+def test_warmup_is_skipped_without_cache(storage, monkeypatch):
+    """With the cache disabled there is nothing to warm."""
+    monkeypatch.setattr(graph_cache, "max_graphs", 0)
+    asyncio.run(warm_kg_cache(user_limit=10))
+    assert warmup_state.status == "disabled"
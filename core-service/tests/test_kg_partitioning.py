@@ -0,0 +1,70 @@
+"""Test consistent-hash partitioning of user graphs across storage roots."""
+
+import pytest
+from pathlib import Path
+from app.kg.config import KGConfig
+from app.kg.partitioning import HashRing, rebalance_user_graphs
+
+
+@pytest.fixture
+def restore_roots():
+    """Restore the configured storage roots after a test changes them."""
+    original = list(KGConfig.STORAGE_ROOTS)
+    yield
+    KGConfig.set_storage_roots(original)
+
+
+def test_hash_ring_is_deterministic():
+    """The same key always maps to the same node."""
+    ring = HashRing(["/a", "/b", "/c"])
+    assert all(ring.get_node(str(i)) == HashRing(["/a", "/b", "/c"]).get_node(str(i)) for i in range(100))
+
+
+def test_hash_ring_spreads_keys():
+    """Every node receives a reasonable share of keys."""
+    ring = HashRing(["/a", "/b", "/c"])
+    counts = {}
+    for i in range(3000):
+        node = ring.get_node(str(i))
+        counts[node] = counts.get(node, 0) + 1
+    assert set(counts) == {"/a", "/b", "/c"}
+    assert min(counts.values()) > 600
+
+
+def test_adding_root_moves_minimal_keys():
+    """Adding a fourth root only moves keys onto the new root."""
+    before = HashRing(["/a", "/b", "/c"])
+    after = HashRing(["/a", "/b", "/c", "/d"])
+    keys = [str(i) for i in range(4000)]
+    moved = [k for k in keys if before.get_node(k) != after.get_node(k)]
+
+    assert all(after.get_node(k) == "/d" for k in moved)
+    assert len(moved) < len(keys) * 0.4
+
+
+def test_single_root_uses_users_dir(restore_roots):
+    """With one root, user files live in the primary users directory."""
+    KGConfig.set_storage_roots([])
+    assert KGConfig.get_user_file_path("5").parent == KGConfig.USERS_DIR
+
+
+def test_rebalance_moves_users_to_owner(tmp_path, restore_roots):
+    """Rebalancing drains a removed root into the owners of each user."""
+    old_root, new_a, new_b = tmp_path / "old", tmp_path / "a", tmp_path / "b"
+    KGConfig.set_storage_roots([old_root])
+    user_ids = [str(i) for i in range(20)]
+    for user_id in user_ids:
+        path = KGConfig.get_user_file_path(user_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# user {user_id}\n")
+
+    KGConfig.set_storage_roots([new_a, new_b])
+    moves = rebalance_user_graphs([old_root])
+
+    assert len(moves) == len(user_ids)
+    for user_id in user_ids:
+        path = KGConfig.get_user_file_path(user_id)
+        assert path.read_text() == f"# user {user_id}\n"
+        assert path.is_relative_to(KGConfig.get_user_root(user_id))
+    assert not list((old_root / KGConfig.USERS_SUBDIR).iterdir())
+    assert rebalance_user_graphs([old_root]) == []
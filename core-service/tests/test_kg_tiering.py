@@ -0,0 +1,217 @@
+"""Test cold storage tiering for user Knowledge Graphs."""
+
+import os
+import threading
+import time
+import pytest
+from rdflib import URIRef, Literal
+from rdflib.namespace import RDF
+from app.config import settings
+from app.kg.config import KGConfig
+from app.kg.storage import KGStorage
+from app.kg.tiering import KGTiering, tiering_stats
+
+
+@pytest.fixture(autouse=True)
+def isolated_dirs(tmp_path, monkeypatch):
+    """Point hot and cold user directories at a temporary location."""
+    monkeypatch.setattr(KGConfig, "USERS_DIR", tmp_path / "users")
+    monkeypatch.setattr(KGConfig, "COLD_USERS_DIR", tmp_path / "cold" / "users")
+    KGConfig.USERS_DIR.mkdir(parents=True)
+
+
+@pytest.fixture
+def storage():
+    """Create a KGStorage instance for testing."""
+    return KGStorage()
+
+
+def _save_sample_graph(storage, user_id):
+    g = storage.create_graph()
+    user_uri = URIRef(storage.ONT[f"user_{user_id}"])
+    g.add((user_uri, RDF.type, storage.ONT.User))
+    g.add((user_uri, storage.ONT.label, Literal(f"User {user_id}")))
+    storage.save_user_graph(user_id, g, replace=True)
+    return g
+
+
+def _age_file(path, days):
+    old = time.time() - days * 86400
+    os.utime(path, (old, old))
+
+
+def test_archive_and_rehydrate_round_trip(storage):
+    """Archived graphs are compressed, removed from hot storage and restored on load."""
+    original = _save_sample_graph(storage, "42")
+    hot_path = KGConfig.get_user_file_path("42")
+
+    cold_path = KGTiering("gzip").archive_user_graph("42")
+
+    assert cold_path is not None and cold_path.exists()
+    assert cold_path.name.endswith(".ttl.gz")
+    assert not hot_path.exists()
+    assert storage.user_graph_exists("42")
+
+    rehydrations_before = tiering_stats.rehydrations
+    loaded = storage.load_user_graph("42")
+
+    assert len(loaded) == len(original)
+    assert hot_path.exists()
+    assert not cold_path.exists()
+    assert tiering_stats.rehydrations == rehydrations_before + 1
+
+
+def test_concurrent_loads_rehydrate_once(storage):
+    """Threads loading the same archived user all get the full graph."""
+    original = _save_sample_graph(storage, "5")
+    KGTiering("gzip").archive_user_graph("5")
+    rehydrations_before = tiering_stats.rehydrations
+
+    results, errors = [], []
+    barrier = threading.Barrier(8)
+
+    def load():
+        barrier.wait()
+        try:
+            results.append(len(storage.load_user_graph("5")))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=load) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert results == [len(original)] * 8
+    assert tiering_stats.rehydrations == rehydrations_before + 1
+    assert not list(KGConfig.USERS_DIR.glob("*.tmp"))
+
+
+def test_archive_removed_by_another_process_counts_as_restored(storage, monkeypatch):
+    """A cold file renamed away after lookup is a success when the hot file is back."""
+    original = _save_sample_graph(storage, "6")
+    tiering = KGTiering("gzip")
+    cold_path = tiering.archive_user_graph("6")
+    found = tiering.find_cold_file("6")
+
+    def restored_elsewhere(user_id):
+        # Another worker restores the graph between our lookup and open
+        with tiering._open_reader(cold_path, "gzip") as src:
+            KGConfig.get_user_file_path(user_id).write_bytes(src.read())
+        cold_path.unlink()
+        return found
+
+    monkeypatch.setattr(tiering, "find_cold_file", restored_elsewhere)
+
+    assert tiering.rehydrate_user_graph("6") is True
+    assert len(storage.load_user_graph("6")) == len(original)
+    assert not list(KGConfig.USERS_DIR.glob("*.tmp"))
+
+
+def test_default_cold_path_is_outside_hot_tree():
+    """Cold archives default to a sibling of the hot storage directory."""
+    if settings.KG_COLD_STORAGE_PATH:
+        pytest.skip("KG_COLD_STORAGE_PATH is configured explicitly")
+    assert not KGConfig.COLD_PATH.is_relative_to(KGConfig.BASE_PATH)
+
+
+def test_archive_idle_user_graphs_only_moves_idle(storage):
+    """Only graphs older than the idle threshold are archived."""
+    _save_sample_graph(storage, "idle")
+    _save_sample_graph(storage, "active")
+    _age_file(KGConfig.get_user_file_path("idle"), days=45)
+
+    archived = KGTiering("gzip").archive_idle_user_graphs(max_idle_days=30)
+
+    assert archived == ["idle"]
+    assert KGConfig.get_user_file_path("active").exists()
+    assert not KGConfig.get_user_file_path("idle").exists()
+
+
+def test_read_graphs_stay_hot(storage):
+    """Loading a graph counts as activity, without touching its modification time."""
+    _save_sample_graph(storage, "reader")
+    hot_path = KGConfig.get_user_file_path("reader")
+    _age_file(hot_path, days=45)
+    mtime = hot_path.stat().st_mtime_ns
+
+    storage.load_user_graph("reader")
+
+    assert KGTiering("gzip").archive_idle_user_graphs(max_idle_days=30) == []
+    assert hot_path.stat().st_mtime_ns == mtime
+
+
+def test_save_during_archiving_is_kept(storage, monkeypatch):
+    """A save racing the archiver waits for it and is never deleted."""
+    _save_sample_graph(storage, "8")
+    tiering = KGTiering("gzip")
+    open_writer = tiering._open_writer
+    saver = None
+
+    def writer_with_concurrent_save(file_path, compression):
+        nonlocal saver
+        extra = storage.create_graph()
+        extra.add((URIRef(storage.ONT.late), RDF.type, storage.ONT.Concept))
+        saver = threading.Thread(target=storage.save_user_graph, args=("8", extra))
+        saver.start()
+        saver.join(timeout=0.2)
+        return open_writer(file_path, compression)
+
+    monkeypatch.setattr(tiering, "_open_writer", writer_with_concurrent_save)
+    tiering.archive_user_graph("8")
+    saver.join()
+
+    assert len(storage.load_user_graph("8")) == 3
+
+
+def test_write_from_another_process_during_archiving_keeps_graph_hot(storage, monkeypatch):
+    """A hot file rewritten outside the lock while compressing is moved back, not deleted."""
+    _save_sample_graph(storage, "10")
+    hot_path = KGConfig.get_user_file_path("10")
+    tiering = KGTiering("gzip")
+    open_writer = tiering._open_writer
+
+    def writer_with_foreign_write(file_path, compression):
+        with open(hot_path, "a") as f:
+            f.write("\n<urn:late> a <urn:Concept> .\n")
+        return open_writer(file_path, compression)
+
+    monkeypatch.setattr(tiering, "_open_writer", writer_with_foreign_write)
+
+    assert tiering.archive_user_graph("10") is None
+    assert not tiering.is_cold("10")
+    assert "urn:late" in hot_path.read_text()
+    assert not list(KGConfig.USERS_DIR.glob("*.archiving"))
+
+
+def test_merge_save_rehydrates_before_merging(storage):
+    """Merging into an archived graph keeps the archived triples."""
+    _save_sample_graph(storage, "7")
+    KGTiering("gzip").archive_user_graph("7")
+
+    extra = storage.create_graph()
+    extra.add((URIRef(storage.ONT.extra), RDF.type, storage.ONT.Concept))
+    storage.save_user_graph("7", extra)
+
+    loaded = storage.load_user_graph("7")
+    assert len(loaded) == 3
+    assert not KGTiering().is_cold("7")
+
+
+def test_replace_save_discards_stale_archive(storage):
+    """Replacing a graph removes the now-stale cold archive."""
+    _save_sample_graph(storage, "9")
+    tiering = KGTiering("gzip")
+    tiering.archive_user_graph("9")
+
+    _save_sample_graph(storage, "9")
+
+    assert not tiering.is_cold("9")
+
+
+def test_get_user_id_from_file_path():
+    """User IDs are recovered from both hot and cold file names."""
+    assert KGConfig.get_user_id_from_file_path(KGConfig.get_user_file_path("abc")) == "abc"
+    assert KGConfig.get_user_id_from_file_path(KGConfig.get_user_cold_file_path("12", ".zst")) == "12"
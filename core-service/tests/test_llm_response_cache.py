@@ -0,0 +1,127 @@
+"""Test the persistent LLM response cache of the learning path graph nodes."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.base import Base
+from app.features.agent.learning_path_graph.learning_path_graph import (
+    define_learning_goal,
+    generate_concept_graph,
+)
+from app.features.agent.models import LLMResponseCacheEntry
+from app.features.agent.response_cache import (
+    LLM_CACHE_BYPASSES,
+    LLM_CACHE_HITS,
+    LLMResponseCache,
+    llm_response_cache,
+    response_cache_key,
+)
+from app.util.chat_models import FakeChatModel, chat_models
+
+entries = LLMResponseCacheEntry.__table__
+
+GOAL = json.dumps({
+    "learning_goal": "By the end of this learning path, you will be able to write Python scripts",
+    "competencies": ["Variables", "Functions", "Control flow", "Modules"],
+    "success_criteria": ["Write a script", "Use a function", "Import a module"],
+})
+CONCEPTS = '```json\n[{"concept": "Variables", "prerequisites": []}, {"concept": "Functions", "prerequisites": ["Variables"]}]\n```'
+
+
+async def _engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cache.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[entries])
+    return engine
+
+
+@pytest.fixture
+def pinned_model(monkeypatch):
+    model = FakeChatModel(responses=[GOAL])
+    monkeypatch.setattr(chat_models, "_overrides", {"learning_path": model})
+    return model
+
+
+@pytest.mark.asyncio
+async def test_repeated_goal_definition_is_served_from_cache(tmp_path, monkeypatch, pinned_model):
+    """The same (normalized) intention calls the model once; bypass forces a fresh call."""
+    engine = await _engine(tmp_path)
+    monkeypatch.setattr(llm_response_cache, "_engine", engine)
+    state = {"topic": "Python", "desired_outcome": "Write scripts", "context": None}
+    hits_before = LLM_CACHE_HITS.value(node="define_learning_goal")
+    bypass_before = LLM_CACHE_BYPASSES.value(node="define_learning_goal")
+
+    first = await define_learning_goal(state, {"configurable": {}})
+    second = await define_learning_goal(
+        {**state, "topic": "  python ", "desired_outcome": "write   scripts"}, {"configurable": {}}
+    )
+    assert pinned_model._calls == 1
+    assert second["learning_goal"] == first["learning_goal"]
+    assert second["competencies"] == ["Variables", "Functions", "Control flow", "Modules"]
+    assert LLM_CACHE_HITS.value(node="define_learning_goal") == hits_before + 1
+
+    await define_learning_goal(state, {"configurable": {"llm_cache_bypass": True}})
+    assert pinned_model._calls == 2
+    assert LLM_CACHE_BYPASSES.value(node="define_learning_goal") == bypass_before + 1
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_concept_graph_caches_parsed_result(tmp_path, monkeypatch):
+    """The validated concept list is cached, not the raw model reply."""
+    engine = await _engine(tmp_path)
+    monkeypatch.setattr(llm_response_cache, "_engine", engine)
+    model = FakeChatModel(responses=[CONCEPTS])
+    monkeypatch.setattr(chat_models, "_overrides", {"learning_path": model})
+    state = {"topic": "Python", "learning_goal": "Write scripts", "competencies": ["Variables"]}
+
+    first = await generate_concept_graph(state, {})
+    second = await generate_concept_graph(state, {})
+
+    assert model._calls == 1
+    assert second["concept_graph"] == first["concept_graph"] == [
+        {"concept": "Variables", "prerequisites": []},
+        {"concept": "Functions", "prerequisites": ["Variables"]},
+    ]
+    assert second["messages"][0].content == first["messages"][0].content
+    await engine.dispose()
+
+
+def test_key_depends_on_prompt_version_and_model():
+    """Whitespace and case do not change the key; prompt version, model and list order do."""
+    inputs = {"topic": "Python", "items": ["a", "b"]}
+    key = response_cache_key("node", "1", "fake:m", inputs)
+
+    assert key == response_cache_key("node", "1", "fake:m", {"items": ["A", "b "], "topic": " python"})
+    assert key != response_cache_key("node", "2", "fake:m", inputs)
+    assert key != response_cache_key("node", "1", "fake:n", inputs)
+    assert key != response_cache_key("node", "1", "fake:m", {"topic": "Python", "items": ["b", "a"]})
+
+
+@pytest.mark.asyncio
+async def test_expired_and_excess_entries_are_evicted(tmp_path):
+    """Expired entries are misses and are removed; the table never exceeds max_entries."""
+    engine = await _engine(tmp_path)
+    cache = LLMResponseCache(engine, ttl_seconds=60, max_entries=2)
+
+    for i in range(3):
+        await cache.put(f"k{i}", "node", "fake:m", {"i": i})
+    async with engine.connect() as conn:
+        assert await conn.scalar(select(func.count()).select_from(entries)) == 2
+    assert await cache.get("k0") is None
+    assert await cache.get("k2") == {"i": 2}
+
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    async with engine.begin() as conn:
+        await conn.execute(update(entries).where(entries.c.key == "k1").values(expires_at=past))
+    assert await cache.get("k1") is None
+
+    await cache.put("k3", "node", "fake:m", {"i": 3})
+    async with engine.connect() as conn:
+        keys = set(await conn.scalars(select(entries.c.key)))
+    assert keys == {"k2", "k3"}
+    await engine.dispose()
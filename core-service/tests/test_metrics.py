@@ -0,0 +1,97 @@
+"""Test the metrics registry and Knowledge Graph instrumentation."""
+
+import logging
+import threading
+import pytest
+from rdflib import URIRef
+from rdflib.namespace import RDF
+from app.config import settings
+from app.kg.base import KGBase
+from app.kg.cache import graph_cache
+from app.kg.metrics import KG_OPERATION_SECONDS, KG_OPERATION_TRIPLES
+from app.util.metrics import MetricsRegistry, registry
+
+
+def test_histogram_render_is_cumulative():
+    """Histogram buckets are rendered cumulatively with sum and count."""
+    reg = MetricsRegistry()
+    hist = reg.histogram("op_seconds", "Operation time", labelnames=("op",), buckets=(0.1, 1.0))
+    hist.observe(0.05, op="a")
+    hist.observe(0.5, op="a")
+    hist.observe(5, op="a")
+
+    text = reg.render()
+
+    assert 'op_seconds_bucket{op="a",le="0.1"} 1' in text
+    assert 'op_seconds_bucket{op="a",le="1.0"} 2' in text
+    assert 'op_seconds_bucket{op="a",le="+Inf"} 3' in text
+    assert 'op_seconds_count{op="a"} 3' in text
+    assert "# TYPE op_seconds histogram" in text
+
+
+def test_counter_gauge_and_collector():
+    """Collectors refresh gauges right before rendering."""
+    reg = MetricsRegistry()
+    counter = reg.counter("requests_total", "Requests")
+    gauge = reg.gauge("queue_depth", "Queue depth")
+    reg.register_collector(lambda: gauge.set(7))
+    counter.inc()
+    counter.inc(2)
+
+    text = reg.render()
+
+    assert "requests_total 3.0" in text
+    assert "queue_depth 7" in text
+    assert reg.counter("requests_total", "Requests") is counter
+
+
+def test_load_and_save_graph_are_instrumented(tmp_path, monkeypatch, caplog):
+    """Graph I/O records timing and triple histograms and logs slow operations."""
+    monkeypatch.setattr(settings, "KG_SLOW_OPERATION_MS", 0)
+    kg = KGBase()
+    g = kg.create_graph()
+    g.add((URIRef(kg.ONT.a), RDF.type, kg.ONT.Concept))
+    file_path = tmp_path / "user_99.ttl"
+    loads_before = KG_OPERATION_SECONDS.count(operation="load_graph")
+
+    with caplog.at_level(logging.WARNING, logger="app.kg.metrics"):
+        kg.save_graph(g, file_path, user_id="99")
+        graph_cache.invalidate(file_path)
+        loaded = kg.load_graph(file_path, user_id="99")
+
+    assert len(loaded) == 1
+    assert KG_OPERATION_SECONDS.count(operation="load_graph") == loads_before + 1
+    assert KG_OPERATION_TRIPLES.count(operation="save_graph") >= 1
+    assert any("user=99" in r.message and "bytes=" in r.message for r in caplog.records)
+    assert 'kg_operation_seconds_count{operation="load_graph"}' in registry.render()
+
+
+def test_render_while_other_threads_add_label_sets():
+    """Rendering snapshots each metric, so concurrent observations cannot break it."""
+    reg = MetricsRegistry()
+    counter = reg.counter("ops_total", "Ops", labelnames=("op",))
+    hist = reg.histogram("op_seconds", "Op time", labelnames=("op",), buckets=(0.1,))
+
+    def observe():
+        for i in range(5000):
+            counter.inc(op=str(i))
+            hist.observe(0.01, op=str(i))
+
+    worker = threading.Thread(target=observe)
+    worker.start()
+    while worker.is_alive():
+        reg.render()
+    worker.join()
+
+    assert 'ops_total{op="4999"} 1.0' in reg.render()
+
+
+def test_tiering_totals_are_counters():
+    """Tiering totals are exported as counters and derived values as gauges."""
+    import app.kg.metrics  # noqa: F401  registers the tiering collector
+
+    text = registry.render()
+
+    assert "# TYPE kg_tiering_hot_hits_total counter" in text
+    assert "# TYPE kg_tiering_rehydration_seconds_total counter" in text
+    assert "# TYPE kg_tiering_hit_rate gauge" in text
@@ -0,0 +1,104 @@
+"""Test named connection pool profiles."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.database.connection import (
+    apply_sqlite_pragmas,
+    build_engine_kwargs,
+    create_app_engine,
+    describe_engine_config,
+)
+
+PG_URL = "postgresql+asyncpg://user:pass@db:6543/learnora"
+
+
+@pytest.fixture(autouse=True)
+def no_pool_overrides(monkeypatch):
+    for name in ("DB_POOL_PROFILE", "DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_POOL_RECYCLE"):
+        monkeypatch.setattr(settings, name, None)
+
+
+def test_default_without_pool_size_is_nullpool():
+    """Without a profile or DB_POOL_SIZE the previous NullPool behavior is kept."""
+    kwargs = build_engine_kwargs(PG_URL)
+
+    assert kwargs["poolclass"] is NullPool
+    assert describe_engine_config(kwargs) == "profile=default pool=NullPool"
+
+
+def test_pgbouncer_profile_disables_statement_cache(monkeypatch):
+    """Transaction-mode pooling keeps a pool but never caches prepared statements."""
+    monkeypatch.setattr(settings, "DB_POOL_PROFILE", "pgbouncer-transaction")
+
+    kwargs = build_engine_kwargs(PG_URL)
+
+    assert "poolclass" not in kwargs
+    assert kwargs["pool_pre_ping"] is True
+    assert kwargs["connect_args"]["statement_cache_size"] == 0
+    assert kwargs["connect_args"]["prepared_statement_cache_size"] == 0
+    names = {kwargs["connect_args"]["prepared_statement_name_func"]() for _ in range(3)}
+    assert len(names) == 3
+    assert "statement_cache=off" in describe_engine_config(kwargs)
+
+
+def test_explicit_settings_override_profile(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_PROFILE", "small-session")
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+
+    kwargs = build_engine_kwargs(PG_URL)
+
+    assert kwargs["pool_size"] == 7
+    assert kwargs["max_overflow"] == 0
+    assert "connect_args" not in kwargs
+    assert "size=7 overflow=0 pre_ping=True recycle=1800 statement_cache=on" in describe_engine_config(kwargs)
+
+
+def test_unknown_profile_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_PROFILE", "huge")
+
+    with pytest.raises(ValueError, match="Unknown DB_POOL_PROFILE"):
+        build_engine_kwargs(PG_URL)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_wal_profile_sets_pragmas_and_single_writer(tmp_path, monkeypatch):
+    """The SQLite profile keeps one pooled writer connection and applies the WAL pragmas on connect."""
+    monkeypatch.setattr(settings, "DB_POOL_PROFILE", "sqlite-wal")
+    url = f"sqlite+aiosqlite:///{tmp_path / 'wal.db'}"
+
+    kwargs = build_engine_kwargs(url)
+    engine = create_async_engine(url, **kwargs)
+    apply_sqlite_pragmas(engine)
+    async with engine.connect() as conn:
+        journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+        synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+    await engine.dispose()
+
+    assert (kwargs["pool_size"], kwargs["max_overflow"]) == (1, settings.SQLITE_WRITE_MAX_OVERFLOW)
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert "journal_mode=WAL" in describe_engine_config(kwargs)
+    with pytest.raises(ValueError, match="only applies to SQLite"):
+        build_engine_kwargs(PG_URL)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_wal_sessions_do_not_wait_for_the_writer_connection(tmp_path, monkeypatch):
+    """A request holding its connection does not starve another request's session."""
+    monkeypatch.setattr(settings, "DB_POOL_PROFILE", "sqlite-wal")
+    monkeypatch.setattr(settings, "SQLITE_WRITE_MAX_OVERFLOW", 1)
+    engine = create_app_engine(f"sqlite+aiosqlite:///{tmp_path / 'wal.db'}", pool_timeout=1)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+
+    async with engine.connect() as held:
+        # e.g. the user lookup of a streaming request
+        await held.execute(text("SELECT count(*) FROM t"))
+        async with engine.begin() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            await conn.execute(text("INSERT INTO t (id) VALUES (1)"))
+    await engine.dispose()
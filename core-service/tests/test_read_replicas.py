@@ -0,0 +1,60 @@
+"""Test read-replica routing with two SQLite files standing in for replicas."""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import connection
+from app.database.base import Base
+from app.database.connection import PrimarySession, ReadOnlySession, ReplicaSet
+from app.features.users.models import User
+import app.features.learning_path.models  # noqa: F401  (register tables)
+import app.features.preference.preferences  # noqa: F401  (register tables)
+
+
+async def _database(path, email):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(User.__table__.insert().values(email=email, hashed_password="x"))
+    return engine
+
+
+async def _read_emails(read_maker, db_state):
+    async with read_maker() as session:
+        session.info["db_state"] = db_state
+        return (await session.execute(select(User.email))).scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_reads_round_robin_then_stick_to_primary_after_write(tmp_path, monkeypatch):
+    """Read sessions alternate between replicas until the request writes to the primary."""
+    primary = await _database(tmp_path / "primary.db", "primary@example.com")
+    replica_engines = [
+        (await _database(tmp_path / f"replica{i}.db", f"replica{i}@example.com")).execution_options(
+            isolation_level="AUTOCOMMIT")
+        for i in (1, 2)
+    ]
+    monkeypatch.setattr(connection, "replicas", ReplicaSet(replica_engines))
+    read_maker = async_sessionmaker(
+        primary.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession, sync_session_class=ReadOnlySession, expire_on_commit=False)
+    write_maker = async_sessionmaker(
+        primary, class_=AsyncSession, sync_session_class=PrimarySession, expire_on_commit=False)
+    db_state = {"primary_write": False}
+
+    assert await _read_emails(read_maker, db_state) == ["replica1@example.com"]
+    assert await _read_emails(read_maker, db_state) == ["replica2@example.com"]
+
+    async with write_maker() as session:
+        session.info["db_state"] = db_state
+        session.add(User(email="new@example.com", hashed_password="x"))
+        await session.commit()
+
+    assert db_state["primary_write"] is True
+    assert sorted(await _read_emails(read_maker, db_state)) == ["new@example.com", "primary@example.com"]
+    # Another request starts with fresh state and goes back to the replicas
+    assert await _read_emails(read_maker, {"primary_write": False}) == ["replica1@example.com"]
+
+    for engine in [primary, *replica_engines]:
+        await engine.dispose()
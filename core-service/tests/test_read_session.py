@@ -0,0 +1,90 @@
+"""Test the read-only database session dependency."""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import session as session_module
+from app.database.base import Base
+from app.database.connection import ReadOnlySession
+from app.features.users.auth import get_jwt_strategy
+from app.features.users.cache import user_cache
+from app.features.users.models import User
+from app.features.users.users import current_active_user_read
+import app.features.learning_path.models  # noqa: F401  (register tables)
+import app.features.preference.preferences  # noqa: F401  (register tables)
+
+
+@pytest.mark.asyncio
+async def test_read_session_never_commits_or_writes(tmp_path, monkeypatch):
+    """Reads run in autocommit mode without COMMIT, and pending writes are refused."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'read.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(User.__table__.insert().values(email="a@example.com", hashed_password="x"))
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement.split()[0].upper()))
+    commits = []
+    event.listen(engine.sync_engine, "commit", lambda conn: commits.append(conn))
+    monkeypatch.setattr(session_module, "ReadSessionLocal", async_sessionmaker(
+        engine.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        sync_session_class=ReadOnlySession,
+        expire_on_commit=False,
+    ))
+
+    dependency = session_module.get_read_db()
+    db = await anext(dependency)
+    users = (await db.execute(select(User))).scalars().all()
+    db.add(User(email="b@example.com", hashed_password="x"))
+    with pytest.raises(RuntimeError):
+        await db.flush()
+    await dependency.aclose()
+    await engine.dispose()
+
+    assert [u.email for u in users] == ["a@example.com"]
+    assert statements == ["SELECT"]
+    assert commits == []
+
+
+@pytest.mark.asyncio
+async def test_read_routes_resolve_the_user_through_the_read_session(tmp_path, monkeypatch):
+    """Authentication on a get_read_db route opens no read-write session."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'read.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        user = User(email="a@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        await db.commit()
+        token = await get_jwt_strategy().write_token(user)
+
+    opened = []
+
+    def factory(name, **kwargs):
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, **kwargs)
+
+        def open_session():
+            opened.append(name)
+            return sessions()
+        return open_session
+
+    monkeypatch.setattr(session_module, "SessionLocal", factory("primary"))
+    monkeypatch.setattr(session_module, "ReadSessionLocal", factory("read", sync_session_class=ReadOnlySession))
+    user_cache.clear()
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(db=Depends(session_module.get_read_db), current=Depends(current_active_user_read)):
+        return {"email": current.email, "same_session": current in db}
+
+    response = TestClient(app).get("/me", headers={"Authorization": f"Bearer {token}"})
+    user_cache.clear()
+    await engine.dispose()
+
+    assert response.json() == {"email": "a@example.com", "same_session": True}
+    assert opened == ["read"]
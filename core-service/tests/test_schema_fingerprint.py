@@ -0,0 +1,60 @@
+"""Test skipping create_all on startup via the schema fingerprint."""
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.schema import ensure_schema, schema_fingerprint
+
+
+def _metadata(extra_column: bool = False) -> MetaData:
+    metadata = MetaData()
+    columns = [Column("id", Integer, primary_key=True), Column("name", String(50), index=True)]
+    if extra_column:
+        columns.append(Column("email", String(100)))
+    Table("item", metadata, *columns)
+    return metadata
+
+
+@pytest.mark.asyncio
+async def test_second_start_skips_ddl_and_reflection(tmp_path):
+    """A matching fingerprint costs one SELECT and runs no DDL or PRAGMA reflection."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    metadata = _metadata()
+
+    assert await ensure_schema(engine, metadata) is True
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    assert await ensure_schema(engine, metadata) is False
+    await engine.dispose()
+
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("SELECT")
+
+
+@pytest.mark.asyncio
+async def test_model_change_reruns_create_all(tmp_path):
+    """A new table changes the fingerprint, so create_all runs again and the table is created."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    await ensure_schema(engine, _metadata())
+
+    metadata = _metadata()
+    Table("other", metadata, Column("id", Integer, primary_key=True))
+
+    assert await ensure_schema(engine, metadata) is True
+    assert await ensure_schema(engine, metadata) is False
+    async with engine.connect() as conn:
+        tables = await conn.run_sync(lambda c: c.dialect.get_table_names(c))
+    await engine.dispose()
+    assert {"item", "other", "schema_version"} <= set(tables)
+
+
+def test_fingerprint_tracks_columns_and_dialect():
+    """The fingerprint is stable for identical models and changes with the DDL."""
+    from sqlalchemy.dialects import postgresql, sqlite
+
+    assert schema_fingerprint(_metadata(), sqlite.dialect()) == schema_fingerprint(_metadata(), sqlite.dialect())
+    assert schema_fingerprint(_metadata(), sqlite.dialect()) != schema_fingerprint(_metadata(True), sqlite.dialect())
+    assert schema_fingerprint(_metadata(), sqlite.dialect()) != schema_fingerprint(_metadata(), postgresql.dialect())
@@ -0,0 +1,47 @@
+"""Test per-request SQL instrumentation and N+1 detection."""
+
+import logging
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.instrumentation import (
+    DB_N_PLUS_ONE,
+    DB_REQUEST_QUERIES,
+    SQLInstrumentationMiddleware,
+    install_query_instrumentation,
+    statement_shape,
+)
+
+
+def test_statement_shape_collapses_in_lists():
+    assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == statement_shape(
+        "SELECT *  FROM t\n WHERE id IN (?)")
+
+
+def test_request_stats_headers_and_n_plus_one(tmp_path, caplog):
+    """Each request gets its own counts; repeated statement shapes are flagged."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+    install_query_instrumentation(engine)
+    app = FastAPI()
+    app.add_middleware(SQLInstrumentationMiddleware, expose_headers=True, n_plus_one_threshold=3)
+
+    @app.get("/items/{count}")
+    async def items(count: int):
+        async with engine.connect() as conn:
+            for i in range(count):
+                await conn.execute(text("SELECT :i"), {"i": i})
+        return {"ok": True}
+
+    flagged_before = DB_N_PLUS_ONE.value(route="/items/{count}")
+    with TestClient(app) as client, caplog.at_level(logging.WARNING, logger="app.database.instrumentation"):
+        few = client.get("/items/2")
+        many = client.get("/items/5")
+
+    assert few.headers["x-db-query-count"] == "2"
+    assert many.headers["x-db-query-count"] == "5"
+    assert float(many.headers["x-db-time-ms"]) >= float(many.headers["x-db-slowest-ms"])
+    assert DB_N_PLUS_ONE.value(route="/items/{count}") == flagged_before + 1
+    assert DB_REQUEST_QUERIES.count(route="/items/{count}") >= 2
+    assert any("Possible N+1" in r.message and "ran 5 times" in r.message for r in caplog.records)
@@ -0,0 +1,157 @@
+"""Test the stateless JWT claims mode and its revocation bitmap."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.database
+from app.features.users import revocation
+from app.database.base import Base
+from app.features.users.auth import get_jwt_strategy, resolve_claims_user
+from app.features.users.cache import user_cache
+from app.features.users.manager import UserManager
+from app.features.users.models import RevokedUser, User
+from app.features.users.revocation import RevocationBitmap, refresh_revoked_users, revoked_users
+from app.features.users.users import current_active_user_from_claims
+import app.features.learning_path.models  # noqa: F401  (register tables)
+import app.features.preference.preferences  # noqa: F401  (register tables)
+
+
+@pytest.fixture(autouse=True)
+def clean_auth_state():
+    revoked_users.replace(())
+    user_cache.clear()
+    yield
+    revoked_users.replace(())
+    user_cache.clear()
+
+
+@pytest_asyncio.fixture
+async def user_sessions(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(app.database, "SessionLocal", sessions)
+    yield sessions
+    await engine.dispose()
+
+
+def _claims_user(user_id: int = 5, **overrides) -> User:
+    values = dict(id=user_id, email=f"{user_id}@example.com", hashed_password="x",
+                  is_active=True, is_verified=True, is_superuser=False)
+    values.update(overrides)
+    return User(**values)
+
+
+def test_bitmap_membership_and_replace():
+    """The bitmap stores one bit per id and can be swapped atomically."""
+    bitmap = RevocationBitmap([3, 17])
+    assert 3 in bitmap and 17 in bitmap
+    assert 4 not in bitmap and 10_000 not in bitmap
+    assert bitmap.nbytes == 3 and len(bitmap) == 2
+
+    bitmap.replace([1])
+    assert 3 not in bitmap and 1 in bitmap
+
+
+@pytest.mark.asyncio
+async def test_claims_resolve_without_database(monkeypatch):
+    """A valid token yields a detached user built from its claims, without any session."""
+    monkeypatch.setattr(app.database, "SessionLocal", None)
+    token = await get_jwt_strategy().write_token(_claims_user(is_superuser=True))
+
+    user = await current_active_user_from_claims(token)
+
+    assert (user.id, user.email, user.is_superuser, user.is_verified) == (5, "5@example.com", True, True)
+    assert await resolve_claims_user(token[:-2] + "xx") is None
+    with pytest.raises(HTTPException) as exc:
+        await current_active_user_from_claims(None)
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_revoked_user_is_checked_against_database(user_sessions):
+    """A revoked user's stale is_active claim is ignored in favor of the database row."""
+    async with user_sessions() as db:
+        user = _claims_user(user_id=None, email="a@example.com")
+        db.add(user)
+        await db.commit()
+        token = await get_jwt_strategy().write_token(user)
+        user.is_active = False
+        await db.commit()
+    revoked_users.add(user.id)
+
+    with pytest.raises(HTTPException) as exc:
+        await current_active_user_from_claims(token)
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_marks_inactive_and_recently_updated_users(user_sessions):
+    """The periodic refresh revokes inactive users and users changed within the token lifetime."""
+    async with user_sessions() as db:
+        inactive = _claims_user(user_id=None, email="inactive@example.com", is_active=False)
+        updated = _claims_user(user_id=None, email="updated@example.com")
+        untouched = _claims_user(user_id=None, email="untouched@example.com")
+        db.add_all([inactive, updated, untouched])
+        await db.commit()
+        updated.is_superuser = True
+        await db.commit()
+
+    assert await refresh_revoked_users(3600) == 2
+    assert inactive.id in revoked_users
+    assert updated.id in revoked_users
+    assert untouched.id not in revoked_users
+
+
+@pytest.mark.asyncio
+async def test_deleted_user_stays_revoked_across_refreshes(user_sessions):
+    """Deletions leave a tombstone, so other workers' refreshes mark the user until tokens expire."""
+    async with user_sessions() as db:
+        user = _claims_user(user_id=None, email="deleted@example.com")
+        db.add(user)
+        await db.commit()
+        token = await get_jwt_strategy().write_token(user)
+        await UserManager(SQLAlchemyUserDatabase(db, User)).delete(user)
+        db.add(RevokedUser(user_id=999, revoked_at=datetime.now(timezone.utc) - timedelta(hours=2)))
+        await db.commit()
+
+    # A worker that did not perform the deletion
+    revoked_users.replace(())
+    assert await refresh_revoked_users(3600) == 1
+    assert user.id in revoked_users
+    assert 999 not in revoked_users
+    assert await resolve_claims_user(token) is None
+
+    async with user_sessions() as db:
+        assert list(await db.scalars(select(RevokedUser.user_id))) == [user.id]
+
+
+@pytest.mark.asyncio
+async def test_refresh_includes_update_just_inside_the_window(user_sessions, monkeypatch):
+    """SQLite second-precision updated_at values compare correctly with the cutoff."""
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2026, 1, 1, 12, 0, 0, 500_000, tzinfo=timezone.utc)
+
+    async with user_sessions() as db:
+        user = _claims_user(user_id=None, email="late@example.com", is_active=True)
+        db.add(user)
+        await db.commit()
+        # Deactivated at 11:00:00.7, stored by CURRENT_TIMESTAMP without fractions
+        await db.execute(
+            text('UPDATE "user" SET updated_at = :stored WHERE id = :id'),
+            {"stored": "2026-01-01 11:00:00", "id": user.id},
+        )
+        await db.commit()
+    monkeypatch.setattr(revocation, "datetime", FrozenDatetime)
+
+    assert await refresh_revoked_users(3600) == 1
+    assert user.id in revoked_users
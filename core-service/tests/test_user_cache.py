@@ -0,0 +1,84 @@
+"""Test cached resolution of the authenticated user from a JWT."""
+
+import pytest
+from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.base import Base
+from app.features.users.auth import get_jwt_strategy
+from app.features.users.cache import UserCache, user_cache
+from app.features.users.manager import UserManager
+from app.features.users.models import User
+from app.features.users.schemas import UserUpdate
+import app.features.learning_path.models  # noqa: F401  (register tables)
+import app.features.preference.preferences  # noqa: F401  (register tables)
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache(monkeypatch):
+    monkeypatch.setattr(user_cache, "ttl_seconds", 60)
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_cached_user_skips_query_and_is_invalidated_on_update(tmp_path):
+    """The second resolution of a token runs no SQL; deactivation drops the entry."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    strategy = get_jwt_strategy()
+
+    async with sessions() as db:
+        user = User(email="a@example.com", hashed_password="x")
+        db.add(user)
+        await db.commit()
+        token = await strategy.write_token(user)
+        first = await strategy.read_token(token, UserManager(SQLAlchemyUserDatabase(db, User)))
+    assert first.email == "a@example.com"
+
+    statements.clear()
+    async with sessions() as db:
+        cached = await strategy.read_token(token, UserManager(SQLAlchemyUserDatabase(db, User)))
+        assert statements == []
+        assert cached is not first and cached in db
+        assert cached.email == "a@example.com" and cached.is_active
+
+        await UserManager(SQLAlchemyUserDatabase(db, User)).update(UserUpdate(is_active=False), cached)
+    assert len(user_cache) == 0
+
+    async with sessions() as db:
+        reloaded = await strategy.read_token(token, UserManager(SQLAlchemyUserDatabase(db, User)))
+    await engine.dispose()
+    assert reloaded.is_active is False
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_is_rejected():
+    """Tokens that fail verification are not resolved."""
+    strategy = get_jwt_strategy()
+    assert await strategy.read_token("not-a-jwt", UserManager(None)) is None
+    assert await strategy.read_token(None, UserManager(None)) is None
+
+
+def test_cache_expires_and_is_bounded(monkeypatch):
+    """Entries expire after the TTL and the oldest are evicted beyond max_size."""
+    clock = [100.0]
+    monkeypatch.setattr("app.features.users.cache.time.monotonic", lambda: clock[0])
+    cache = UserCache(ttl_seconds=10, max_size=2)
+    for user_id in (1, 2, 3):
+        cache.put(User(id=user_id, email=f"{user_id}@example.com", hashed_password="x"), issued_at=1)
+
+    assert len(cache) == 2
+    assert cache.get(1, 1) is None
+    assert cache.get(3, 1)["email"] == "3@example.com"
+    assert cache.get(3, 2) is None
+
+    clock[0] += 11
+    assert cache.get(3, 1) is None